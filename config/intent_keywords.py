@@ -0,0 +1,47 @@
+# config/intent_keywords.py
+"""Keyword rules for supervisor intent classification"""
+
+# Rules are checked in this order; the first rule with a matching term wins
+INTENT_RULES = {
+    # Check for food/product queries first
+    "food_terms": {
+        "terms": ["potato", "tomato", "pepper", "milk", "bread", "fruit", "vegetable"],
+        "intent": "specific_product"
+    },
+    
+    # Product-specific queries
+    "product_terms": {
+        "terms": ["organic", "fresh", "price", "cost", "$"],
+        "intent": "specific_product"
+    },
+    
+    # Brand queries
+    "brand_terms": {
+        "terms": ["brand", "from"],
+        "intent": "brand_search"
+    },
+    
+    # Category browsing
+    "category_terms": {
+        "terms": ["vegetables", "fruits", "dairy", "meat"],
+        "intent": "category_browse"
+    },
+    
+    # Meal planning
+    "meal_terms": {
+        "terms": ["dinner", "lunch", "meal", "recipe", "cook"],
+        "intent": "meal_planning"
+    },
+    
+    # General browsing
+    "discovery_terms": {
+        "terms": ["healthy", "snacks", "ideas", "suggestions"],
+        "intent": "discovery"
+    },
+    
+    # Help requests
+    "help_terms": {
+        "terms": ["help", "how", "what can"],
+        "intent": "help_request"
+    }
+}
@@ -0,0 +1,66 @@
+"""Check BatchLoader batching, error propagation and cancelled batches.
+
+Concurrent loads within the window should go out as one de-duplicated
+batch, errors should reach every caller, and a batch whose function is
+cancelled should cancel its callers instead of leaving them waiting.
+
+Usage: python scripts/batch_loader_check.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.core.batch_loader import BatchLoader
+
+async def main() -> int:
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    calls = []
+
+    async def fetch(keys):
+        calls.append(keys)
+        await asyncio.sleep(0.01)
+        return {key: key.upper() for key in keys if key != "missing"}
+
+    loader = BatchLoader("check", fetch, window_ms=5)
+    values = await asyncio.gather(*(loader.load(key) for key in ["a", "b", "a", "missing"]))
+    check(len(calls) == 1 and sorted(calls[0]) == ["a", "b", "missing"], f"one de-duplicated batch: {calls}")
+    check(values == ["A", "B", "A", None], f"each caller gets its own value: {values}")
+
+    async def fail(keys):
+        raise ValueError("boom")
+
+    failing = BatchLoader("failing", fail, window_ms=1)
+    outcomes = await asyncio.gather(*(failing.load(key) for key in "xy"), return_exceptions=True)
+    check(all(isinstance(outcome, ValueError) for outcome in outcomes), "errors reach every caller")
+
+    async def cancelled(keys):
+        raise asyncio.CancelledError()
+
+    cancelling = BatchLoader("cancelling", cancelled, window_ms=1)
+    try:
+        outcomes = await asyncio.wait_for(
+            asyncio.gather(*(cancelling.load(key) for key in "xy"), return_exceptions=True), timeout=1.0
+        )
+        check(
+            all(isinstance(outcome, asyncio.CancelledError) for outcome in outcomes),
+            "a cancelled batch cancels its callers"
+        )
+    except asyncio.TimeoutError:
+        check(False, "callers of a cancelled batch hang")
+    stats = cancelling.stats()
+    check(stats["in_flight"] == 0 and stats["running_batches"] == 0, "no batch left in flight")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,68 @@
+"""Check the batch search endpoint: dedup, ordering and per-item errors.
+
+Posts a batch to /api/v1/search/batch against the fake Weaviate client in
+which the same query appears several times (spelled differently) next to
+an item with a bad cursor. Duplicates must run once and share their
+result, results must keep request order, the bad item must fail alone
+with its 400 while the others succeed, and an oversized batch must be
+rejected.
+
+Usage: python scripts/batch_search_check.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from scripts.fake_weaviate import FakeWeaviateClient, install
+from src.api.main import app
+from src.config.settings import settings
+
+REQUESTS = [
+    {"query": "organic whole milk"},
+    {"query": "Organic  Whole Milk"},
+    {"query": "russet potatoes"},
+    {"query": "greek yogurt", "cursor": "not-a-cursor"},
+    {"query": "organic whole milk"},
+    {"query": "gala apples"},
+]
+
+async def main() -> int:
+    fake = install(FakeWeaviateClient(latency_ms=20))
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/api/v1/search/batch", json={"requests": REQUESTS})
+        check(response.status_code == 200, f"batch with a bad item returns {response.status_code}")
+        body = response.json()
+        results, execution = body["results"], body["execution"]
+
+        check([result["query"] for result in results] == [r["query"] for r in REQUESTS], "results keep request order and spelling")
+        check(execution["unique_requests"] == 4, f"{execution['requests']} requests ran as {execution['unique_requests']} unique searches")
+        check(fake.queries == 3, f"duplicates shared one backend query each ({fake.queries} for 3 valid searches)")
+        milk = [results[i]["products"] for i in (0, 1, 4)]
+        check(milk[0] and milk[0] == milk[1] == milk[2], "every duplicate got the shared products")
+
+        bad = results[3]
+        check(not bad["success"] and bad["execution"].get("status_code") == 400, f"bad cursor failed alone: {bad['error']}")
+        check(all(results[i]["success"] for i in (0, 1, 2, 4, 5)), "the other items succeeded")
+        check(execution["succeeded"] == 5, f"{execution['succeeded']} of {execution['requests']} succeeded")
+
+        oversized = [{"query": f"milk {i}"} for i in range(settings.batch_search_max_items + 1)]
+        response = await client.post("/api/v1/search/batch", json={"requests": oversized})
+        check(response.status_code == 400, f"batch over the {settings.batch_search_max_items}-item limit is rejected")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,101 @@
+"""Benchmark keyword matching cost as the term dictionary grows.
+
+Compares the precompiled KeywordMatcher (Aho-Corasick) against the old
+per-term substring scan over dictionaries padded with synthetic terms.
+The matcher's per-query cost should stay roughly flat as the dictionary
+grows into the thousands, while the scan grows linearly.
+
+Usage: python scripts/bench_keyword_matcher.py [--sizes 100,1000,5000,20000]
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.product_attributes import PRODUCT_ATTRIBUTES
+from config.intent_keywords import INTENT_RULES
+from src.utils.keyword_matcher import KeywordMatcher
+
+QUERIES = [
+    "organic gluten free bread",
+    "2% organic milk",
+    "fresh vegetables for salad",
+    "bananas",
+    "dinner ideas",
+    "tomatoes for pasta",
+    "healthy breakfast options",
+    "cage free eggs",
+    "whole wheat bread family size",
+    "low sodium chicken broth",
+    "what can i cook for lunch",
+    "grass fed ground beef 1lb",
+]
+
+def base_terms():
+    tables = {category: config["terms"] for category, config in PRODUCT_ATTRIBUTES.items()}
+    tables.update({rule: config["terms"] for rule, config in INTENT_RULES.items()})
+    return tables
+
+def padded_terms(size: int, rng: random.Random):
+    """Real keyword tables plus synthetic terms up to roughly size terms"""
+    tables = base_terms()
+    real = sum(len(terms) for terms in tables.values())
+    synthetic = []
+    for _ in range(max(0, size - real)):
+        words = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+            for _ in range(rng.randint(1, 2))
+        ]
+        synthetic.append(" ".join(words))
+    tables["synthetic"] = synthetic
+    return tables
+
+def substring_scan(tables, query):
+    query_lower = query.lower()
+    return {label: [t for t in terms if t in query_lower] for label, terms in tables.items()}
+
+def per_query_us(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            fn(query)
+    return (time.perf_counter() - start) / (repeat * len(QUERIES)) * 1e6
+
+def main(sizes, repeat: int, max_growth: float) -> int:
+    rng = random.Random(42)
+    print(f"{'terms':>8} {'build ms':>10} {'matcher us/q':>14} {'scan us/q':>12}")
+
+    matcher_costs = []
+    for size in sizes:
+        tables = padded_terms(size, rng)
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(tables)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        matcher_us = per_query_us(matcher.find_all, repeat)
+        scan_us = per_query_us(lambda q: substring_scan(tables, q), max(1, repeat // 10))
+        matcher_costs.append(matcher_us)
+        print(f"{matcher.term_count:>8} {build_ms:>10.1f} {matcher_us:>14.2f} {scan_us:>12.2f}")
+
+    growth = matcher_costs[-1] / matcher_costs[0]
+    print(f"\nMatcher cost growth from {sizes[0]} to {sizes[-1]} terms: {growth:.2f}x")
+    if growth > max_growth:
+        print(f"❌ Matcher cost grew more than {max_growth}x")
+        return 1
+    print("✅ Matcher cost stays flat as the dictionary grows")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,1000,5000,20000")
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--max-growth", type=float, default=3.0)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    sys.exit(main(sizes, args.repeat, args.max_growth))
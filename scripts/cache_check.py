@@ -0,0 +1,102 @@
+"""Check the TTL/LRU cache and the response cache in front of the graph.
+
+A TTLCache entry must expire after its TTL, and stay readable through
+get_stale for stale_ttl_seconds more. The least-recently-used entry must be
+evicted once either max_entries or max_bytes is exceeded, and hits, misses
+and evictions must be counted in stats(). Against the fake Weaviate client,
+repeating a search must be served from the response cache without running
+the graph or querying the backend, and report served_from.
+
+Usage: python scripts/cache_check.py
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from scripts.fake_weaviate import FakeWeaviateClient, install
+from src.api.main import app, graph_flight, response_cache
+from src.core.cache import TTLCache, estimate_size
+
+TTL_S = 0.1
+
+async def main() -> int:
+    fake = install(FakeWeaviateClient(latency_ms=20))
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    # TTL expiry and the stale window
+    cache = TTLCache("check", max_entries=10, max_bytes=1024 * 1024, ttl_seconds=TTL_S, stale_ttl_seconds=TTL_S * 2)
+    cache.set("milk", ["whole", "skim"])
+    check(cache.get("milk") == ["whole", "skim"], "a fresh entry is a hit")
+    time.sleep(TTL_S * 1.5)
+    check(cache.get("milk") is None, "an entry past its TTL is a miss")
+    check(cache.get_stale("milk") == ["whole", "skim"], "get_stale still serves it inside the stale window")
+    time.sleep(TTL_S * 2)
+    check(cache.get_stale("milk") is None and len(cache) == 0, "past the stale window it is dropped")
+
+    stats = cache.stats()
+    check(
+        (stats["hits"], stats["misses"], stats["stale_hits"], stats["expirations"]) == (1, 1, 1, 1),
+        "stats count 1 hit, 1 miss, 1 stale hit and 1 expiration"
+    )
+
+    # LRU eviction by entry count: touching "a" makes "b" the oldest
+    cache = TTLCache("check", max_entries=2, max_bytes=1024 * 1024, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    check(cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3, "max_entries evicts the least recently used entry")
+    check(cache.stats()["evictions"] == 1, "the eviction is counted")
+    check(cache.stats()["hit_ratio"] == 0.75, f"hit ratio {cache.stats()['hit_ratio']:.2f} after 3 hits and 1 miss")
+
+    # LRU eviction by bytes
+    value = "x" * 1000
+    size = estimate_size(value)
+    cache = TTLCache("check", max_entries=100, max_bytes=size * 2, ttl_seconds=60)
+    cache.set("a", value)
+    cache.set("b", value)
+    cache.get("a")
+    cache.set("c", value)
+    check(list(cache._entries) == ["a", "c"], f"max_bytes evicts the least recently used entry: {list(cache._entries)}")
+    check(cache.stats()["bytes"] <= size * 2, f"cache holds {cache.stats()['bytes']} of {size * 2} bytes")
+    cache.set("huge", "x" * size * 3)
+    check("huge" not in cache._entries and len(cache) == 2, "a value larger than max_bytes is not cached")
+
+    # A response-cache hit skips the graph and the backend
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = (await client.post("/api/v1/search", json={"query": "bread"})).json()
+        runs, queries, hits = graph_flight.started, fake.queries, response_cache.hits
+        check(first["success"] and len(response_cache) == 1, "a successful search is cached")
+
+        second = (await client.post("/api/v1/search", json={"query": "bread"})).json()
+        check(graph_flight.started == runs and fake.queries == queries, "the repeat ran no graph and sent no backend query")
+        check(response_cache.hits == hits + 1, "the repeat is counted as a response-cache hit")
+        check(
+            second["execution"].get("served_from") == "response_cache" and second["execution"].get("cache_hit"),
+            f"the repeat reports served_from={second['execution'].get('served_from')}"
+        )
+        check(
+            [product["id"] for product in second["products"]] == [product["id"] for product in first["products"]],
+            "the cached response returns the same products"
+        )
+
+        stats = (await client.get("/api/v1/cache/stats")).json()
+        entry = next(cache for cache in stats["caches"] if cache["name"] == "search_response")
+        check(entry["hits"] >= 1 and entry["entries"] == 1, f"/api/v1/cache/stats reports the hit: {entry['hits']} hits")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,71 @@
+"""Regression check: graph state grows linearly with the messages agents produce.
+
+Every node returns only the keys it changed, and the operator.add reducers on
+messages, reasoning and completed_tool_calls append them. If a node returns the
+whole state again, each hop re-appends the full history and the lists grow by
+duplication. This runs the graph against the fake Weaviate client and checks
+that every list holds each entry exactly once.
+
+Usage: python scripts/check_state_growth.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scripts.fake_weaviate import FakeWeaviateClient, install
+from src.api.main import SearchRequest, calculate_dynamic_alpha, create_initial_state
+from src.core.graph import search_graph
+
+# Queries that exercise one search iteration, the broaden loop, and routing
+# straight to the response compiler
+QUERIES = ["organic whole milk", "potatoes", "xyzzy plugh frobnicate", "help"]
+
+def expected_sizes(final_state) -> dict:
+    """Entries the agents actually produced for this run"""
+    tool_calls = final_state.get("completed_tool_calls", [])
+    iterations = sum(1 for step in final_state["reasoning"] if step.startswith("Search iteration"))
+    searched = final_state.get("routing_decision") == "product_search"
+    planned = len([m for m in final_state["messages"] if m["role"] == "assistant" and m["tool_calls"]])
+    reranked = sum(1 for step in final_state["reasoning"] if step.startswith("Re-ranked"))
+
+    return {
+        # human + 2 supervisor + (search start + planned calls + tool results)
+        "messages": 3 + (1 + planned + len(tool_calls) if searched else 0),
+        # supervisor + per iteration a plan line and (when tools ran) an analysis
+        # line + the reranker's summary when it reordered results
+        "reasoning": 1 + iterations + planned + reranked,
+        "completed_tool_calls": len(tool_calls),
+    }
+
+async def main() -> int:
+    install(FakeWeaviateClient(latency_ms=1))
+    failures = 0
+
+    for query in QUERIES:
+        request = SearchRequest(query=query)
+        state = create_initial_state(request, calculate_dynamic_alpha(query))
+        final_state = await search_graph.ainvoke(state)
+
+        expected = expected_sizes(final_state)
+        for key, want in expected.items():
+            entries = final_state.get(key, [])
+            got = len(entries)
+            # The same message dict appearing twice means a hop re-appended history
+            dicts = [entry for entry in entries if isinstance(entry, dict)]
+            duplicates = len(dicts) - len({id(entry) for entry in dicts})
+            status = "✅" if got == want and duplicates == 0 else "❌"
+            if status == "❌":
+                failures += 1
+            print(f"{status} {query!r:28} {key:22} {got:3} entries (expected {want})")
+
+    if failures:
+        print(f"\n❌ {failures} state lists grew beyond the entries agents produced")
+        return 1
+    print("\n✅ State size is linear in the number of real messages")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
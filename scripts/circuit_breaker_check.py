@@ -0,0 +1,102 @@
+"""Check that a Weaviate outage trips the circuit breaker and searches degrade.
+
+Against the fake Weaviate client this runs searches while the backend is
+healthy, then makes Weaviate slow (which alone must not open the breaker by
+default), then makes every query fail. Once the breaker opens, searches must
+return quickly and be flagged degraded, served from the stale result cache
+for queries seen before and from the catalog snapshot otherwise. When the
+backend recovers, a half-open probe must close the breaker again. Finally a
+standalone breaker with slow_call_ms set must open on slow calls.
+
+Usage: python scripts/circuit_breaker_check.py
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from scripts.fake_weaviate import FakeWeaviateClient, install, make_catalog
+from src.api.main import app, response_cache
+from src.core.catalog_snapshot import CatalogSnapshot, set_catalog_snapshot
+from src.core.circuit_breaker import CircuitBreaker
+from src.tools.search_tools import search_result_cache, weaviate_breaker
+
+WARM_QUERIES = ["organic whole milk", "russet potatoes", "greek yogurt"]
+COLD_QUERIES = ["cheddar cheese", "atlantic salmon", "gala apples"]
+
+async def search(client: httpx.AsyncClient, query: str):
+    start = time.perf_counter()
+    response = (await client.post("/api/v1/search", json={"query": query})).json()
+    return response, (time.perf_counter() - start) * 1000
+
+async def main() -> int:
+    catalog = make_catalog(500)
+    fake = install(FakeWeaviateClient(latency_ms=5, catalog=catalog))
+    set_catalog_snapshot(CatalogSnapshot(catalog))
+    weaviate_breaker.open_seconds = 0.5
+    # Warm results expire quickly so the outage has to serve them stale
+    search_result_cache.ttl_seconds = 0.1
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for query in WARM_QUERIES:
+            response, _ = await search(client, query)
+            check(response["success"] and not response["degraded"], f"healthy search for {query!r}")
+
+        # Slow period: only failures open the breaker unless
+        # breaker_slow_call_ms is set
+        fake.latency_ms = 200
+        for attempt in range(weaviate_breaker.min_calls * 2):
+            await search(client, f"slow probe {attempt}")
+        check(weaviate_breaker.state.value == "closed", "a slow backend alone leaves the breaker closed")
+        fake.latency_ms = 5
+
+        # Outage: every query fails until the breaker opens
+        await asyncio.sleep(search_result_cache.ttl_seconds)
+        fake.failure_rate = 1.0
+        response_cache.clear()
+        attempts = 0
+        while weaviate_breaker.state.value != "open" and attempts < 50:
+            await search(client, f"outage probe {attempts}")
+            attempts += 1
+        check(weaviate_breaker.state.value == "open", f"breaker opened after {attempts} failing searches")
+
+        queries_before = fake.queries
+        for query in WARM_QUERIES + COLD_QUERIES:
+            response, elapsed_ms = await search(client, query)
+            check(
+                response["success"] and response["degraded"] and elapsed_ms < 50,
+                f"degraded search for {query!r} in {elapsed_ms:.1f}ms with {len(response['products'])} products"
+            )
+        check(fake.queries == queries_before, "no queries reached Weaviate while open")
+        check(search_result_cache.stale_hits >= len(WARM_QUERIES), f"{search_result_cache.stale_hits} searches served from the stale cache")
+
+        # Recovery: after open_seconds a probe goes through and closes the breaker
+        fake.failure_rate = 0.0
+        await asyncio.sleep(weaviate_breaker.open_seconds)
+        response_cache.clear()
+        response, _ = await search(client, "free range eggs")
+        check(weaviate_breaker.state.value == "closed", "half-open probe closed the breaker")
+        check(response["success"] and not response["degraded"], "searches are healthy again")
+
+    # Opt-in slow-call tracking opens the breaker on a slow backend
+    breaker = CircuitBreaker("slow", slow_call_ms=10, min_calls=5, window=5)
+    for _ in range(5):
+        await breaker.call(lambda: asyncio.sleep(0.02))
+    check(breaker.state.value == "open", "with slow_call_ms set, slow calls open the breaker")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,53 @@
+"""Check that concurrent tool searches overlap instead of queueing on the event loop.
+
+Runs N searches through ProductSearchTool against the in-process fake Weaviate
+client (scripts/fake_weaviate.py) with a fixed round-trip latency. With a truly
+async path the whole batch should take about one round trip, not N.
+
+Usage: python scripts/concurrent_search_check.py [--n 20] [--latency-ms 100]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scripts.fake_weaviate import FakeWeaviateClient
+from src.core.weaviate_client import WeaviateClientRegistry
+from src.tools.search_tools import ProductSearchTool
+
+
+async def main(n: int, latency_ms: float) -> int:
+    registry = WeaviateClientRegistry(client=FakeWeaviateClient(latency_ms=latency_ms))
+    tool = ProductSearchTool(registry=registry)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(tool.run(query=f"query {i}", limit=5) for i in range(n))
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    failed = [r for r in results if not r["success"]]
+    print(f"{n} concurrent searches at {latency_ms:.0f}ms each took {elapsed_ms:.1f}ms")
+    print(f"Serial execution would take ~{n * latency_ms:.0f}ms")
+
+    if failed:
+        print(f"❌ {len(failed)} searches failed: {failed[0].get('error')}")
+        return 1
+    # Allow generous scheduling slack, but far less than a second round trip
+    if elapsed_ms > latency_ms * 1.5:
+        print("❌ Searches did not overlap")
+        return 1
+    print("✅ Searches completed in about one round trip")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.n, args.latency_ms)))
@@ -0,0 +1,110 @@
+"""Check per-agent latency budgets against a backend slower than the budget.
+
+With budgets enabled and the fake Weaviate client answering in 250ms, a
+product_search budget of 100ms must cut the search off: the response comes
+back within the budget, flagged degraded, with product_search listed in
+degraded_agents. The Weaviate query the search gave up on must still finish
+and fill the tool cache, so repeating the query is served from the warm
+cache, whole and fast, without another backend query. Concurrent repeats
+of a query whose search is still in flight must join it. With budgets off,
+the request-wide deadline alone must still end in a degraded answer on
+both the JSON and streaming endpoints rather than a request timeout, and
+a details step cut off by it must keep the search's products.
+
+Usage: python scripts/deadline_check.py
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from scripts.fake_weaviate import FakeWeaviateClient, install
+from src.api.main import app, response_cache
+from src.config.settings import settings
+from src.core.config_manager import config_manager
+from src.tools.search_tools import search_result_cache
+
+BACKEND_MS = 250
+BUDGET_MS = 100
+
+async def search(client: httpx.AsyncClient, query: str):
+    start = time.perf_counter()
+    response = (await client.post("/api/v1/search", json={"query": query})).json()
+    return response, (time.perf_counter() - start) * 1000
+
+async def main() -> int:
+    fake = install(FakeWeaviateClient(latency_ms=BACKEND_MS))
+    settings.agent_budgets_enabled = True
+    config_manager.config["agents"]["product_search"]["timeout_ms"] = BUDGET_MS
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # Cold: the backend is slower than the budget
+        response, elapsed_ms = await search(client, "organic whole milk")
+        check(elapsed_ms < BACKEND_MS, f"cold search returned at its budget in {elapsed_ms:.0f}ms")
+        check(response["degraded"], "cold search is flagged degraded")
+        check("product_search" in response["execution"].get("degraded_agents", []), "product_search is listed in degraded_agents")
+        check(len(response_cache) == 0, "the partial response is not cached")
+
+        # The abandoned Weaviate query still finishes and warms the tool cache
+        await asyncio.sleep(BACKEND_MS * 1.5 / 1000)
+        check(len(search_result_cache) == 1, f"abandoned query filled the tool cache ({len(search_result_cache)} entries)")
+        check(fake.queries == 1, f"one backend query so far ({fake.queries})")
+
+        # Warm: the same query is answered from the tool cache inside the budget
+        response, elapsed_ms = await search(client, "organic whole milk")
+        check(
+            response["success"] and not response["degraded"] and elapsed_ms < BUDGET_MS,
+            f"warm search served {len(response['products'])} products in {elapsed_ms:.0f}ms"
+        )
+        check(fake.queries == 1, "warm search sent no backend query")
+
+        # Repeats of a cold query join the search still in flight
+        queries_before = fake.queries
+        for _ in range(5):
+            await search(client, "russet potatoes")
+        check(fake.queries - queries_before == 1, f"5 cut-off repeats sent {fake.queries - queries_before} backend query")
+        await asyncio.sleep(BACKEND_MS * 1.5 / 1000)
+        response, _ = await search(client, "russet potatoes")
+        check(response["success"] and not response["degraded"], "the repeated query recovers once the cache is warm")
+
+        # Budgets off: the request deadline alone still ends in a compiled,
+        # degraded answer rather than a request timeout
+        settings.agent_budgets_enabled = False
+        settings.search_timeout_ms = BUDGET_MS
+        response, elapsed_ms = await search(client, "gala apples")
+        check(
+            response["degraded"] and not response.get("error") and elapsed_ms < BACKEND_MS,
+            f"request deadline returned a degraded answer in {elapsed_ms:.0f}ms, not a timeout"
+        )
+        lines = (await client.post("/api/v1/search/stream", json={"query": "greek yogurt"})).text.splitlines()
+        final = json.loads(lines[-1])
+        check(final["event"] == "final" and final["data"]["degraded"], "the stream ends in a degraded final event, not a timeout")
+
+        # A details step running past the deadline keeps the search's products
+        settings.search_details_enabled = True
+        settings.search_timeout_ms = BACKEND_MS + BUDGET_MS
+        response, _ = await search(client, "bread")
+        check(
+            response["success"] and len(response["products"]) == 10,
+            f"details cut off by the deadline kept {len(response['products'])} products"
+        )
+        # Let the abandoned details lookup land before the loop shuts down
+        await asyncio.sleep(BACKEND_MS * 1.5 / 1000)
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
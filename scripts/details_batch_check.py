@@ -0,0 +1,79 @@
+"""Check that the search agent fetches top-product details in one bulk query.
+
+With search_details_enabled, a search returning more than 20 products should
+take one more iteration that calls get_product_details_batch for the top 5,
+issuing a single fetch_objects query rather than one per product. Several
+concurrent searches should share one fetch_objects query through the SKU
+batch loader, and the enriched records must still come back in the response.
+A search that finds too few products for another iteration to help must
+still return them.
+
+Usage: python scripts/details_batch_check.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from scripts.fake_weaviate import FakeWeaviateClient, install, make_catalog
+from src.api.main import app
+from src.config.settings import settings
+
+QUERIES = ["milk", "bread", "potatoes", "tomatoes"]
+
+async def main() -> int:
+    fake = install(FakeWeaviateClient(latency_ms=20))
+    settings.search_details_enabled = True
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    # Count detail lookups separately from hybrid queries
+    batches = []
+    fetch_objects = fake._query.fetch_objects
+
+    async def counted_fetch_objects(filters=None, **kwargs):
+        batches.append(list(filters.value))
+        return await fetch_objects(filters=filters, **kwargs)
+
+    fake._query.fetch_objects = counted_fetch_objects
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = (await client.post("/api/v1/search", json={"query": QUERIES[0]})).json()
+        steps = response["execution"]["reasoning_steps"]
+        check(any("detailed information for top 5" in step for step in steps), "a large result set plans one details iteration")
+        check(len(batches) == 1 and len(batches[0]) == 5, f"top 5 details came from one backend query: {[len(batch) for batch in batches]}")
+        check(response["success"] and len(response["products"]) == 10 and not response["degraded"], "the response is whole after the details step")
+
+        # Details from concurrent searches are batched into one lookup
+        batches.clear()
+        responses = await asyncio.gather(*(client.post("/api/v1/search", json={"query": query}) for query in QUERIES[1:]))
+        check(all(response.json()["success"] for response in responses), f"{len(responses)} concurrent searches succeeded")
+        check(len(batches) == 1, f"their details came from {len(batches)} backend query with {sum(map(len, batches))} SKUs")
+
+        # Off by default: no extra round trip
+        settings.search_details_enabled = False
+        batches.clear()
+        await client.post("/api/v1/search", json={"query": "russet potatoes"})
+        check(not batches, "with search_details_enabled off no details are fetched")
+
+        # An insufficient search with nothing left to plan keeps its products
+        install(FakeWeaviateClient(latency_ms=20, catalog=make_catalog(100)))
+        response = (await client.post("/api/v1/search", json={"query": "atlantic salmon"})).json()
+        check(
+            response["success"] and 3 <= len(response["products"]) < 10,
+            f"an insufficient search still returns the {len(response['products'])} products it found"
+        )
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
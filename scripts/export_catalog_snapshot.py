@@ -0,0 +1,48 @@
+"""Export the Weaviate product collection to a catalog snapshot file.
+
+The snapshot is JSON lines, one product per line with its Weaviate
+properties. With --vectors each record also carries its embedding under
+"_vector". Point CATALOG_SNAPSHOT_PATH at the file to serve degraded
+searches from it while Weaviate is unavailable, or also set
+SEARCH_BACKEND=local to serve every search in-process without Weaviate.
+
+Usage: python scripts/export_catalog_snapshot.py data/catalog_snapshot.jsonl [--vectors]
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.core.catalog_snapshot import VECTOR_KEY
+from src.core.weaviate_client import weaviate_registry
+from src.tools.search_tools import clean_properties
+
+async def export(path: Path, include_vectors: bool) -> int:
+    collection = await weaviate_registry.get_collection()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    count = 0
+    try:
+        with path.open("w", encoding="utf-8") as f:
+            async for item in collection.iterator(include_vector=include_vectors):
+                record = clean_properties(item.properties)
+                if include_vectors and item.vector:
+                    record[VECTOR_KEY] = item.vector.get("default")
+                f.write(json.dumps(record) + "\n")
+                count += 1
+    finally:
+        await weaviate_registry.close()
+
+    print(f"✅ Exported {count} products to {path}")
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--vectors", action="store_true", help="Include embeddings")
+    args = parser.parse_args()
+    asyncio.run(export(args.path, args.vectors))
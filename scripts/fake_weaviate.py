@@ -0,0 +1,154 @@
+"""In-process stand-in for the Weaviate v4 async client used by the search tools.
+
+Only the surface the tools touch is implemented: is_connected/connect/close,
+collections.get(name).query.hybrid(...) and .fetch_objects(...). Hybrid search
+is a naive token-overlap ranking over a synthetic catalog (or, with
+ranking="bm25", the in-process LocalHybridSearchEngine, which stays cheap on
+large catalogs), and every query sleeps for a round-trip latency drawn from
+a configurable distribution. A failure rate makes queries raise connection
+errors to simulate an outage.
+
+Usage from a script:
+    from scripts.fake_weaviate import FakeWeaviateClient, install
+    client = install(FakeWeaviateClient(latency_ms=20))
+"""
+import asyncio
+import random
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+NAMES = [
+    "organic whole milk", "2% milk", "russet potatoes", "red potatoes", "roma tomatoes",
+    "whole wheat bread", "gluten free bread", "bananas", "gala apples", "greek yogurt",
+    "cheddar cheese", "baby spinach", "grass fed ground beef", "atlantic salmon",
+    "sourdough loaf", "red bell peppers", "broccoli crowns", "free range eggs",
+]
+BRANDS = ["Horizon", "Organic Valley", "Baldor", "Dole", "Chobani", "Tillamook", "Udi's"]
+CATEGORIES = ["dairy", "vegetables", "fruits", "bakery", "meat", "seafood"]
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+def make_catalog(size: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Synthetic products shaped like the Weaviate Product class"""
+    rng = random.Random(seed)
+    catalog = []
+    for i in range(size):
+        name = NAMES[i % len(NAMES)]
+        catalog.append({
+            "sku": f"SKU{i:07d}",
+            "productId": f"P{i:07d}",
+            "name": name if i < len(NAMES) else f"{name} {i}",
+            "description": f"{rng.choice(['Fresh', 'Organic', 'Local'])} {name}",
+            "brand": rng.choice(BRANDS),
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "size": str(rng.choice([1, 2, 5, 12, 16, 32])),
+            "unit": rng.choice(["lb", "oz", "each", "gal"]),
+        })
+    return catalog
+
+class FakeQuery:
+    """Mimics collection.query on the async client"""
+
+    def __init__(self, client: "FakeWeaviateClient"):
+        self.client = client
+
+    async def hybrid(self, query: str, alpha: Optional[float] = None, limit: Optional[int] = None, **kwargs):
+        await self.client.round_trip()
+        if kwargs.get("vector") is not None:
+            self.client.vector_queries += 1
+        if self.client.engine is not None:
+            products = self.client.engine.search(query, limit=limit or 10, alpha=0.0)
+            return self.client.query_return(
+                [(product.pop("score"), product) for product in products],
+                kwargs.get("return_properties")
+            )
+        words = set(query.lower().split())
+        scored = []
+        for product in self.client.catalog:
+            text = f"{product['name']} {product['category']} {product['brand']}".lower()
+            score = sum(1 for word in words if word in text)
+            if score:
+                scored.append((score, product))
+        scored.sort(key=lambda pair: -pair[0])
+        return self.client.query_return(scored[:limit or 10], kwargs.get("return_properties"))
+
+    async def fetch_objects(self, filters=None, limit: Optional[int] = None, **kwargs):
+        await self.client.round_trip()
+        wanted = filters.value if isinstance(filters.value, list) else [filters.value]
+        found = [(1.0, self.client.by_sku[sku]) for sku in wanted if sku in self.client.by_sku]
+        return self.client.query_return(found[:limit], kwargs.get("return_properties"))
+
+class FakeWeaviateClient:
+    """Mimics the parts of WeaviateAsyncClient used by the tools"""
+
+    def __init__(
+        self,
+        catalog_size: int = 500,
+        latency_ms: float = 20.0,
+        catalog: Optional[List[Dict]] = None,
+        failure_rate: float = 0.0,
+        latency_distribution: str = "fixed",
+        latency_sigma: float = 0.5,
+        latency_seed: int = 17,
+        ranking: str = "overlap"
+    ):
+        self.catalog = catalog if catalog is not None else make_catalog(catalog_size)
+        self.by_sku = {product["sku"]: product for product in self.catalog}
+        # latency_ms is the median for every distribution
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_distribution must be one of {LATENCY_DISTRIBUTIONS}")
+        self.latency_ms = latency_ms
+        self.latency_distribution = latency_distribution
+        self.latency_sigma = latency_sigma
+        self._latency_rng = random.Random(latency_seed)
+        self.engine = None
+        if ranking == "bm25":
+            from src.core.local_search import LocalHybridSearchEngine
+            self.engine = LocalHybridSearchEngine(self.catalog)
+        # Share of queries that fail with a connection error (1.0 = outage)
+        self.failure_rate = failure_rate
+        self._failure_rng = random.Random(3)
+        self.queries = 0
+        # Hybrid queries that arrived with a precomputed vector
+        self.vector_queries = 0
+        self._connected = False
+        self._query = FakeQuery(self)
+        self.collections = SimpleNamespace(get=lambda name: SimpleNamespace(query=self._query))
+
+    def sample_latency_s(self) -> float:
+        if self.latency_distribution == "uniform":
+            return self.latency_ms * self._latency_rng.uniform(0.5, 1.5) / 1000
+        if self.latency_distribution == "lognormal":
+            # Long right tail, like real network plus query latency
+            return self.latency_ms * self._latency_rng.lognormvariate(0.0, self.latency_sigma) / 1000
+        return self.latency_ms / 1000
+
+    async def round_trip(self):
+        self.queries += 1
+        await asyncio.sleep(self.sample_latency_s())
+        if self.failure_rate and self._failure_rng.random() < self.failure_rate:
+            raise ConnectionError("Fake Weaviate unavailable")
+
+    def query_return(self, scored, return_properties=None):
+        objects = []
+        for score, product in scored:
+            properties = dict(product)
+            if return_properties:
+                properties = {k: v for k, v in properties.items() if k in return_properties}
+            objects.append(SimpleNamespace(properties=properties, metadata=SimpleNamespace(score=float(score))))
+        return SimpleNamespace(objects=objects)
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    async def connect(self):
+        self._connected = True
+
+    async def close(self):
+        self._connected = False
+
+def install(client: FakeWeaviateClient) -> FakeWeaviateClient:
+    """Point the shared client registry at the fake"""
+    from src.core.weaviate_client import weaviate_registry
+    weaviate_registry.set_client(client)
+    return client
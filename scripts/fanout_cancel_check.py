@@ -0,0 +1,65 @@
+"""Check that fan-out branches cancelled as unneeded never finish their query.
+
+With search fan-out on and the fake Weaviate client answering the keyword
+and vector variants (alpha 0 and 1) far slower than the primary search,
+the primary alone is sufficient and the agent cancels the variants. Their
+Weaviate queries must be cancelled with them: none may complete or fill
+the tool cache, even after waiting out their latency.
+
+Usage: python scripts/fanout_cancel_check.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from scripts.fake_weaviate import FakeWeaviateClient, install
+from src.api.main import app
+from src.config.settings import settings
+from src.tools.search_tools import search_result_cache
+
+SLOW_VARIANT_MS = 300
+
+async def main() -> int:
+    fake = install(FakeWeaviateClient(latency_ms=20))
+    settings.search_fanout_enabled = True
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    # Slow the keyword- and vector-only variants and record what completes
+    started, completed = [], []
+    hybrid = fake._query.hybrid
+
+    async def slow_variant_hybrid(query: str, alpha=None, **kwargs):
+        started.append(alpha)
+        if alpha in (0.0, 1.0):
+            await asyncio.sleep(SLOW_VARIANT_MS / 1000)
+        result = await hybrid(query, alpha=alpha, **kwargs)
+        completed.append(alpha)
+        return result
+
+    fake._query.hybrid = slow_variant_hybrid
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = (await client.post("/api/v1/search", json={"query": "bread"})).json()
+        check(response["success"] and not response["degraded"], f"search returned {len(response['products'])} products")
+        check(len(started) == 3, f"primary and 2 variants were sent ({started})")
+
+        # Give any surviving variant time to finish
+        await asyncio.sleep(SLOW_VARIANT_MS * 1.5 / 1000)
+        check(len(completed) == 1 and completed[0] not in (0.0, 1.0), f"only the primary query completed ({completed})")
+        check(len(search_result_cache) == 1, f"cancelled variants left no cache entries ({len(search_result_cache)} entries)")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
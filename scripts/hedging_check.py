@@ -0,0 +1,118 @@
+"""Check that hedged hybrid queries cut tail latency without flooding Weaviate.
+
+Runs unique searches through ProductSearchTool against the fake Weaviate
+client, whose latency has a slow tail (a few percent of queries take many
+times the median). Compares p50/p99 with hedging off and on, then simulates
+an outage where every query is slow and checks that the hedge rate stays
+under the configured cap.
+
+Usage: python scripts/hedging_check.py [--requests 600]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from scripts.fake_weaviate import FakeWeaviateClient, install
+from src.config.settings import settings
+from src.core.hedging import Hedger
+from src.tools import search_tools
+
+class SlowTailClient(FakeWeaviateClient):
+    """Fake client where tail_rate of queries take tail_factor times longer"""
+
+    def __init__(self, tail_rate: float, tail_factor: float, **kwargs):
+        super().__init__(**kwargs)
+        self.tail_rate = tail_rate
+        self.tail_factor = tail_factor
+        self.rng = random.Random(11)
+
+    def sample_latency_s(self) -> float:
+        base = self.latency_ms * self.rng.uniform(0.8, 1.2) / 1000
+        if self.rng.random() < self.tail_rate:
+            return base * self.tail_factor
+        return base
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+async def run(client, hedger, requests: int, concurrency: int = 8):
+    search_tools.search_hedger = hedger
+    tool = search_tools.ProductSearchTool()
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            result = await tool.run(f"potatoes {i}", limit=5)
+            assert result["success"], result
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    queries_before = client.queries
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return latencies, client.queries - queries_before
+
+def new_hedger(enabled: bool) -> Hedger:
+    return Hedger(
+        name="product_search",
+        enabled=enabled,
+        percentile=settings.hedge_percentile,
+        min_delay_ms=settings.hedge_min_delay_ms,
+        max_rate=settings.hedge_max_rate,
+        min_samples=settings.hedge_min_samples
+    )
+
+async def main(requests: int) -> int:
+    # Unique queries already bypass the tool cache; disable it so reruns do too
+    settings.tool_cache_enabled = False
+    # Measure the hedger alone; the simulated outage's slow calls would also
+    # open the breaker if breaker_slow_call_ms were set
+    settings.breaker_enabled = False
+    failures = 0
+
+    print(f"{'mode':>10} {'p50 ms':>8} {'p99 ms':>8} {'queries':>8} {'hedges':>7} {'wins':>5}")
+    results = {}
+    for enabled in (False, True):
+        client = install(SlowTailClient(tail_rate=0.03, tail_factor=15, latency_ms=10))
+        hedger = new_hedger(enabled)
+        latencies, queries = await run(client, hedger, requests)
+        results[enabled] = latencies
+        mode = "hedged" if enabled else "baseline"
+        print(f"{mode:>10} {percentile(latencies, 50):8.1f} {percentile(latencies, 99):8.1f} "
+              f"{queries:8d} {hedger.hedges:7d} {hedger.hedge_wins:5d}")
+
+    improvement = percentile(results[False], 99) / percentile(results[True], 99)
+    if improvement < 1.5:
+        print(f"❌ Hedging improved p99 only {improvement:.2f}x")
+        failures += 1
+    else:
+        print(f"✅ Hedging cut p99 by {improvement:.1f}x")
+
+    # Outage: warm up on a healthy backend, then every query becomes slow
+    client = install(SlowTailClient(tail_rate=0.0, tail_factor=1, latency_ms=10))
+    hedger = new_hedger(True)
+    await run(client, hedger, settings.hedge_min_samples * 2)
+    client.latency_ms = 100
+    hedges_before, requests_before = hedger.hedges, hedger.requests
+    await run(client, hedger, requests // 2)
+    rate = (hedger.hedges - hedges_before) / (hedger.requests - requests_before)
+    if rate > settings.hedge_max_rate + 0.01:
+        print(f"❌ Hedge rate during outage {rate:.1%} exceeds cap {settings.hedge_max_rate:.0%}")
+        failures += 1
+    else:
+        print(f"✅ Hedge rate during outage {rate:.1%} stays under cap {settings.hedge_max_rate:.0%}")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=600)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.requests)))
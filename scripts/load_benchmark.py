@@ -0,0 +1,299 @@
+"""Offline load benchmark for the search graph and the FastAPI app.
+
+Everything runs in-process: the fake Weaviate client stands in for the
+cluster (configurable catalog size and latency distribution) and the API
+is driven through httpx's ASGI transport, so no network is involved. For
+each concurrency level the harness reports throughput, latency
+percentiles, errors and degraded responses, event-loop lag, and
+allocations per request (a separate tracemalloc pass, since tracing
+slows everything down).
+
+Caches are off by default so every request runs the whole pipeline; pass
+--cache to measure a warm service instead.
+
+Usage:
+    python scripts/load_benchmark.py --mode api --concurrency 1,8,32,128 \\
+        --requests 400 --latency-ms 20 --latency-distribution lognormal \\
+        --output benchmarks/load.json
+    python scripts/load_benchmark.py --compare benchmarks/load.json  # exits 1 on regression
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import structlog
+
+def quiet_logs(level: str):
+    """Per-request info logs would dominate the measurement"""
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(getattr(logging, level.upper())))
+    logging.getLogger().setLevel(level.upper())
+
+MODIFIERS = ["", "organic ", "fresh ", "large ", "gluten free ", "cheap "]
+
+def make_queries(count: int, hot_ratio: float, seed: int = 23) -> List[str]:
+    """Unique queries, except hot_ratio of them drawn from a few popular ones"""
+    from scripts.fake_weaviate import NAMES
+    rng = random.Random(seed)
+    hot = [f"{MODIFIERS[i % len(MODIFIERS)]}{name}" for i, name in enumerate(NAMES[:5])]
+    return [
+        rng.choice(hot) if rng.random() < hot_ratio else f"{rng.choice(MODIFIERS)}{rng.choice(NAMES)} {i}"
+        for i in range(count)
+    ]
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def at(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))], 3)
+
+    return {
+        "p50": at(50),
+        "p95": at(95),
+        "p99": at(99),
+        "max": round(ordered[-1], 3),
+        "mean": round(sum(ordered) / len(ordered), 3)
+    }
+
+class LoopLagMonitor:
+    """Measures how late a periodic timer fires, i.e. event-loop blocking"""
+
+    def __init__(self, interval_ms: float = 5.0):
+        self.interval_s = interval_ms / 1000
+        self.lags_ms: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval_s
+            await asyncio.sleep(self.interval_s)
+            self.lags_ms.append(max(0.0, (time.perf_counter() - expected) * 1000))
+
+    def start(self):
+        self.lags_ms = []
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> List[float]:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        return self.lags_ms
+
+async def drive(call: Callable[[str], Awaitable[Dict[str, Any]]], queries: List[str], concurrency: int) -> Dict[str, Any]:
+    """Run queries with a fixed number of concurrent workers"""
+    latencies: List[float] = []
+    outcome = {"errors": 0, "degraded": 0}
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < len(queries):
+            query = queries[next_index]
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                result = await call(query)
+            except Exception:
+                outcome["errors"] += 1
+                continue
+            latencies.append((time.perf_counter() - start) * 1000)
+            if result.get("degraded"):
+                outcome["degraded"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return {"elapsed_s": time.perf_counter() - start, "latencies_ms": latencies, **outcome}
+
+async def measure_allocations(call, queries: List[str], concurrency: int) -> Dict[str, float]:
+    """Peak traced memory per in-flight request, and memory retained per request"""
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await drive(call, queries, concurrency)
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_kib_per_inflight_request": round((peak - baseline) / 1024 / min(concurrency, len(queries)), 1),
+        "retained_kib_per_request": round((current - baseline) / 1024 / len(queries), 2)
+    }
+
+def make_graph_call():
+    from src.api.main import SearchRequest, calculate_dynamic_alpha, create_initial_state, default_candidate_limit
+    from src.config.settings import settings
+    from src.core.deadline import deadline_scope
+    from src.core.graph import search_graph
+    from src.core.query_analysis import analyze_query
+
+    async def call(query: str) -> Dict[str, Any]:
+        request = SearchRequest(query=query)
+        analysis = analyze_query(query)
+        alpha = calculate_dynamic_alpha(query, analysis["attribute_matches"])
+        state = create_initial_state(request, alpha, analysis, default_candidate_limit(request.limit))
+        with deadline_scope(settings.search_timeout_ms / 1000):
+            final_state = await search_graph.ainvoke(state)
+        response = final_state.get("final_response", {})
+        return {"degraded": response.get("metadata", {}).get("degraded", False)}
+
+    return call, None
+
+def make_api_call():
+    import httpx
+    from src.api.main import app
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+    async def call(query: str) -> Dict[str, Any]:
+        response = await client.post("/api/v1/search", json={"query": query})
+        response.raise_for_status()
+        return response.json()
+
+    return call, client
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent.parent
+        ).stdout.strip()
+    except Exception:
+        return None
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    from scripts.fake_weaviate import FakeWeaviateClient, install
+    from src.config.settings import settings
+    settings.tool_cache_enabled = args.cache
+    settings.response_cache_enabled = args.cache
+
+    install(FakeWeaviateClient(
+        catalog_size=args.catalog_size,
+        latency_ms=args.latency_ms,
+        latency_distribution=args.latency_distribution,
+        latency_sigma=args.latency_sigma,
+        ranking="bm25"
+    ))
+    call, client = make_api_call() if args.mode == "api" else make_graph_call()
+
+    results = []
+    try:
+        # Warm imports, JIT-free but lazy paths (graph compile, loaders, pools)
+        await drive(call, make_queries(args.warmup, 0.0, seed=1), min(8, args.warmup or 1))
+
+        for level, concurrency in enumerate(args.concurrency):
+            queries = make_queries(args.requests, args.hot_ratio, seed=100 + level)
+            monitor = LoopLagMonitor(args.lag_interval_ms)
+            monitor.start()
+            run = await drive(call, queries, concurrency)
+            lags = await monitor.stop()
+
+            alloc_queries = make_queries(args.alloc_requests, args.hot_ratio, seed=200 + level)
+            allocations = await measure_allocations(call, alloc_queries, concurrency) if args.alloc_requests else {}
+
+            result = {
+                "mode": args.mode,
+                "concurrency": concurrency,
+                "requests": len(queries),
+                "errors": run["errors"],
+                "degraded": run["degraded"],
+                "throughput_rps": round(len(run["latencies_ms"]) / run["elapsed_s"], 1),
+                "latency_ms": percentiles(run["latencies_ms"]),
+                "loop_lag_ms": percentiles(lags),
+                "allocations": allocations
+            }
+            results.append(result)
+            print_result(result)
+    finally:
+        if client is not None:
+            await client.aclose()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {
+                key: value for key, value in vars(args).items()
+                if key not in ("output", "compare", "log_level")
+            }
+        },
+        "results": results
+    }
+
+def print_result(result: Dict[str, Any]):
+    latency, lag, alloc = result["latency_ms"], result["loop_lag_ms"], result["allocations"]
+    print(
+        f"{result['mode']:5} c={result['concurrency']:<4} {result['throughput_rps']:8.1f} req/s  "
+        f"p50 {latency.get('p50', 0):7.2f}  p95 {latency.get('p95', 0):7.2f}  p99 {latency.get('p99', 0):7.2f} ms  "
+        f"lag p99 {lag.get('p99', 0):6.2f} ms  "
+        f"peak {alloc.get('peak_kib_per_inflight_request', 0):7.1f} KiB/req  "
+        f"errors {result['errors']}  degraded {result['degraded']}"
+    )
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> int:
+    """Print changes against a baseline run; 1 if p99 or throughput regressed"""
+    baseline_results = {(r["mode"], r["concurrency"]): r for r in baseline["results"]}
+    regressions = 0
+    print(f"\nAgainst baseline {baseline['meta'].get('git_revision')} ({baseline['meta'].get('timestamp')}):")
+    for result in current["results"]:
+        base = baseline_results.get((result["mode"], result["concurrency"]))
+        if base is None:
+            continue
+        p99, base_p99 = result["latency_ms"]["p99"], base["latency_ms"]["p99"]
+        rps, base_rps = result["throughput_rps"], base["throughput_rps"]
+        regressed = p99 > base_p99 * (1 + tolerance) or rps < base_rps * (1 - tolerance)
+        regressions += regressed
+        print(
+            f"{'❌' if regressed else '✅'} {result['mode']} c={result['concurrency']}: "
+            f"p99 {base_p99:.2f} → {p99:.2f} ms, throughput {base_rps:.1f} → {rps:.1f} req/s"
+        )
+    return 1 if regressions else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["api", "graph"], default="api")
+    parser.add_argument("--concurrency", default="1,8,32,128", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=400, help="Requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--alloc-requests", type=int, default=50, help="Requests in the tracemalloc pass (0 skips it)")
+    parser.add_argument("--catalog-size", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Median fake Weaviate latency")
+    parser.add_argument("--latency-distribution", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal shape; larger means a longer tail")
+    parser.add_argument("--hot-ratio", type=float, default=0.0, help="Share of requests for a few popular queries")
+    parser.add_argument("--cache", action="store_true", help="Keep the tool and response caches on")
+    parser.add_argument("--lag-interval-ms", type=float, default=5.0)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative p99/throughput change")
+    parser.add_argument("--log-level", default="error")
+    args = parser.parse_args()
+    args.concurrency = [int(level) for level in args.concurrency.split(",")]
+
+    quiet_logs(args.log_level)
+    report = asyncio.run(run_benchmark(args))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        return compare(report, json.loads(args.compare.read_text(encoding="utf-8")), args.tolerance)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
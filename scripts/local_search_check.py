@@ -0,0 +1,144 @@
+"""Check the in-process hybrid search engine and serve the graph offline with it.
+
+Builds LocalHybridSearchEngine over a synthetic catalog with random
+embeddings, checks that keyword-only and vector-only searches rank like
+BM25 and cosine similarity, that filters and projections apply, and times
+searches across catalog sizes, checking that run() moves searches of
+large catalogs off the event loop. Then runs /api/v1/search with
+SEARCH_BACKEND=local, so no Weaviate is involved at all.
+
+Usage: python scripts/local_search_check.py [--sizes 1000,10000,100000]
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+import numpy as np
+from scripts.fake_weaviate import make_catalog
+from src.config.settings import settings
+from src.core.catalog_snapshot import VECTOR_KEY, CatalogSnapshot, set_catalog_snapshot
+from src.core.local_search import THREAD_MIN_PRODUCTS, LocalHybridSearchEngine
+
+QUERIES = ["organic whole milk", "russet potatoes", "greek yogurt", "cheddar cheese", "gala apples"]
+
+def with_vectors(catalog, dim: int = 64, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((len(catalog), dim)).astype(np.float32)
+    return [{**product, VECTOR_KEY: vector.tolist()} for product, vector in zip(catalog, vectors)]
+
+async def search_thread(engine: LocalHybridSearchEngine, vector: np.ndarray) -> int:
+    """Thread that engine.search ran on when called through run()"""
+    threads = []
+    search = engine.search
+
+    def recording_search(*args, **kwargs):
+        threads.append(threading.get_ident())
+        return search(*args, **kwargs)
+
+    engine.search = recording_search
+    try:
+        await engine.run(QUERIES[0], limit=20, alpha=0.5, vector=vector)
+    finally:
+        del engine.search
+    return threads[0]
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+async def main(sizes) -> int:
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    catalog = with_vectors(make_catalog(2000))
+    engine = LocalHybridSearchEngine.from_snapshot(CatalogSnapshot(catalog))
+    check(engine.vectors is not None, "embeddings loaded from the snapshot")
+    check(all(VECTOR_KEY not in product for product in engine.products), "embeddings stripped from records")
+
+    keyword_only = engine.search("russet potatoes", limit=5, alpha=0.0)
+    check(
+        bool(keyword_only) and "russet potatoes" in keyword_only[0]["name"].lower(),
+        f"keyword search ranks the exact product first ({keyword_only[0]['name'] if keyword_only else None})"
+    )
+    bm25 = engine.keyword_scores("russet potatoes")
+    check(
+        [p["sku"] for p in keyword_only] == [engine.products[i]["sku"] for i in np.argsort(-bm25, kind="stable")[:5]],
+        "alpha=0 ranks by BM25"
+    )
+
+    # Most candidates tie at the bottom of the BM25 range on a large catalog
+    tied = LocalHybridSearchEngine(make_catalog(20000)).search("organic milk", limit=5)
+    check(len(tied) == 5, f"candidates normalised to 0 still fill the limit ({len(tied)} of 5)")
+
+    query_vector = np.array(catalog[42][VECTOR_KEY])
+    vector_only = engine.search("anything", limit=5, alpha=1.0, vector=query_vector)
+    check(vector_only[0]["sku"] == catalog[42]["sku"], "alpha=1 ranks by cosine similarity")
+
+    hybrid = engine.search("greek yogurt", limit=10, alpha=0.5, vector=query_vector)
+    check(
+        catalog[42]["sku"] in {p["sku"] for p in hybrid} and any("yogurt" in p["name"].lower() for p in hybrid),
+        "alpha=0.5 fuses keyword and vector hits"
+    )
+    check(all(0.0 <= p["score"] <= 1.0 for p in hybrid), "fused scores are relative, in [0, 1]")
+
+    category = catalog[0]["category"]
+    filtered = engine.search("organic", limit=20, alpha=0.0, filters={"category": category})
+    check(bool(filtered) and all(p["category"] == category for p in filtered), f"filter on category={category}")
+
+    result = await engine.run("greek yogurt", limit=3, projection="search")
+    check(
+        result["success"] and result["count"] == 3 and result["search_config"]["engine"] == "local",
+        "run() returns the ProductSearchTool result shape"
+    )
+
+    print("\nsize      p50 ms   p99 ms")
+    for size in sizes:
+        engine = LocalHybridSearchEngine.from_snapshot(CatalogSnapshot(with_vectors(make_catalog(size))))
+        vector = np.ones(engine.vectors.shape[1], dtype=np.float32)
+        latencies = []
+        for i in range(300):
+            start = time.perf_counter()
+            engine.search(QUERIES[i % len(QUERIES)], limit=20, alpha=0.5, vector=vector)
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(f"{size:<9} {percentile(latencies, 50):7.3f}  {percentile(latencies, 99):7.3f}")
+        if size <= 1000:
+            check(percentile(latencies, 50) < 1.0, f"sub-millisecond median on {size} products")
+        on_loop = await search_thread(engine, vector) == threading.get_ident()
+        if size >= THREAD_MIN_PRODUCTS:
+            check(not on_loop, f"run() on {size} products searches off the event loop")
+        else:
+            check(on_loop, f"run() on {size} products searches inline")
+
+    # The whole graph offline: no Weaviate client is ever created
+    from src.api.main import app
+    from src.core.weaviate_client import weaviate_registry
+    settings.search_backend = "local"
+    set_catalog_snapshot(CatalogSnapshot(make_catalog(500)))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = (await client.post("/api/v1/search", json={"query": "organic whole milk"})).json()
+    check(
+        response.get("success") and len(response.get("products", [])) > 0,
+        f"offline /api/v1/search returned {len(response.get('products', []))} products"
+    )
+    check(weaviate_registry._client is None, "Weaviate was never contacted")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main([int(size) for size in args.sizes.split(",")])))
@@ -0,0 +1,70 @@
+"""Check that /metrics exports stage latencies, search counters and gauges.
+
+Runs a few searches against the fake Weaviate client (including one
+during an outage) and checks that the Prometheus exposition contains the
+per-node and per-tool histograms, routing/intent/iteration/zero-result
+counters, cache and breaker gauges, and Weaviate error counts.
+
+Usage: python scripts/metrics_check.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from prometheus_client.parser import text_string_to_metric_families
+from scripts.fake_weaviate import FakeWeaviateClient, install
+from src.api.main import app
+
+QUERIES = ["organic whole milk", "organic whole milk", "xyzzy plugh frobnicate", "help"]
+
+async def main() -> int:
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    fake = install(FakeWeaviateClient(latency_ms=2))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for query in QUERIES:
+            await client.post("/api/v1/search", json={"query": query})
+        fake.failure_rate = 1.0
+        await client.post("/api/v1/search", json={"query": "russet potatoes please"})
+        response = await client.get("/metrics")
+
+    check(response.status_code == 200 and response.headers["content-type"].startswith("text/plain"), "/metrics responds")
+    samples = {}
+    for family in text_string_to_metric_families(response.text):
+        for sample in family.samples:
+            samples.setdefault(sample.name, []).append(sample)
+
+    def value(name: str, **labels) -> float:
+        return sum(
+            sample.value for sample in samples.get(name, [])
+            if all(sample.labels.get(k) == v for k, v in labels.items())
+        )
+
+    for agent in ("supervisor", "product_search", "reranker", "response_compiler"):
+        check(value("leafloaf_agent_duration_seconds_count", agent=agent) > 0, f"latency histogram for node {agent}")
+    check(value("leafloaf_tool_duration_seconds_count", tool="product_search", outcome="ok") > 0, "latency histogram for tool product_search")
+    check(value("leafloaf_routing_decisions_total", decision="help") == 1, "routing decisions counted")
+    check(value("leafloaf_intents_total") >= len(QUERIES) - 1, "intents counted")
+    check(value("leafloaf_search_iterations_count") > 0, "iterations per search recorded")
+    check(value("leafloaf_zero_result_searches_total") >= 1, "zero-result searches counted")
+    check(value("leafloaf_cache_hit_ratio", cache="search_response") > 0, "response cache hit ratio exported")
+    check("leafloaf_requests_in_flight" in samples, "in-flight requests gauge exported")
+    check(value("leafloaf_request_duration_seconds_count", route="/api/v1/search") == len(QUERIES) + 1, "request latency by route")
+    check(value("leafloaf_weaviate_errors_total", operation="hybrid") > 0, "Weaviate client errors counted")
+    check("leafloaf_circuit_breaker_state" in samples, "circuit breaker state exported")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,251 @@
+"""Microbenchmarks for the CPU-bound functions on the request path.
+
+Query-level functions (dynamic alpha, supervisor intent and confidence,
+initial state creation) run over a synthetic query corpus built from the
+attribute and intent keyword tables. Product-level functions (merging
+tool results, formatting products, converting returned Weaviate objects
+to JSON-safe products) run over synthetic catalogs of each --sizes entry.
+Every benchmark reports the fastest of its repeats, per query or per product.
+
+Each group of benchmarks is timed alongside a fixed reference workload,
+and results are compared with a stored baseline as multiples of it, which
+cancels out how fast the machine is running at the time. The run exits 1
+when any benchmark is slower than baseline * (1 + tolerance); the default
+tolerance leaves room for the up to ~1.3x spread seen between reruns of
+an unchanged tree on a shared single-CPU machine. Baselines are still best
+refreshed with --update-baseline on the machine that runs the comparison.
+
+Usage:
+    python scripts/microbench.py                        # 10k and 100k products
+    python scripts/microbench.py --sizes 10000,100000,1000000
+    python scripts/microbench.py --update-baseline
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config.intent_keywords import INTENT_RULES
+from config.product_attributes import PRODUCT_ATTRIBUTES
+from scripts.fake_weaviate import BRANDS, NAMES, make_catalog
+from scripts.load_benchmark import git_revision, quiet_logs
+
+DEFAULT_BASELINE = Path(__file__).parent.parent / "benchmarks" / "microbench_baseline.json"
+
+# Name the reference workload is timed under in each group
+REFERENCE = "_reference"
+
+# Tool calls merged per request; each covers half of the products, overlapping
+MERGE_TOOL_CALLS = 3
+
+def make_query_corpus(count: int, seed: int = 11) -> List[str]:
+    """Grocery queries mixing attribute, brand, product and intent terms"""
+    rng = random.Random(seed)
+    attribute_terms = [term for config in PRODUCT_ATTRIBUTES.values() for term in config["terms"]]
+    intent_terms = [term for config in INTENT_RULES.values() for term in config["terms"]]
+    queries = []
+    for _ in range(count):
+        words = []
+        if rng.random() < 0.6:
+            words.append(rng.choice(attribute_terms))
+        if rng.random() < 0.2:
+            words.append(rng.choice(BRANDS).lower())
+        words.append(rng.choice(NAMES))
+        if rng.random() < 0.3:
+            words.append(rng.choice(intent_terms))
+        queries.append(" ".join(words))
+    return queries
+
+def make_objects(products: List[Dict[str, Any]]) -> List[SimpleNamespace]:
+    """Weaviate-shaped result objects, with a date property to convert"""
+    updated = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(properties={**product, "lastUpdated": updated}, metadata=SimpleNamespace(score=0.5))
+        for product in products
+    ]
+
+def make_tool_results(products: List[Dict[str, Any]], calls: int = MERGE_TOOL_CALLS) -> List[Dict[str, Any]]:
+    """Successful search results whose product lists overlap"""
+    window = len(products) // 2
+    step = (len(products) - window) // max(1, calls - 1)
+    return [
+        {"tool_call_id": f"call_{i}", "name": "product_search",
+         "result": {"success": True, "products": products[i * step:i * step + window]}}
+        for i in range(calls)
+    ]
+
+class NullLogger:
+    """Stands in for structlog loggers so benchmarks time the code, not logging"""
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        return lambda *args, **kwargs: None
+
+def time_per_op(benchmarks: Dict[str, Callable[[], Any]], ops: int, repeats: int) -> Dict[str, float]:
+    """Fastest nanoseconds per operation of each batch function over its repeats
+
+    The minimum, as timeit recommends: noise from other processes only ever
+    adds time, so the fastest run is the most repeatable estimate. Repeats
+    are interleaved across the benchmarks, so a slow spell on the machine
+    hits each of them once rather than every sample of one. The garbage
+    collector is off while timing, so collections triggered by the fixtures
+    don't land in random samples.
+    """
+    for fn in benchmarks.values():
+        fn()
+    samples: Dict[str, List[float]] = {name: [] for name in benchmarks}
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            for name, fn in benchmarks.items():
+                start = time.perf_counter()
+                fn()
+                samples[name].append((time.perf_counter() - start) / ops * 1e9)
+    finally:
+        gc.enable()
+    return {name: min(values) for name, values in samples.items()}
+
+def reference_workload(size: int = 2000, seed: int = 3) -> Callable[[], Any]:
+    """Fixed pure-Python work timed alongside every group of benchmarks
+
+    Results are compared as multiples of it, which cancels out how fast the
+    machine happens to be running while the group is timed.
+    """
+    rng = random.Random(seed)
+    texts = [" ".join(rng.choice(NAMES) for _ in range(4)) for _ in range(size)]
+    return lambda: [{word: len(word) for word in text.lower().split()} for text in texts]
+
+def query_benchmarks(queries: List[str]) -> Dict[str, Callable[[], Any]]:
+    import src.api.main as api
+    from src.agents.supervisor import SupervisorReactAgent
+    from src.api.main import SearchRequest, calculate_dynamic_alpha, create_initial_state
+    from src.core.query_analysis import analyze_query
+
+    # Time the functions themselves, not LangSmith tracing or log output
+    api.logger = NullLogger()
+    dynamic_alpha = calculate_dynamic_alpha.__wrapped__
+    supervisor = SupervisorReactAgent()
+    supervisor.logger = NullLogger()
+    analyses = [analyze_query(query) for query in queries]
+    requests = [SearchRequest(query=query) for query in queries]
+    intents = [analysis["intent"] for analysis in analyses]
+
+    return {
+        "calculate_dynamic_alpha": lambda: [
+            dynamic_alpha(query, analysis["attribute_matches"])
+            for query, analysis in zip(queries, analyses)
+        ],
+        "supervisor._analyze_intent": lambda: [supervisor._analyze_intent(query) for query in queries],
+        "supervisor._calculate_confidence": lambda: [
+            supervisor._calculate_confidence(query, intent) for query, intent in zip(queries, intents)
+        ],
+        "create_initial_state": lambda: [
+            create_initial_state(request, 0.5, analysis)
+            for request, analysis in zip(requests, analyses)
+        ]
+    }
+
+def product_benchmarks(size: int) -> Dict[str, Callable[[], Any]]:
+    from src.agents.product_search import ProductSearchReactAgent
+    from src.agents.response_compiler import ResponseCompilerAgent
+    from src.tools.search_tools import to_product
+
+    products = make_catalog(size)
+    objects = make_objects(products)
+    tool_results = make_tool_results(products)
+    search_agent = ProductSearchReactAgent()
+    search_agent.logger = NullLogger()
+    compiler = ResponseCompilerAgent()
+    compiler.logger = NullLogger()
+
+    return {
+        "product_search._merge_results": lambda: search_agent._merge_results(tool_results),
+        "response_compiler._format_products": lambda: compiler._format_products(products, limit=size),
+        "search_tools.to_product": lambda: [to_product(item, "search") for item in objects]
+    }
+
+def run(args) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def record_group(benchmarks: Dict[str, Callable[[], Any]], ops: int, unit: str, size: Optional[int] = None):
+        reference = reference_workload()
+        timings = time_per_op({**benchmarks, REFERENCE: reference}, ops, args.repeats)
+        # The reference does the same work whatever ops is, so scale it per op
+        reference_ns = timings.pop(REFERENCE) * ops
+        for name, ns in timings.items():
+            key = f"{name}[{size}]" if size else name
+            relative = ns / reference_ns
+            results[key] = {"ns_per_op": round(ns, 1), "relative": round(relative, 9), "unit": unit}
+            print(f"{key:48} {ns:12.1f} ns/{unit}  {relative * 1e6:10.2f} ppm of reference")
+
+    queries = make_query_corpus(args.queries)
+    record_group(query_benchmarks(queries), len(queries), "query")
+
+    for size in args.sizes:
+        record_group(product_benchmarks(size), size, "product", size)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {"queries": args.queries, "sizes": args.sizes, "repeats": args.repeats}
+        },
+        "results": results
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> int:
+    """Print changes against the baseline; 1 if any benchmark regressed"""
+    regressions = 0
+    print(f"\nAgainst baseline {baseline['meta'].get('git_revision')} ({baseline['meta'].get('timestamp')}):")
+    for key, result in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            print(f"➖ {key}: no baseline")
+            continue
+        # Multiples of the reference workload when both runs have them
+        field = "relative" if "relative" in result and "relative" in base else "ns_per_op"
+        ratio = result[field] / base[field]
+        regressed = ratio > 1 + tolerance
+        regressions += regressed
+        print(f"{'❌' if regressed else '✅'} {key}: {base['ns_per_op']:.1f} → {result['ns_per_op']:.1f} ns ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated catalog sizes")
+    parser.add_argument("--queries", type=int, default=2000, help="Size of the query corpus")
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown")
+    args = parser.parse_args()
+    args.sizes = [int(size) for size in args.sizes.split(",")]
+
+    quiet_logs("error")
+    report = run(args)
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+    return compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+
+if __name__ == "__main__":
+    sys.exit(main())
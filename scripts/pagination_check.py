@@ -0,0 +1,61 @@
+"""Check cursor pagination on /api/v1/search.
+
+Against the fake Weaviate client this follows next_cursor from the first
+page to the last. Pages must not repeat a product, every page must be
+sliced from the candidate set of the first page's single backend query,
+and a malformed cursor or one issued for another query must get a 400.
+
+Usage: python scripts/pagination_check.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from scripts.fake_weaviate import FakeWeaviateClient, install
+from src.api.main import app
+from src.config.settings import settings
+
+QUERY = "bread"
+LIMIT = 10
+
+async def main() -> int:
+    fake = install(FakeWeaviateClient(latency_ms=20))
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        pages, cursor = [], None
+        while len(pages) <= settings.candidate_pages:
+            response = (await client.post("/api/v1/search", json={"query": QUERY, "limit": LIMIT, "cursor": cursor})).json()
+            pages.append([product["id"] for product in response["products"]])
+            cursor = response.get("next_cursor")
+            if cursor is None:
+                break
+
+        ids = [product_id for page in pages for product_id in page]
+        check(len(pages) == settings.candidate_pages, f"followed next_cursor through {len(pages)} pages")
+        check(all(len(page) == LIMIT for page in pages), f"every page is full: {[len(page) for page in pages]}")
+        check(len(ids) == len(set(ids)), f"{len(ids)} products over all pages, none repeated")
+        check(fake.queries == 1, f"all pages came from {fake.queries} backend query")
+
+        response = await client.post("/api/v1/search", json={"query": QUERY, "cursor": "not-a-cursor"})
+        check(response.status_code == 400, f"malformed cursor gets {response.status_code}")
+
+        first = (await client.post("/api/v1/search", json={"query": QUERY, "limit": LIMIT})).json()
+        response = await client.post("/api/v1/search", json={"query": "russet potatoes", "cursor": first["next_cursor"]})
+        check(response.status_code == 400, f"cursor from another query gets {response.status_code}")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,87 @@
+"""Check in-process query embeddings: caching, micro-batching and vector= passing.
+
+Wraps the hashing stand-in embedder with a fixed per-batch delay (like a
+model forward pass) and runs ProductSearchTool against the fake Weaviate
+client. Concurrent searches must share embedding batches, repeated queries
+must hit the embedding cache, and every hybrid query must arrive with a
+precomputed vector.
+
+Usage: python scripts/query_embedding_check.py [--requests 200]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+from scripts.fake_weaviate import FakeWeaviateClient
+from src.config.settings import settings
+from src.core.embeddings import HashingEmbedder, QueryEmbeddings, set_query_embeddings
+from src.core.weaviate_client import WeaviateClientRegistry
+from src.tools.search_tools import ProductSearchTool
+
+class SlowEmbedder(HashingEmbedder):
+    """Hashing embedder that takes batch_ms per call and counts calls"""
+
+    def __init__(self, batch_ms: float, **kwargs):
+        super().__init__(**kwargs)
+        self.batch_ms = batch_ms
+        self.calls = 0
+        self.texts = 0
+
+    async def embed_batch(self, texts):
+        self.calls += 1
+        self.texts += len(texts)
+        await asyncio.sleep(self.batch_ms / 1000)
+        return await super().embed_batch(texts)
+
+async def main(requests: int) -> int:
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    hashing = HashingEmbedder()
+    first, second = hashing.embed("Organic Whole Milk"), hashing.embed("organic whole milk")
+    check(np.array_equal(first, second), "hashing embedder is deterministic and case-insensitive")
+    similar = float(first @ hashing.embed("organic milk"))
+    unrelated = float(first @ hashing.embed("russet potatoes"))
+    check(similar > unrelated, f"related queries are closer ({similar:.2f} vs {unrelated:.2f})")
+
+    settings.tool_cache_enabled = False  # Every search reaches Weaviate
+    embedder = SlowEmbedder(batch_ms=15)
+    embeddings = QueryEmbeddings(embedder, window_ms=2.0, max_batch_size=64)
+    set_query_embeddings(embeddings)
+    fake = FakeWeaviateClient(latency_ms=5)
+    tool = ProductSearchTool(registry=WeaviateClientRegistry(client=fake))
+
+    unique = 20
+    start = time.perf_counter()
+    results = await asyncio.gather(*(tool.run(f"potatoes {i % unique}", limit=5) for i in range(requests)))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    check(all(result["success"] for result in results), f"{requests} concurrent searches succeeded in {elapsed_ms:.1f}ms")
+    check(fake.vector_queries == fake.queries, f"{fake.vector_queries}/{fake.queries} hybrid queries carried a vector")
+    check(
+        embedder.calls == 1 and embedder.texts == unique,
+        f"{requests} searches embedded {embedder.texts} unique queries in {embedder.calls} batch(es)"
+    )
+
+    calls_before = embedder.calls
+    await asyncio.gather(*(tool.run(f"Potatoes  {i % unique}", limit=5) for i in range(requests)))
+    check(embedder.calls == calls_before, "repeated queries served from the embedding cache")
+    print(embeddings.stats())
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.requests)))
@@ -0,0 +1,111 @@
+"""Check the re-ranking stage: attribute boosts, stable ties and latency.
+
+Scores synthetic candidate lists with the Reranker, checks that products
+matching the query's dietary terms and brand move up while ties keep
+retrieval order, times 100-candidate re-ranks of candidates it has never
+seen (texts prepared by the ResultStore, as in the agent) against the 1ms
+budget, checks the agent's configured budget matches, and runs
+/api/v1/search against the fake Weaviate client to confirm the reranker
+node runs between search and response compilation.
+
+Usage: python scripts/reranker_check.py [--candidates 100]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from scripts.fake_weaviate import FakeWeaviateClient, install, make_catalog
+from src.config.settings import settings
+from src.core.config_manager import config_manager
+from src.core.query_analysis import analyze_query
+from src.agents.product_search import ProductSearchReactAgent
+from src.core.reranker import Reranker
+from src.core.result_store import ResultStore
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+async def main(candidates: int) -> int:
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    reranker = Reranker(config_manager.get_reranker_weights())
+
+    products = [
+        {"sku": "A", "name": "whole milk", "brand": "Horizon", "category": "dairy", "score": 0.9},
+        {"sku": "B", "name": "whole milk", "brand": "Tillamook", "category": "dairy", "score": 0.85},
+        {"sku": "C", "name": "organic whole milk", "brand": "Horizon", "category": "dairy", "score": 0.8},
+        {"sku": "D", "name": "organic 2% milk", "brand": "Organic Valley", "category": "dairy", "score": 0.5},
+    ]
+    order = [products[i]["sku"] for i in reranker.rerank(products, analyze_query("organic whole milk"))]
+    check(order[0] == "C", f"dietary match moves the organic product up: {order}")
+    check(order.index("A") < order.index("B"), "non-matching products keep retrieval order")
+
+    order = [products[i]["sku"] for i in reranker.rerank(products, analyze_query("tillamook whole milk"))]
+    check(order[0] == "B", f"brand named in the query wins: {order}")
+
+    unscored = [{k: v for k, v in product.items() if k != "score"} for product in products]
+    order = [unscored[i]["sku"] for i in reranker.rerank(unscored, analyze_query("milk"))]
+    check(order == ["A", "B", "C", "D"], "without scores or matches the order is unchanged")
+
+    # Fan-out branches score on different scales; the fused order must survive
+    branches = [
+        [{"sku": "A", "score": 0.4}, {"sku": "B", "score": 0.3}, {"sku": "C", "score": 0.05}],
+        [{"sku": "B", "score": 0.2}, {"sku": "A", "score": 0.1}, {"sku": "D", "score": 0.95}],
+    ]
+    fused = ProductSearchReactAgent()._fuse_results([{"result": {"success": True, "products": branch}} for branch in branches])
+    order = [fused[i]["sku"] for i in reranker.rerank(fused, analyze_query("milk"))]
+    check(order == [product["sku"] for product in fused] == ["A", "B", "C", "D"], f"fused order survives re-ranking: {order}")
+    check(branches[0][0]["score"] == 0.4, "fusion leaves the branch results untouched")
+
+    catalog = [{**product, "score": 1.0 - i / candidates} for i, product in enumerate(make_catalog(candidates))]
+    analysis = analyze_query("organic gluten free bread large")
+
+    # The agent's path: texts were built when the products entered the store,
+    # and every request's candidates are new to the reranker
+    latencies, intern = [], []
+    for _ in range(500):
+        start = time.perf_counter()
+        store = ResultStore(settings.max_state_bytes_per_request)
+        refs = store.put_many(catalog)
+        intern.append((time.perf_counter() - start) * 1000)
+        products, texts = store.resolve(refs), store.texts(refs)
+        start = time.perf_counter()
+        Reranker(config_manager.get_reranker_weights()).rerank(products, analysis, texts)
+        latencies.append((time.perf_counter() - start) * 1000)
+    p50, p99 = percentile(latencies, 50), percentile(latencies, 99)
+    check(p50 < 1.0, f"{candidates} candidates re-ranked in p50 {p50:.3f}ms, p99 {p99:.3f}ms")
+    print(f"   interning them (with texts) took p50 {percentile(intern, 50):.3f}ms in the search stage")
+
+    budget_ms = config_manager.get_agent_budget_s("reranker") * 1000
+    check(budget_ms <= 1.0, f"reranker agent budget is {budget_ms:g}ms")
+
+    from src.api.main import app
+    install(FakeWeaviateClient(latency_ms=2))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = (await client.post("/api/v1/search", json={"query": "organic gluten free bread"})).json()
+    timings = response.get("execution", {}).get("agent_timings", {})
+    check("reranker" in timings, f"reranker ran in the graph ({timings.get('reranker', 0):.2f}ms)")
+    names = [product.get("name", "") for product in response.get("products", [])][:3]
+    check(bool(names) and "gluten free" in names[0], f"top results: {names}")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--candidates", type=int, default=100)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.candidates)))
@@ -0,0 +1,95 @@
+"""Check SingleFlight coalescing and cancellation.
+
+Concurrent identical calls should share one task, errors should reach
+every waiter, and a caller arriving right after the last waiter was
+cancelled should start fresh work rather than join the cancelled task.
+With finish_on_deadline the work should outlive a last waiter cut off by
+its deadline, but not one cancelled for any other reason.
+
+Usage: python scripts/singleflight_check.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.core.deadline import DeadlineExceeded, deadline_scope, within_deadline
+from src.core.singleflight import SingleFlight
+
+async def main() -> int:
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    flight = SingleFlight("check")
+    runs = 0
+
+    async def work():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.02)
+        return runs
+
+    results = await asyncio.gather(*(flight.do("k", work) for _ in range(10)))
+    check(runs == 1 and set(results) == {1}, f"10 concurrent callers share one call ({runs} run)")
+    check(flight.in_flight() == 0, "nothing is remembered once the call finishes")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    outcomes = await asyncio.gather(*(flight.do("e", fail) for _ in range(3)), return_exceptions=True)
+    check(all(isinstance(outcome, ValueError) for outcome in outcomes), "errors reach every waiter")
+
+    # Cancel the only waiter, then call again before the shared task unwinds
+    runs = 0
+    first = asyncio.ensure_future(flight.do("k", work))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    try:
+        result = await flight.do("k", work)
+        check(result == 2, f"a caller after the last waiter was cancelled starts fresh work (run {result})")
+    except asyncio.CancelledError:
+        check(False, "a caller after the last waiter was cancelled got CancelledError")
+    await asyncio.gather(first, return_exceptions=True)
+
+    # One of two waiters cancelled: the other still gets the result
+    runs = 0
+    kept = asyncio.ensure_future(flight.do("k", work))
+    dropped = asyncio.ensure_future(flight.do("k", work))
+    await asyncio.sleep(0)
+    dropped.cancel()
+    check(await kept == 1, "cancelling one waiter leaves the shared call running for the others")
+    await asyncio.gather(dropped, return_exceptions=True)
+
+    # finish_on_deadline: a caller cut off by its deadline leaves the work running
+    runs = 0
+    keep = SingleFlight("keep", finish_on_deadline=True)
+
+    async def bounded():
+        with deadline_scope(0.005):
+            return await within_deadline(keep.do("k", work))
+
+    outcome = (await asyncio.gather(bounded(), return_exceptions=True))[0]
+    check(isinstance(outcome, DeadlineExceeded), "the caller is cut off at its deadline")
+    check(keep.in_flight() == 1, "a deadline cut-off does not cancel the call")
+    check(await keep.do("k", work) == 1 and runs == 1, "a later caller joins the call its predecessor gave up on")
+
+    # Any other cancellation of the last waiter still cancels the work
+    abandoned = asyncio.ensure_future(keep.do("c", work))
+    await asyncio.sleep(0)
+    abandoned.cancel()
+    await asyncio.gather(abandoned, return_exceptions=True)
+    check(keep.in_flight() == 0, "cancelling the last waiter without a deadline cancels the call")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
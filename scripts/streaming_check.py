@@ -0,0 +1,147 @@
+"""Check the event stream of /api/v1/search/stream in both formats.
+
+Against the fake Weaviate client, NDJSON must frame one {"event", "data"}
+object per line and SSE one "event:"/"data:" frame per blank-line-separated
+block, each with its media type, and both must carry the same event
+sequence: start, routing, products, final. Product batches must never
+repeat a product or preview more than the page size, and a request for a
+later page (with a cursor) must get no previews. A repeat served from the
+response cache must be a lone final event, a graph running past the
+request timeout must end in a timeout error event, and an unknown format
+must get a 400.
+
+Usage: python scripts/streaming_check.py
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import httpx
+from scripts.fake_weaviate import FakeWeaviateClient, install
+from src.api.main import app, response_cache
+from src.config.settings import settings
+from src.core import graph
+
+LIMIT = 5
+
+def parse_ndjson(body: str) -> List[Tuple[str, Dict[str, Any]]]:
+    events = []
+    for line in body.splitlines():
+        message = json.loads(line)
+        events.append((message["event"], message["data"]))
+    return events
+
+def parse_sse(body: str) -> List[Tuple[str, Dict[str, Any]]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+PARSERS = {"ndjson": parse_ndjson, "sse": parse_sse}
+
+async def stream(client: httpx.AsyncClient, stream_format: str, **body) -> Tuple[httpx.Response, List[Tuple[str, Dict[str, Any]]]]:
+    response = await client.post("/api/v1/search/stream", params={"format": stream_format}, json=body)
+    return response, PARSERS[stream_format](response.text)
+
+def collapse(names: List[str]) -> List[str]:
+    """Event names with consecutive repeats (several product batches) folded"""
+    return [name for i, name in enumerate(names) if i == 0 or names[i - 1] != name]
+
+async def main() -> int:
+    install(FakeWeaviateClient(latency_ms=20))
+    # The details iteration re-sends the top products, exercising de-dup
+    settings.search_details_enabled = True
+    failures = 0
+
+    def check(ok: bool, message: str):
+        nonlocal failures
+        print(f"{'✅' if ok else '❌'} {message}")
+        if not ok:
+            failures += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        sequences = {}
+        for stream_format, media_type in (("ndjson", "application/x-ndjson"), ("sse", "text/event-stream")):
+            response_cache.clear()
+            response, events = await stream(client, stream_format, query="milk", limit=LIMIT)
+            names = [name for name, _ in events]
+            sequences[stream_format] = collapse(names)
+            check(response.headers["content-type"].startswith(media_type), f"{stream_format} is served as {media_type}")
+            check(
+                collapse(names) == ["start", "routing", "products", "final"],
+                f"{stream_format} events arrive in order: {' → '.join(collapse(names))}"
+            )
+
+            ids = [product["id"] for name, data in events if name == "products" for product in data["products"]]
+            check(len(ids) == len(set(ids)), f"{stream_format} product batches repeat no product ({len(ids)} streamed)")
+            check(len(ids) == LIMIT, f"{stream_format} previews stop at the page size of {LIMIT}")
+            first_page = events[-1][1]
+            check(first_page["success"] and len(first_page["products"]) == LIMIT, f"{stream_format} final event carries the first page")
+
+        check(sequences["ndjson"] == sequences["sse"], "both formats carry the same event sequence")
+
+        # With a page larger than the search found, only de-dup keeps the
+        # details iteration from re-sending the top products
+        response_cache.clear()
+        _, events = await stream(client, "ndjson", query="milk", limit=settings.max_search_limit)
+        final = events[-1][1]
+        ids = [product["id"] for name, data in events if name == "products" for product in data["products"]]
+        check(
+            any("detailed information" in step for step in final["execution"]["reasoning_steps"]),
+            "the details iteration ran"
+        )
+        check(
+            len(ids) == len(set(ids)) == len(final["products"]) < settings.max_search_limit,
+            f"{len(ids)} products previewed, each once, as in the final response"
+        )
+
+        # A later page is sliced from the final response, not previewed
+        response_cache.clear()
+        _, events = await stream(client, "ndjson", query="milk", limit=LIMIT, cursor=first_page["next_cursor"])
+        names = [name for name, _ in events]
+        check("products" not in names and names[-1] == "final", f"a cursor request gets no previews: {' → '.join(collapse(names))}")
+        check(len(events[-1][1]["products"]) == LIMIT, "its final event carries the second page")
+
+        # A response-cache hit skips the graph
+        for stream_format in PARSERS:
+            _, events = await stream(client, stream_format, query="milk", limit=LIMIT)
+            check(
+                [name for name, _ in events] == ["final"] and events[0][1]["execution"].get("served_from") == "response_cache",
+                f"{stream_format} cache hit is a lone final event"
+            )
+
+        # A graph still running past the timeout and its grace ends in an error
+        response_cache.clear()
+        settings.search_timeout_ms = 300
+        execute = graph.reranker.execute
+
+        async def stalled_execute(state):
+            await asyncio.sleep((settings.search_timeout_ms + settings.search_timeout_grace_ms) * 2 / 1000)
+            return await execute(state)
+
+        graph.reranker.execute = stalled_execute
+        try:
+            for stream_format in PARSERS:
+                _, events = await stream(client, stream_format, query="bread", limit=LIMIT)
+                name, data = events[-1]
+                check(
+                    name == "error" and data.get("timeout") and events[0][0] == "start",
+                    f"{stream_format} stream past the timeout ends in an error event: {data.get('error')}"
+                )
+        finally:
+            graph.reranker.execute = execute
+
+        response = await client.post("/api/v1/search/stream", params={"format": "xml"}, json={"query": "milk"})
+        check(response.status_code == 400, f"unsupported format gets {response.status_code}")
+
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -3,60 +3,78 @@ from typing import Dict, Any
 import time
 import structlog
 from src.models.state import SearchState, AgentStatus
+from src.config.settings import settings
+from src.core.config_manager import config_manager
+from src.core.deadline import DeadlineExceeded, deadline_scope, within_deadline
+from src.core.metrics import AGENT_DURATION
 
 logger = structlog.get_logger()
 
 class BaseAgent(ABC):
-    """Base class for all LangGraph agents"""
+    """Base class for all LangGraph agents
+
+    Agents never mutate the incoming state. _run returns only the keys it
+    changed, and list fields such as messages and reasoning contain only the
+    new entries, which the SearchState reducers append.
+
+    With agent_budgets_enabled, each agent runs under its timeout_ms from
+    agent_priorities.yaml. Tools and agents read the remaining budget from
+    src.core.deadline and return what they have when it runs out; an agent
+    still running after the grace period is cut off and falls back.
+    """
     
     def __init__(self, name: str):
         self.name = name
         self.logger = logger.bind(agent=name)
         
-    async def execute(self, state: SearchState) -> SearchState:
-        """Execute agent with timing and error handling"""
+    async def execute(self, state: SearchState) -> Dict[str, Any]:
+        """Execute agent with timing and error handling, returning a state update"""
         start_time = time.perf_counter()
         
-        # Update status
-        state["agent_status"][self.name] = AgentStatus.RUNNING
+        budget_s = config_manager.get_agent_budget_s(self.name) if settings.agent_budgets_enabled else None
         
         try:
-            # Execute agent logic
-            result = await self._run(state)
+            # Execute agent logic within its latency budget
+            with deadline_scope(budget_s):
+                updates = await within_deadline(self._run(state), settings.agent_budget_grace_ms / 1000)
+            status = AgentStatus.COMPLETED
             
-            # Update status on success
-            state["agent_status"][self.name] = AgentStatus.COMPLETED
-            
-            return result
+        except DeadlineExceeded as e:
+            self.logger.warning(f"Agent cut off at its latency budget: {str(e)}")
+            status = AgentStatus.TIMED_OUT
+            updates = dict(await self._fallback(state, e) or {})
+            updates["degraded_agents"] = [self.name]
             
         except Exception as e:
             # Log error
             self.logger.error(f"Agent failed: {str(e)}")
-            
-            # Update status on failure
-            state["agent_status"][self.name] = AgentStatus.FAILED
+            status = AgentStatus.FAILED
             
             # Run fallback
-            return await self._fallback(state, e)
+            updates = await self._fallback(state, e)
             
-        finally:
-            # Record timing
-            execution_time = (time.perf_counter() - start_time) * 1000
-            state["agent_timings"][self.name] = execution_time
-            
-            self.logger.info(
-                f"Agent completed",
-                status=state["agent_status"][self.name].value,
-                duration_ms=execution_time
-            )
+        # Record status and timing for this agent only
+        execution_time = (time.perf_counter() - start_time) * 1000
+        updates = dict(updates or {})
+        updates["agent_status"] = {self.name: status}
+        updates["agent_timings"] = {self.name: execution_time}
+        AGENT_DURATION.labels(self.name, status.value).observe(execution_time / 1000)
+        
+        self.logger.info(
+            f"Agent completed",
+            status=status.value,
+            duration_ms=execution_time
+        )
+        
+        return updates
     
     @abstractmethod
-    async def _run(self, state: SearchState) -> SearchState:
-        """Agent-specific logic to implement"""
+    async def _run(self, state: SearchState) -> Dict[str, Any]:
+        """Agent-specific logic to implement; returns only the changed keys"""
         pass
     
-    async def _fallback(self, state: SearchState, error: Exception) -> SearchState:
+    async def _fallback(self, state: SearchState, error: Exception) -> Dict[str, Any]:
         """Default fallback behavior"""
         if state.get("error") is None:
-            state["error"] = f"{self.name} failed: {str(error)}"
-        return state
\ No newline at end of file
+            return {"error": f"{self.name} failed: {str(error)}"}
+        return {}
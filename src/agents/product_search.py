@@ -1,10 +1,18 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from langsmith import traceable
 from src.agents.base import BaseAgent
 from src.models.state import SearchState, Message
 from src.tools.tool_executor import tool_executor
-import asyncio
+from src.core.query_analysis import analyze_query
+from src.core.result_store import ResultStore
+from src.core.streaming import stream_writer
+from src.core import deadline
+from src.core.fusion import reciprocal_rank_fusion
+from src.core.metrics import SEARCH_ITERATIONS, ZERO_RESULT_SEARCHES
+from src.utils.text import normalize_query
+from src.models.projection import format_product
+from src.config.settings import settings
 import json
 
 class ProductSearchReactAgent(BaseAgent):
@@ -15,7 +23,7 @@ class ProductSearchReactAgent(BaseAgent):
         self.tool_executor = tool_executor
         self.max_iterations = 3
         
-    async def _run(self, state: SearchState) -> SearchState:
+    async def _run(self, state: SearchState) -> Dict[str, Any]:
         """Autonomous search with ability to call multiple tools"""
         self.logger.info(f"ProductSearch received state: should_search={state.get('should_search')}, next_action={state.get('next_action')}")
         
@@ -25,80 +33,149 @@ class ProductSearchReactAgent(BaseAgent):
         # Check if we should run- the supervisor sets routing decision
         if routing != "product_search":
             self.logger.info(f"Not routed to product search (routing={routing}), skipping")
-            return state
+            return {}
         
         # Log what we're about to search
-        search_params = state.get("search_params", {})
-        query = search_params.get("original_query", state["query"])
-        self.logger.info(f"Executing search for: {query}")
-        
         search_params = state.get("search_params", {})
         query = search_params.get("original_query", state["query"])
         intent = state.get("intent", "general_search")
+        self.logger.info(f"Executing search for: {query}")
         iterations = 0
         
-        state["messages"].append({
+        # Only new entries go back to the graph; the reducers append them
+        messages: List[Message] = [{
             "role": "assistant",
             "content": f"Starting product search for: {query}",
             "tool_calls": None,
             "tool_call_id": None
-        })
+        }]
+        reasoning: List[str] = []
+        completed_tool_calls: List[Dict] = []
+        updates: Dict[str, Any] = {}
+        
+        # Products are held once in the request's store; state refers to them by SKU
+        store = state.get("result_store")
+        if store is None:
+            store = ResultStore(settings.max_state_bytes_per_request)
+            updates["result_store"] = store
+        
+        # Every tool result so far, kept for a partial answer if the budget runs out
+        all_results: List[Dict] = []
+        # This run's results so far; state only sees them once the node returns
+        search_results: List[str] = []
+        degraded = False
         
         while iterations < self.max_iterations:
             iterations += 1
             
+            if deadline.expired():
+                # The search itself is complete if only the details step is left
+                if "search_results" not in updates:
+                    degraded = True
+                    reasoning.append("Latency budget spent, returning the results found so far")
+                break
+            
             # REASON: What tools should we call?
-            tool_plan = self._plan_tool_calls(state, query, intent, iterations)
-            state["reasoning"].append(f"Search iteration {iterations}: {tool_plan['reasoning']}")
+            tool_plan = self._plan_tool_calls(state, query, intent, iterations, search_results)
+            reasoning.append(f"Search iteration {iterations}: {tool_plan['reasoning']}")
             
             if not tool_plan["tool_calls"]:
                 break
             
             # ACT: Execute tools in parallel
-            state["messages"].append({
+            messages.append({
                 "role": "assistant",
                 "content": tool_plan["reasoning"],
                 "tool_calls": tool_plan["tool_calls"],
                 "tool_call_id": None
             })
             
-            # Execute all tool calls in parallel
-            results = await self._execute_parallel_tools(tool_plan["tool_calls"])
+            # Execute all tool calls in parallel, streaming each call's products
+            # as it returns and stopping once results suffice
+            results, records = await self._execute_tools(tool_plan["tool_calls"], query, intent, store, iterations)
+            all_results.extend(results)
             
             # OBSERVE: Process results
-            for result in results:
-                state["messages"].append({
+            for result, record in zip(results, records):
+                messages.append({
                     "role": "tool",
-                    "content": json.dumps(result["result"]),
+                    "content": json.dumps(record),
                     "tool_calls": None,
                     "tool_call_id": result["tool_call_id"]
                 })
-                state["completed_tool_calls"].append(result)
+                completed_tool_calls.append(record)
+            
+            if tool_plan.get("details"):
+                # Details were merged into the stored products; the ranking stands
+                break
+            
+            # Tools cut off by the deadline leave this iteration incomplete, and
+            # results served while Weaviate is down are not authoritative
+            if any(result.get("timed_out") or (result.get("result") or {}).get("degraded") for result in results):
+                degraded = True
             
             # Analyze results and decide if we need more iterations
             analysis = self._analyze_results(results, query, intent)
-            state["reasoning"].append(analysis["reasoning"])
+            reasoning.append(analysis["reasoning"])
+            
+            merged = self._fuse_results(results) if tool_plan.get("fanout") else self._merge_results(results)
+            search_results = store.put_many(merged)
             
             if analysis["sufficient"]:
                 # Process and store final results
-                state["search_results"] = self._merge_results(results)
-                self.logger.info(f"Set search_results in state: {len(state['search_results'])} products")
-                state["search_metadata"] = {
-                    "iterations": iterations,
-                    "tools_called": len(state["completed_tool_calls"]),
-                    "final_count": len(state["search_results"])
-                }
+                self.logger.info(f"Set search_results in state: {len(search_results)} products")
+                updates["search_results"] = search_results
+                updates["search_metadata"] = self._search_metadata(iterations, completed_tool_calls, search_results, store, degraded)
+                # A large result set gets one more iteration for its top products' details
+                if settings.search_details_enabled and len(search_results) > 20:
+                    continue
+                break
+            
+            if degraded:
+                reasoning.append("Search degraded, returning the results found so far")
                 break
             
             # Need another iteration with different strategy
-            state["search_strategy"] = analysis["next_strategy"]
-        self.logger.info(f"Product Search returning state with {len(state.get('search_results', []))} products")
-        return state
+            updates["search_strategy"] = analysis["next_strategy"]
+        
+        if "search_results" not in updates:
+            # Nothing was sufficient, or the budget ran out: keep what was found
+            search_results = store.put_many(self._merge_results(all_results))
+            updates["search_results"] = search_results
+            updates["search_metadata"] = self._search_metadata(iterations, completed_tool_calls, search_results, store, degraded)
+        if degraded:
+            updates["degraded_agents"] = [self.name]
+        
+        self.logger.info(f"Product Search returning {len(updates.get('search_results', []))} products")
+        SEARCH_ITERATIONS.observe(iterations)
+        if not updates.get("search_results"):
+            ZERO_RESULT_SEARCHES.inc()
+        return {
+            **updates,
+            "messages": messages,
+            "reasoning": reasoning,
+            "completed_tool_calls": completed_tool_calls
+        }
+    
+    def _search_metadata(self, iterations: int, completed_tool_calls: List[Dict], search_results: List[str], store: ResultStore, degraded: bool) -> Dict[str, Any]:
+        """Summary of the search for the response compiler"""
+        return {
+            "iterations": iterations,
+            "tools_called": len(completed_tool_calls),
+            "final_count": len(search_results),
+            "truncated": store.truncated,
+            "degraded": degraded
+        }
+    
     @traceable(name="Product Search Planning")
-    def _plan_tool_calls(self, state: SearchState, query: str, intent: str, iteration: int) -> Dict:
-        """Plan which tools to call based on current state"""
+    def _plan_tool_calls(self, state: SearchState, query: str, intent: str, iteration: int, existing_results: List[str]) -> Dict:
+        """Plan which tools to call based on current state and this run's results (SKU refs)"""
         tool_calls = []
-        existing_results = state.get("search_results", [])
+        reasoning = "No further searches planned"
+        details = False
+        analysis = state.get("query_analysis") or analyze_query(query)
+        # Push the requested candidate count down to the Weaviate query
+        candidate_limit = state.get("search_params", {}).get("candidate_limit")
     
         if iteration == 1:
             # First iteration - cast a wide net
@@ -111,18 +188,18 @@ class ProductSearchReactAgent(BaseAgent):
                     "name": "product_search",
                     "args": {
                         "query": query, 
-                        "limit": 20,
+                        "limit": candidate_limit or 20,
                         "alpha": alpha
                     }
                 }]
                 reasoning = f"Performing single search with alpha={alpha}"
                 
             elif intent == "brand_search":
-                brand = self._extract_brand(query)
+                brand = analysis["brand"]
                 tool_calls = [{
                     "id": f"call_brand_products_{iteration}",
                     "name": "product_search",
-                    "args": {"query": brand, "limit": 20}
+                    "args": {"query": brand, "limit": candidate_limit or 20}
                 }]
                 reasoning = f"Searching for all products from brand: {brand}"
                 
@@ -130,65 +207,130 @@ class ProductSearchReactAgent(BaseAgent):
                 tool_calls = [{
                     "id": f"call_general_search_{iteration}",
                     "name": "product_search",
-                    "args": {"query": query, "limit": 15}
+                    "args": {"query": query, "limit": candidate_limit or 15}
                 }]
                 reasoning = "Performing general product search"
+            
+            # Speculative variants run alongside the primary search
+            variants = self._fanout_variants(tool_calls[0], analysis, iteration) if settings.search_fanout_enabled else []
+            if variants:
+                tool_calls = tool_calls + variants
+                reasoning += f", fanning out to {', '.join(call['variant'] for call in variants)}"
                 
         elif iteration == 2:
             # Second iteration - refine or expand
             if len(existing_results) < 3:
                 # Too few results - broaden search
-                broad_query = self._broaden_query(query)
+                broad_query = analysis["broadened"]
                 tool_calls = [{
                     "id": f"call_broad_search_{iteration}",
                     "name": "product_search",
-                    "args": {"query": broad_query, "limit": 10}
+                    "args": {"query": broad_query, "limit": candidate_limit or 10}
                 }]
                 reasoning = f"Too few results, broadening search to: {broad_query}"
                 
             elif len(existing_results) > 20:
                 # Too many results - get details on top items
-                top_products = existing_results[:5]
-                tool_calls = [
-                    {
-                        "id": f"call_details_{i}_{iteration}",
+                top_skus = existing_results[:5]
+                if len(top_skus) > 1:
+                    # One bulk lookup instead of a round trip per product
+                    tool_calls = [{
+                        "id": f"call_details_batch_{iteration}",
+                        "name": "get_product_details_batch",
+                        "args": {"product_ids": top_skus}
+                    }]
+                elif top_skus:
+                    tool_calls = [{
+                        "id": f"call_details_0_{iteration}",
                         "name": "get_product_details",
-                        "args": {"product_id": product.get("productId", "")}
-                    }
-                    for i, product in enumerate(top_products)
-                    if product.get("productId")
-                ]
-                reasoning = "Getting detailed information for top 5 products"
+                        "args": {"product_id": top_skus[0]}
+                    }]
+                reasoning = f"Getting detailed information for top {len(top_skus)} products"
+                details = True
         
         return {
             "tool_calls": tool_calls,
-            "reasoning": reasoning
+            "reasoning": reasoning,
+            "fanout": len(tool_calls) > 1 and iteration == 1,
+            "details": details
         }
-    # There is an indentation error here. The $PLACEHOLDER$ is outside the class.
-    # You should remove the blank line before 'async def _execute_parallel_tools...' so that all methods are inside the ProductSearchReactAgent class.
-    # No 'return' statement is outside a function, so that error should not occur in this file.
-    # If you still see "return can be used only within a function", check for stray 'return' statements outside functions elsewhere in your codebase.    
-    async def _execute_parallel_tools(self, tool_calls: List[Dict]) -> List[Dict]:
-        """Execute multiple tool calls in parallel"""
-        tasks = []
-        for tool_call in tool_calls:
-            task = self.tool_executor.execute_tool_call(tool_call)
-            tasks.append(task)
+    
+    def _fanout_variants(self, primary: Dict, analysis: Dict[str, Any], iteration: int) -> List[Dict]:
+        """Broadened, keyword-only and vector-only variants of the primary search"""
+        args = primary["args"]
+        variants = []
+        for variant in settings.search_fanout_variants:
+            if variant == "broadened":
+                # Only worth a round trip if broadening changes the query
+                if normalize_query(analysis["broadened"]) == normalize_query(args["query"]):
+                    continue
+                variant_args = {**args, "query": analysis["broadened"]}
+            elif variant == "keyword":
+                variant_args = {**args, "alpha": 0.0}
+            elif variant == "vector":
+                variant_args = {**args, "alpha": 1.0}
+            else:
+                continue
+            variants.append({
+                "id": f"call_fanout_{variant}_{iteration}",
+                "name": "product_search",
+                "args": variant_args,
+                "variant": variant
+            })
+        return variants
+    
+    async def _execute_tools(self, tool_calls: List[Dict], query: str, intent: str, store: ResultStore, iteration: int) -> Tuple[List[Dict], List[Dict]]:
+        """Execute tool calls in parallel, observing results as they arrive
+
+        Each result is interned in the store and its products streamed the
+        moment its call returns, not when the slowest call of the iteration
+        does. Once the first planned call (the primary search) has answered
+        and the results so far are sufficient, the calls still running are
+        cancelled, so a slow fan-out branch or details lookup cannot hold the
+        response. Results and their records keep the order of tool_calls;
+        cancelled calls are reported.
+        """
+        completed: Dict[str, Dict] = {}
+        records: Dict[str, Dict] = {}
+        primary_id = tool_calls[0]["id"]
+        stream = self.tool_executor.execute_streaming(tool_calls)
+        
+        try:
+            async for result in stream:
+                completed[result["tool_call_id"]] = result
+                records[result["tool_call_id"]] = self._record_tool_result(result, store)
+                self._stream_products(records[result["tool_call_id"]], store, iteration)
+                if len(completed) < len(tool_calls) and primary_id in completed:
+                    if self._analyze_results(list(completed.values()), query, intent)["sufficient"]:
+                        self.logger.info(f"Results sufficient after {len(completed)} of {len(tool_calls)} tool calls")
+                        break
+        finally:
+            # Cancels whatever is still running
+            await stream.aclose()
         
-        # Execute all tools in parallel
-        results = await asyncio.gather(*tasks)
-        return results
+        results = [
+            completed.get(call["id"]) or {
+                "tool_call_id": call["id"],
+                "name": call["name"],
+                "error": "Cancelled: results were already sufficient",
+                "cancelled": True
+            }
+            for call in tool_calls
+        ]
+        return results, [records.get(result["tool_call_id"]) or self._record_tool_result(result, store) for result in results]
     
     def _analyze_results(self, results: List[Dict], query: str, intent: str) -> Dict:
         """Analyze tool results and decide next steps"""
-        total_products = 0
         successful_calls = 0
+        # Count distinct products; fan-out branches overlap heavily
+        seen_ids = set()
         
         for result in results:
             if result.get("result", {}).get("success"):
                 successful_calls += 1
-                products = result["result"].get("products", [])
-                total_products += len(products)
+                for product in self._result_products(result):
+                    seen_ids.add(product.get("sku") or id(product))
+        total_products = len(seen_ids)
         
         # Determine if we have sufficient results
         sufficient = False
@@ -224,8 +366,7 @@ class ProductSearchReactAgent(BaseAgent):
         self.logger.info(f"Merging {len(results)} tool results")
         for result in results:
             if result.get("result", {}).get("success"):
-                products = result["result"].get("products", [])
-                for product in products:
+                for product in self._result_products(result):
                     product_id = product.get("sku", "")
                     if product_id and product_id not in seen_ids:
                         seen_ids.add(product_id)
@@ -233,34 +374,62 @@ class ProductSearchReactAgent(BaseAgent):
         
         return all_products
     
-    def _extract_category(self, query: str) -> str:
-        """Extract category from query"""
-        categories = ["vegetables", "fruits", "dairy", "meat", "seafood", "bakery"]
-        query_lower = query.lower()
-        for category in categories:
-            if category in query_lower:
-                return category
-        return query  # fallback to original
+    def _fuse_results(self, results: List[Dict]) -> List[Dict]:
+        """Fuse fan-out branch rankings with reciprocal-rank fusion
+
+        Each product's score becomes its fused score, so the reranker's
+        retrieval feature follows the fused order rather than the raw score
+        of whichever branch returned it first.
+        """
+        rankings = [
+            self._result_products(result)
+            for result in results
+            if result.get("result", {}).get("success")
+        ]
+        self.logger.info(f"Fusing {len(rankings)} ranked result lists")
+        return reciprocal_rank_fusion(rankings, k=settings.search_fanout_rrf_k, score_key="score")
     
-    def _extract_brand(self, query: str) -> str:
-        """Extract brand from query"""
-        # Remove Baldor - it's the supplier, not a product brand
-        # In production, we'd have a list of actual product brands
-        # For now, just return the query
-        query_lower = query.lower()
-        
-        # Remove common non-brand words
-        non_brand_words = ["organic", "fresh", "the", "a", "an"]
-        words = query_lower.split()
-        potential_brand = [w for w in words if w not in non_brand_words]
+    def _record_tool_result(self, result: Dict, store: ResultStore) -> Dict[str, Any]:
+        """Intern a tool result's products and return a compact, ref-only record"""
+        record = {
+            "tool_call_id": result.get("tool_call_id"),
+            "name": result.get("name")
+        }
+        tool_result = result.get("result")
+        if tool_result is None:
+            record["success"] = False
+            record["error"] = result.get("error")
+            if result.get("timed_out"):
+                record["timed_out"] = True
+            if result.get("cancelled"):
+                record["cancelled"] = True
+            return record
         
-        return " ".join(potential_brand) if potential_brand else query
+        record["success"] = tool_result.get("success", False)
+        if "error" in tool_result:
+            record["error"] = tool_result["error"]
+        if tool_result.get("product"):
+            record["product_refs"] = store.put_many([tool_result["product"]])
+        elif tool_result.get("success"):
+            record["product_refs"] = store.put_many(self._result_products(result))
+        return record
+    
+    def _stream_products(self, record: Dict[str, Any], store: ResultStore, iteration: int):
+        """Push a tool call's products to streaming clients as soon as it returns"""
+        refs = record.get("product_refs")
+        if not refs:
+            return
+        stream_writer()({
+            "type": "products",
+            "tool_call_id": record["tool_call_id"],
+            "tool": record["name"],
+            "iteration": iteration,
+            "products": [format_product(product) for product in store.resolve(refs)]
+        })
     
-    def _broaden_query(self, query: str) -> str:
-        """Broaden a query by removing specific terms"""
-        # Remove specific terms to broaden
-        broad_terms = query.lower()
-        specific_words = ["organic", "fresh", "1lb", "pound", "specific"]
-        for word in specific_words:
-            broad_terms = broad_terms.replace(word, "").strip()
-        return broad_terms if broad_terms else query
\ No newline at end of file
+    def _result_products(self, result: Dict) -> List[Dict]:
+        """Products from a tool result; batch detail lookups key them by SKU"""
+        products = result["result"].get("products", [])
+        if isinstance(products, dict):
+            return list(products.values())
+        return products
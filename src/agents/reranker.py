@@ -0,0 +1,38 @@
+from typing import Dict, Any
+from src.agents.base import BaseAgent
+from src.models.state import SearchState
+from src.core.config_manager import config_manager
+from src.core.reranker import Reranker
+
+class RerankerAgent(BaseAgent):
+    """Agent that re-orders search candidates before the response is compiled
+    
+    Scores every candidate at once (see src.core.reranker) so query
+    attributes, brand, category and size terms move matching products up.
+    On any failure or timeout the retrieval order is kept.
+    """
+    
+    def __init__(self):
+        super().__init__("reranker")
+        self.reranker = Reranker(config_manager.get_reranker_weights())
+    
+    async def _run(self, state: SearchState) -> Dict[str, Any]:
+        """Reorder the search result refs by reranker score"""
+        refs = state.get("search_results", [])
+        store = state.get("result_store")
+        if not config_manager.is_agent_enabled(self.name) or store is None or len(refs) < 2:
+            return {}
+        
+        refs = [ref for ref in refs if store.get(ref) is not None]
+        order = self.reranker.rerank(store.resolve(refs), state["query_analysis"], store.texts(refs))
+        moved = sum(1 for position, index in enumerate(order) if position != index)
+        
+        return {
+            "search_results": [refs[index] for index in order],
+            "search_metadata": {**state.get("search_metadata", {}), "reranked": True},
+            "reasoning": [f"Re-ranked {len(refs)} candidates, {moved} changed position"]
+        }
+    
+    async def _fallback(self, state: SearchState, error: Exception) -> Dict[str, Any]:
+        """Keep the retrieval order"""
+        return {}
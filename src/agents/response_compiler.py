@@ -1,6 +1,7 @@
 from typing import Dict, Any, List
 from src.agents.base import BaseAgent
-from src.models.state import SearchState
+from src.models.state import SearchState, AgentStatus
+from src.models.projection import format_product
 import json
 
 class ResponseCompilerAgent(BaseAgent):
@@ -9,34 +10,43 @@ class ResponseCompilerAgent(BaseAgent):
     def __init__(self):
         super().__init__("response_compiler")
         
-    async def _run(self, state: SearchState) -> SearchState:
+    async def _run(self, state: SearchState) -> Dict[str, Any]:
         """Compile final response from all agent outputs"""
         self.logger.info(f"Response Compiler received state with {len(state.get('search_results', []))} products")    
-        # Get search results
-        products = state.get("search_results", [])
+        # Resolve search result refs against the request's product store
+        # up to the candidate limit the search was asked for
+        store = state.get("result_store")
+        candidate_limit = state.get("search_params", {}).get("candidate_limit", 20)
+        refs = state.get("search_results", [])[:candidate_limit]
+        products = store.resolve(refs) if store is not None else []
         search_metadata = state.get("search_metadata", {})
         
         # Get execution metadata
         agent_timings = state.get("agent_timings", {})
         reasoning_steps = state.get("reasoning", [])
+        # Agents cut off by their latency budget returned partial results
+        degraded_agents = state.get("degraded_agents", [])
         
         # Build final response
         final_response = {
             "success": len(products) > 0,
             "query": state["query"],
-            "products": self._format_products(products),
+            "products": self._format_products(products, candidate_limit),
             "metadata": {
                 "total_count": len(products),
                 "categories": search_metadata.get("categories", []),
                 "brands": search_metadata.get("brands", []),
-                "search_config": search_metadata.get("search_config", {})
+                "search_config": search_metadata.get("search_config", {}),
+                "truncated": search_metadata.get("truncated", False),
+                "degraded": bool(degraded_agents)
             },
             "execution": {
                 "total_time_ms": sum(agent_timings.values()),
                 "agent_timings": agent_timings,
                 "reasoning_steps": reasoning_steps,
+                "degraded_agents": degraded_agents,
                 "agents_run": [agent for agent, status in state["agent_status"].items() 
-                             if status == "completed"]
+                             if status == AgentStatus.COMPLETED]
             },
             "langsmith_trace_id": state.get("trace_id")
         }
@@ -49,8 +59,6 @@ class ResponseCompilerAgent(BaseAgent):
         else:
             final_response["message"] = f"Found {len(products)} products matching your search."
         
-        state["final_response"] = final_response
-        
         # Log summary
         self.logger.info(
             "Response compiled",
@@ -58,32 +66,23 @@ class ResponseCompilerAgent(BaseAgent):
             total_time_ms=final_response["execution"]["total_time_ms"]
         )
         
-        return state
+        return {"final_response": final_response}
     
-    def _format_products(self, products: List[Dict]) -> List[Dict]:
+    def _format_products(self, products: List[Dict], limit: int = 20) -> List[Dict]:
         """Format products for response"""
         formatted_products = []
         
-        for product in products[:20]:  # Limit to 20 products
-            formatted_product = {
-                "id": product.get("productId", ""),
-                "name": product.get("name", ""),
-                "description": product.get("description", ""),
-                "brand": product.get("brand", ""),
-                "category": product.get("category", ""),
-                "size": product.get("size", ""),
-                "unit": product.get("unit", "")
-            }
-            
-            # Remove empty fields
-            formatted_product = {k: v for k, v in formatted_product.items() if v}
-            formatted_products.append(formatted_product)
+        # The whole candidate set; the API slices pages out of it
+        for product in products[:limit]:
+            # Only the fields in PRODUCT_RESPONSE_FIELDS, which the search
+            # projection also pushes down to Weaviate
+            formatted_products.append(format_product(product))
         
         return formatted_products
     
-    async def _fallback(self, state: SearchState, error: Exception) -> SearchState:
+    async def _fallback(self, state: SearchState, error: Exception) -> Dict[str, Any]:
         """Fallback response compilation"""
-        state["final_response"] = {
+        return {"final_response": {
             "success": False,
             "error": f"Failed to compile response: {str(error)}",
             "query": state.get("query", ""),
@@ -93,5 +92,4 @@ class ResponseCompilerAgent(BaseAgent):
                 "error": str(error),
                 "agent_timings": state.get("agent_timings", {})
             }
-        }
-        return state
\ No newline at end of file
+        }}
\ No newline at end of file
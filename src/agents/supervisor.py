@@ -1,6 +1,8 @@
 from typing import Dict, Any, List, Optional
 from src.agents.base import BaseAgent
 from src.models.state import SearchState, Message
+from src.core.query_analysis import analyze_query, score_confidence
+from src.core.metrics import ROUTING_DECISIONS, INTENTS
 
 class SupervisorReactAgent(BaseAgent):
     """Autonomous Supervisor that routes to other agents without calling tools"""
@@ -9,51 +11,58 @@ class SupervisorReactAgent(BaseAgent):
         super().__init__("supervisor")
         self.max_iterations = 2
         
-    async def _run(self, state: SearchState) -> SearchState:
+    async def _run(self, state: SearchState) -> Dict[str, Any]:
         """Analyze intent and route to appropriate agents"""
         query = state["query"]
         
         # Add initial analysis message
-        state["messages"].append({
+        messages: List[Message] = [{
             "role": "assistant",
             "content": f"Analyzing request: '{query}'",
             "tool_calls": None,
             "tool_call_id": None
-        })
+        }]
         
-        # REASON: Analyze the query intent
-        intent = self._analyze_intent(query)
-        confidence = self._calculate_confidence(query, intent)
+        # REASON: Analyze the query intent (precomputed once per request)
+        analysis = state.get("query_analysis") or analyze_query(query)
+        intent = analysis["intent"]
+        confidence = analysis["confidence"]
         
-        state["reasoning"].append(
+        reasoning = [
             f"Supervisor: Classified as '{intent}' with {confidence:.2f} confidence"
-        )
+        ]
         
         # DECIDE: Which agent should handle this?
         routing_decision = self._decide_routing(intent, confidence)
         
-        # Update state with decisions 
-        state["intent"] = intent
-        state["confidence"] = confidence
-        state["routing_decision"] = routing_decision
-        state["next_action"] = routing_decision  # Tell next agent what to do
-        
         # Add routing message
-        state["messages"].append({
+        messages.append({
             "role": "assistant",
             "content": f"Routing to {routing_decision} agent for: {intent}",
             "tool_calls": None,
             "tool_call_id": None
         })
         
+        # Update state with decisions 
+        updates: Dict[str, Any] = {
+            "messages": messages,
+            "reasoning": reasoning,
+            "intent": intent,
+            "confidence": confidence,
+            "routing_decision": routing_decision,
+            "next_action": routing_decision  # Tell next agent what to do
+        }
+        
         # Set flags for downstream agents
         if routing_decision == "product_search":
-            state["should_search"] = True
-            state["search_params"] = self._create_search_params(query, intent)
+            updates["should_search"] = True
+            updates["search_params"] = self._create_search_params(
+                query, intent, state.get("limit"), state.get("candidate_limit")
+            )
         elif routing_decision == "help":
-            state["should_help"] = True
+            updates["should_help"] = True
         elif routing_decision == "clarify":
-            state["needs_clarification"] = True
+            updates["needs_clarification"] = True
             
         self.logger.info(
             "Routing decision made",
@@ -61,65 +70,18 @@ class SupervisorReactAgent(BaseAgent):
             confidence=confidence,
             routing=routing_decision
         )
+        ROUTING_DECISIONS.labels(routing_decision).inc()
+        INTENTS.labels(intent).inc()
         
-        return state
+        return updates
     
     def _analyze_intent(self, query: str) -> str:
         """Analyze query intent without using tools"""
-        query_lower = query.lower()
-        
-        # Check for food/product queries first
-        food_terms = ["potato", "tomato", "pepper", "milk", "bread", "fruit", "vegetable"]
-        if any(term in query_lower for term in food_terms):
-            return "specific_product"
-        # Product-specific queries
-        if any(word in query_lower for word in ["organic", "fresh", "price", "cost", "$"]):
-            return "specific_product"
-        
-        # Brand queries
-        if any(word in query_lower for word in ["brand", "from"]):
-            return "brand_search"
-        
-        # Category browsing
-        if any(word in query_lower for word in ["vegetables", "fruits", "dairy", "meat"]):
-            return "category_browse"
-        
-        # Meal planning
-        if any(word in query_lower for word in ["dinner", "lunch", "meal", "recipe", "cook"]):
-            return "meal_planning"
-        
-        # General browsing
-        if any(word in query_lower for word in ["healthy", "snacks", "ideas", "suggestions"]):
-            return "discovery"
-        
-        # Help requests
-        if any(word in query_lower for word in ["help", "how", "what can"]):
-            return "help_request"
-        
-        # Unclear
-        if len(query_lower.split()) < 2:
-            return "unclear"
-            
-        return "general_search"
+        return analyze_query(query)["intent"]
     
     def _calculate_confidence(self, query: str, intent: str) -> float:
         """Calculate confidence in the intent classification"""
-        base_confidence = 0.6
-        
-        # Longer, more specific queries get higher confidence
-        word_count = len(query.split())
-        if word_count > 4:
-            base_confidence += 0.2
-        elif word_count > 2:
-            base_confidence += 0.1
-            
-        # Specific intents get higher confidence
-        if intent in ["specific_product", "brand_search"]:
-            base_confidence += 0.2
-        elif intent == "unclear":
-            base_confidence -= 0.2
-            
-        return min(max(base_confidence, 0.2), 0.95)
+        return score_confidence(query.lower().split(), intent)
     
     def _decide_routing(self, intent: str, confidence: float) -> str:
         """Decide which agent should handle the request"""
@@ -142,7 +104,7 @@ class SupervisorReactAgent(BaseAgent):
         
         return routing_map.get(intent, "product_search")
     
-    def _create_search_params(self, query: str, intent: str) -> Dict[str, Any]:
+    def _create_search_params(self, query: str, intent: str, limit: Optional[int] = None, candidate_limit: Optional[int] = None) -> Dict[str, Any]:
         """Create parameters for the search agent"""
         params = {
             "original_query": query,
@@ -159,5 +121,11 @@ class SupervisorReactAgent(BaseAgent):
             params["limit"] = 20
         else:
             params["limit"] = 10
+        
+        # The client's page size wins over the intent default, and the search
+        # fetches enough candidates to serve later pages from cache
+        if limit:
+            params["limit"] = limit
+        params["candidate_limit"] = max(candidate_limit or 0, params["limit"])
             
         return params
\ No newline at end of file
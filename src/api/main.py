@@ -1,29 +1,107 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
+from contextlib import asynccontextmanager
 import time
 from datetime import datetime
 import asyncio
 
 from src.config.settings import settings
 from src.core.graph import search_graph
-from src.models.state import SearchState, AgentStatus, SearchStrategy
+from src.models.state import SearchState, AgentStatus, SearchStrategy, QueryAnalysis
 from src.utils.id_generator import generate_request_id, generate_trace_id
 import structlog
 from src.core.config_manager import config_manager
+from src.core.weaviate_client import weaviate_registry
+from src.core.cache import TTLCache
+from src.core.singleflight import SingleFlight
+from src.core.deadline import deadline_scope
+from src.core.embeddings import get_query_embeddings
+from src.core.local_search import load_local_engine
+from src.core import metrics
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from src.utils.text import normalize_query
+from src.tools.search_tools import search_result_cache, search_flight, sku_details_loader, search_hedger, weaviate_breaker
+from src.tools.tool_executor import tool_executor
+from src.core.query_terms import match_query_terms
+from src.core.query_analysis import analyze_query
+from src.core.result_store import ResultStore
+from src.utils.pagination import decode_cursor, paginate
+from src.core.streaming import STREAM_FORMATS, encode_event
 from config.product_attributes import PRODUCT_ATTRIBUTES, DEFAULT_ALPHA, MIN_ALPHA, MAX_ALPHA
 from langsmith import traceable
 
 logger = structlog.get_logger()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared Weaviate client (and build the local search index) on startup, close it on shutdown"""
+    if settings.search_backend == "local":
+        logger.info("Serving search from the local engine, skipping Weaviate connect")
+    elif settings.weaviate_url:
+        try:
+            await weaviate_registry.connect()
+        except Exception as e:
+            # Tools reconnect lazily, so a cold backend should not block startup
+            logger.error("Weaviate connect on startup failed", error=str(e))
+    else:
+        logger.warning("WEAVIATE_URL not set, skipping Weaviate connect on startup")
+    
+    if settings.search_backend == "local" or settings.catalog_snapshot_path:
+        # Build the index now rather than on the first degraded request
+        await load_local_engine()
+    
+    yield
+    
+    await weaviate_registry.close()
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.api_title,
     version=settings.api_version,
-    description="Intelligent product search with LangGraph autonomous agents"
+    description="Intelligent product search with LangGraph autonomous agents",
+    lifespan=lifespan
+)
+
+# Response-level cache: a hit skips the graph entirely
+response_cache = TTLCache(
+    name="search_response",
+    max_entries=settings.response_cache_max_entries,
+    max_bytes=settings.response_cache_max_bytes,
+    ttl_seconds=settings.response_cache_ttl_s
 )
 
+# Concurrent searches for the same candidate set share one graph run
+graph_flight = SingleFlight("search_graph")
+
+def metered_caches() -> List[TTLCache]:
+    caches = [search_result_cache, response_cache]
+    embeddings = get_query_embeddings()
+    if embeddings is not None:
+        caches.append(embeddings.cache)
+    return caches
+
+# Cache hit ratios and breaker state are read from their stats() on scrape
+metrics.register_stats_collector(caches=metered_caches, breakers=lambda: [weaviate_breaker])
+
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    """Count in-flight requests and time them by route"""
+    metrics.REQUESTS_IN_FLIGHT.inc()
+    start_time = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        metrics.REQUESTS_IN_FLIGHT.dec()
+        # The route template, so /api/v1/... paths do not explode label cardinality
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        metrics.REQUEST_DURATION.labels(route, request.method, str(status)).observe(time.perf_counter() - start_time)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -39,6 +117,7 @@ class SearchRequest(BaseModel):
     user_id: Optional[str] = None
     session_id: Optional[str] = None
     limit: Optional[int] = 10
+    cursor: Optional[str] = None  # next_cursor from the previous page
 
 class SearchResponse(BaseModel):
     success: bool
@@ -49,26 +128,32 @@ class SearchResponse(BaseModel):
     message: Optional[str] = None
     error: Optional[str] = None
     langsmith_trace_url: Optional[str] = None
+    next_cursor: Optional[str] = None
+    degraded: bool = False  # Partial results: an agent ran out of its latency budget
+
+class BatchSearchRequest(BaseModel):
+    requests: List[SearchRequest]
+
+class BatchSearchResponse(BaseModel):
+    results: List[SearchResponse]  # Same order as the request list
+    execution: Dict[str, Any]
 @traceable(name="calculate_dynamic_alpha")
-def calculate_dynamic_alpha(query: str) -> float:
+def calculate_dynamic_alpha(query: str, matched: Optional[Dict[str, List[str]]] = None) -> float:
     """Calculate alpha using product attributes config"""
-    query_lower = query.lower()
     alpha = DEFAULT_ALPHA
     
     # Track what we find
     attribute_matches = []
     
-    # Check each attribute category
-    for category, config in PRODUCT_ATTRIBUTES.items():
-        terms = config["terms"]
-        impact = config["alpha_impact"]
-        
-        # Count matches in this category
-        matches = sum(1 for term in terms if term in query_lower)
-        
-        if matches > 0:
-            alpha += impact * matches
-            attribute_matches.append(f"{category}:{matches}")
+    # Reuse the request's QueryAnalysis matches when given, otherwise
+    # one pass over the query finds every attribute term
+    if matched is None:
+        matched = match_query_terms(query)["attributes"]
+    for category, terms in matched.items():
+        impact = PRODUCT_ATTRIBUTES[category]["alpha_impact"]
+        matches = len(terms)
+        alpha += impact * matches
+        attribute_matches.append(f"{category}:{matches}")
     
     # Keep alpha in bounds
     alpha = max(MIN_ALPHA, min(MAX_ALPHA, alpha))
@@ -78,10 +163,35 @@ def calculate_dynamic_alpha(query: str) -> float:
     
     return alpha    
 
+def page_size(request: SearchRequest) -> int:
+    """Requested page size, clamped to the configured maximum"""
+    return min(max(request.limit or settings.default_search_limit, 1), settings.max_search_limit)
+
+def default_candidate_limit(limit: int) -> int:
+    """Products fetched for a first page, so later pages come from cache"""
+    return min(limit * settings.candidate_pages, settings.max_search_limit)
+
+def resolve_page(request: SearchRequest, analysis: QueryAnalysis) -> Tuple[int, int, int]:
+    """Page size, offset and candidate limit for a request, decoding its cursor"""
+    limit = page_size(request)
+    if not request.cursor:
+        return limit, 0, default_candidate_limit(limit)
+    
+    try:
+        cursor = decode_cursor(request.cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if cursor["query"] != analysis["normalized"]:
+        raise HTTPException(status_code=400, detail="Cursor does not belong to this query")
+    
+    candidate_limit = min(max(cursor["candidate_limit"], limit), settings.max_search_limit)
+    return limit, cursor["offset"], candidate_limit
+
 # Initialize state for a new search
-def create_initial_state(request: SearchRequest,calculated_alpha: float) -> SearchState:
+def create_initial_state(request: SearchRequest,calculated_alpha: float, query_analysis: Optional[QueryAnalysis] = None, candidate_limit: Optional[int] = None) -> SearchState:
     """Create initial state for LangGraph execution"""
     request_id = generate_request_id()
+    limit = page_size(request)
     trace_id = generate_trace_id()
     
     # Get default search config
@@ -98,12 +208,15 @@ def create_initial_state(request: SearchRequest,calculated_alpha: float) -> Sear
         
         # Request context
         "query": request.query,
+        "query_analysis": query_analysis or analyze_query(request.query),
         "request_id": request_id,
         "timestamp": datetime.utcnow(),
         
         # Search config (static for now)
         "alpha_value": calculated_alpha,
         "search_strategy": SearchStrategy.HYBRID,
+        "limit": limit,
+        "candidate_limit": candidate_limit or default_candidate_limit(limit),
         
         # Agent state
         "next_action": None,
@@ -111,6 +224,7 @@ def create_initial_state(request: SearchRequest,calculated_alpha: float) -> Sear
         "routing_decision": None,
         "should_search": False,    # This too!
         "search_params": {},       # And this!
+        "result_store": ResultStore(settings.max_state_bytes_per_request),
         "search_results": [],
         "search_metadata": {},
         "pending_tool_calls": [],
@@ -119,6 +233,7 @@ def create_initial_state(request: SearchRequest,calculated_alpha: float) -> Sear
         # Execution tracking
         "agent_status": {},
         "agent_timings": {},
+        "degraded_agents": [],
         "total_execution_time": 0,
         
         # Tracing
@@ -131,54 +246,117 @@ def create_initial_state(request: SearchRequest,calculated_alpha: float) -> Sear
         "error": None
     }
 
-@app.post("/api/v1/search", response_model=SearchResponse)
-async def search_products(request: SearchRequest):
-    """Main search endpoint with full execution transparency"""
+def trace_url_for(state: Dict[str, Any]) -> Optional[str]:
+    """LangSmith trace URL for a run, if tracing is on"""
+    if settings.langchain_tracing_v2 and state.get("trace_id"):
+        return f"https://smith.langchain.com/public/{state['trace_id']}/r"
+    return None
+
+def cache_response(cache_key: Tuple[str, int], response_data: Dict[str, Any]):
+    """Only cache complete, successful responses; partial results are never reused"""
+    degraded = response_data.get("metadata", {}).get("degraded", False)
+    if settings.response_cache_enabled and response_data.get("success") and not response_data.get("error") and not degraded:
+        response_cache.set(cache_key, response_data)
+
+def build_search_response(
+    request: SearchRequest,
+    analysis: QueryAnalysis,
+    response_data: Dict[str, Any],
+    execution: Dict[str, Any],
+    page: Tuple[int, int, int],
+    start_time: float,
+    trace_url: Optional[str] = None
+) -> SearchResponse:
+    """Slice the requested page out of a compiled candidate set"""
+    limit, offset, candidate_limit = page
+    products, next_cursor = paginate(
+        response_data.get("products", []), offset, limit, analysis["normalized"], candidate_limit
+    )
+    
+    return SearchResponse(
+        success=response_data.get("success", False),
+        query=request.query,
+        products=products,
+        metadata={
+            **response_data.get("metadata", {}),
+            "offset": offset,
+            "limit": limit,
+            "returned_count": len(products)
+        },
+        execution={
+            **execution,
+            "total_time_ms": (time.perf_counter() - start_time) * 1000,
+            "timeout_ms": settings.search_timeout_ms
+        },
+        message=response_data.get("message"),
+        error=response_data.get("error"),
+        langsmith_trace_url=trace_url,
+        next_cursor=next_cursor,
+        degraded=response_data.get("metadata", {}).get("degraded", False)
+    )
+
+async def compile_candidates(request: SearchRequest, analysis: QueryAnalysis, candidate_limit: int) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Run the graph for a query's candidate set and cache the compiled response"""
+    # Calculate dynamic alpha based on query
+    calculated_alpha = calculate_dynamic_alpha(request.query, analysis["attribute_matches"])
+    # Create initial state
+    initial_state = create_initial_state(request, calculated_alpha, analysis, candidate_limit)
+    
+    logger.info(
+        "Starting search",
+        request_id=initial_state["request_id"],
+        query=request.query
+    )
+    
+    # Agents and tools inside the graph share this request-wide deadline
+    with deadline_scope(settings.search_timeout_ms / 1000):
+        final_state = await search_graph.ainvoke(initial_state)
+    
+    # Get the compiled response
+    response_data = final_state.get("final_response", {})
+    cache_response((analysis["normalized"], candidate_limit), response_data)
+    return response_data, trace_url_for(final_state)
+
+async def run_search(request: SearchRequest) -> SearchResponse:
+    """Search core shared by the single and batch endpoints
+
+    Raises HTTPException for a bad cursor; any other failure is reported in
+    the returned SearchResponse.
+    """
     start_time = time.perf_counter()
     
+    # Analyse the query once; every agent reads this instead of re-parsing
+    analysis = analyze_query(request.query)
+    # A bad cursor is a client error, not a failed search
+    page = resolve_page(request, analysis)
+    
     try:
-        # Calculate dynamic alpha based on query
-        calculated_alpha = calculate_dynamic_alpha(request.query)
-        # Create initial state
-        initial_state = create_initial_state(request,calculated_alpha)
+        # The candidate set is cached per query, so repeats and later pages
+        # are sliced from it without running the graph
+        cache_key = (analysis["normalized"], page[2])
+        cached_response = response_cache.get(cache_key) if settings.response_cache_enabled else None
         
-        logger.info(
-            "Starting search",
-            request_id=initial_state["request_id"],
-            query=request.query
-        )
+        if cached_response is not None:
+            logger.info("Search served from cache", query=request.query, offset=page[1])
+            return build_search_response(
+                request, analysis, cached_response,
+                {**cached_response.get("execution", {}), "cache_hit": True, "served_from": "response_cache"},
+                page, start_time
+            )
         
-        # Execute the graph with timeout
-        final_state = await asyncio.wait_for(
-            search_graph.ainvoke(initial_state),
-            timeout=settings.search_timeout_ms / 1000  # Convert to seconds
+        # Identical searches in flight (e.g. duplicates across a batch) share one
+        # graph run. The graph stops searching at search_timeout_ms; the grace
+        # lets its nodes compile what they found before the request is failed
+        response_data, trace_url = await asyncio.wait_for(
+            graph_flight.do(cache_key, lambda: compile_candidates(request, analysis, page[2])),
+            timeout=(settings.search_timeout_ms + settings.search_timeout_grace_ms) / 1000
         )
         
-        # Calculate total execution time
-        total_time = (time.perf_counter() - start_time) * 1000
-        
-        # Get the compiled response
-        response_data = final_state.get("final_response", {})
-        
-        # Add LangSmith trace URL if available
-        trace_url = None
-        if settings.langchain_tracing_v2 and final_state.get("trace_id"):
-            trace_url = f"https://smith.langchain.com/public/{final_state['trace_id']}/r"
-        
         # Build response
-        return SearchResponse(
-            success=response_data.get("success", False),
-            query=request.query,
-            products=response_data.get("products", []),
-            metadata=response_data.get("metadata", {}),
-            execution={
-                **response_data.get("execution", {}),
-                "total_time_ms": total_time,
-                "timeout_ms": settings.search_timeout_ms
-            },
-            message=response_data.get("message"),
-            error=response_data.get("error"),
-            langsmith_trace_url=trace_url
+        return build_search_response(
+            request, analysis, response_data,
+            {**response_data.get("execution", {}), "cache_hit": False},
+            page, start_time, trace_url
         )
         
     except asyncio.TimeoutError:
@@ -209,13 +387,223 @@ async def search_products(request: SearchRequest):
             error=f"Search failed: {str(e)}"
         )
 
+@app.post("/api/v1/search", response_model=SearchResponse)
+async def search_products(request: SearchRequest):
+    """Main search endpoint with full execution transparency"""
+    return await run_search(request)
+
+@app.post("/api/v1/search/batch", response_model=BatchSearchResponse)
+async def search_products_batch(batch: BatchSearchRequest):
+    """Run many searches in one call, concurrently and in request order"""
+    if len(batch.requests) > settings.batch_search_max_items:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch has {len(batch.requests)} requests, the limit is {settings.batch_search_max_items}"
+        )
+    
+    start_time = time.perf_counter()
+    semaphore = asyncio.Semaphore(settings.batch_search_max_concurrency)
+    
+    async def run_item(request: SearchRequest) -> SearchResponse:
+        async with semaphore:
+            try:
+                return await run_search(request)
+            except HTTPException as e:
+                # One bad item must not fail the whole batch
+                return SearchResponse(
+                    success=False,
+                    query=request.query,
+                    products=[],
+                    metadata={},
+                    execution={"status_code": e.status_code},
+                    error=str(e.detail)
+                )
+    
+    # Identical requests run once; each position gets the shared result
+    keys = [(normalize_query(r.query), page_size(r), r.cursor) for r in batch.requests]
+    tasks: Dict[Tuple[str, int, Optional[str]], asyncio.Task] = {}
+    for key, request in zip(keys, batch.requests):
+        if key not in tasks:
+            tasks[key] = asyncio.ensure_future(run_item(request))
+    
+    await asyncio.gather(*tasks.values())
+    results = [
+        tasks[key].result().model_copy(update={"query": request.query})
+        for key, request in zip(keys, batch.requests)
+    ]
+    
+    logger.info("Batch search complete", requests=len(keys), unique=len(tasks))
+    return BatchSearchResponse(
+        results=results,
+        execution={
+            "total_time_ms": (time.perf_counter() - start_time) * 1000,
+            "requests": len(keys),
+            "unique_requests": len(tasks),
+            "succeeded": sum(1 for result in results if result.success),
+            "max_concurrency": settings.batch_search_max_concurrency
+        }
+    )
+
+async def stream_search_events(
+    request: SearchRequest,
+    analysis: QueryAnalysis,
+    page: Tuple[int, int, int],
+    start_time: float,
+    stream_format: str
+) -> AsyncIterator[str]:
+    """Run the graph with astream and emit routing, product batches and the final response"""
+    limit, offset, candidate_limit = page
+    cache_key = (analysis["normalized"], candidate_limit)
+    
+    cached_response = response_cache.get(cache_key) if settings.response_cache_enabled else None
+    if cached_response is not None:
+        logger.info("Streaming search served from cache", query=request.query, offset=offset)
+        response = build_search_response(
+            request, analysis, cached_response,
+            {**cached_response.get("execution", {}), "cache_hit": True, "served_from": "response_cache"},
+            page, start_time
+        )
+        yield encode_event("final", response.model_dump(), stream_format)
+        return
+    
+    calculated_alpha = calculate_dynamic_alpha(request.query, analysis["attribute_matches"])
+    initial_state = create_initial_state(request, calculated_alpha, analysis, candidate_limit)
+    logger.info("Starting streaming search", request_id=initial_state["request_id"], query=request.query)
+    yield encode_event("start", {"request_id": initial_state["request_id"], "query": request.query}, stream_format)
+    
+    # Product batches only preview the first page; later pages come from the final event
+    streamed_ids = set()
+    response_data: Dict[str, Any] = {}
+    deadline = start_time + settings.search_timeout_ms / 1000
+    # Past the deadline nodes get a grace period to compile partial results
+    cutoff = deadline + settings.search_timeout_grace_ms / 1000
+    stream = search_graph.astream(initial_state, stream_mode=["updates", "custom"])
+    
+    try:
+        while True:
+            remaining = cutoff - time.perf_counter()
+            if remaining <= 0:
+                raise asyncio.TimeoutError()
+            try:
+                # Nodes started in this step inherit the request deadline
+                with deadline_scope(max(0.0, deadline - time.perf_counter())):
+                    mode, chunk = await asyncio.wait_for(stream.__anext__(), timeout=remaining)
+            except StopAsyncIteration:
+                break
+            
+            if mode == "custom" and chunk.get("type") == "products":
+                if offset > 0:
+                    continue
+                batch = []
+                for product in chunk["products"]:
+                    product_id = product.get("id")
+                    if len(streamed_ids) >= limit:
+                        break
+                    if product_id not in streamed_ids:
+                        streamed_ids.add(product_id)
+                        batch.append(product)
+                if batch:
+                    yield encode_event("products", {
+                        "tool": chunk["tool"],
+                        "iteration": chunk["iteration"],
+                        "products": batch,
+                        "elapsed_ms": (time.perf_counter() - start_time) * 1000
+                    }, stream_format)
+            
+            elif mode == "updates":
+                for node, update in chunk.items():
+                    update = update or {}
+                    if node == "supervisor" and "routing_decision" in update:
+                        yield encode_event("routing", {
+                            "intent": update.get("intent"),
+                            "confidence": update.get("confidence"),
+                            "routing_decision": update["routing_decision"],
+                            "elapsed_ms": (time.perf_counter() - start_time) * 1000
+                        }, stream_format)
+                    elif node == "response_compiler":
+                        response_data = update.get("final_response", {})
+    
+    except asyncio.TimeoutError:
+        logger.error("Streaming search timeout", query=request.query)
+        yield encode_event("error", {
+            "error": f"Search timeout after {settings.search_timeout_ms}ms",
+            "timeout": True
+        }, stream_format)
+        return
+    
+    except Exception as e:
+        logger.error("Streaming search failed", error=str(e), query=request.query)
+        yield encode_event("error", {"error": f"Search failed: {str(e)}"}, stream_format)
+        return
+    
+    finally:
+        await stream.aclose()
+    
+    cache_response(cache_key, response_data)
+    response = build_search_response(
+        request, analysis, response_data,
+        {**response_data.get("execution", {}), "cache_hit": False},
+        page, start_time, trace_url_for(initial_state)
+    )
+    yield encode_event("final", response.model_dump(), stream_format)
+
+@app.post("/api/v1/search/stream")
+async def search_products_stream(request: SearchRequest, stream_format: str = Query("ndjson", alias="format")):
+    """Streaming search: routing, product batches as tools return, then the final response"""
+    if stream_format not in STREAM_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported stream format: {stream_format}")
+    
+    start_time = time.perf_counter()
+    analysis = analyze_query(request.query)
+    page = resolve_page(request, analysis)
+    
+    return StreamingResponse(
+        stream_search_events(request, analysis, page, start_time, stream_format),
+        media_type=STREAM_FORMATS[stream_format],
+        headers={"Cache-Control": "no-cache"}
+    )
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    # An open breaker means searches are being served in degraded mode
+    breaker_state = weaviate_breaker.state.value
     return {
-        "status": "healthy",
+        "status": "healthy" if breaker_state == "closed" else "degraded",
         "timestamp": datetime.utcnow().isoformat(),
-        "version": settings.api_version
+        "version": settings.api_version,
+        "weaviate_circuit": breaker_state
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics"""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/api/v1/cache/stats")
+async def get_cache_stats():
+    """Statistics for the caches, request coalescing, batching, hedging and tool execution"""
+    embeddings = get_query_embeddings()
+    return {
+        "caches": [
+            search_result_cache.stats(),
+            response_cache.stats()
+        ],
+        "coalescing": [
+            search_flight.stats(),
+            graph_flight.stats()
+        ],
+        "batching": [
+            sku_details_loader.stats()
+        ],
+        "query_embeddings": embeddings.stats() if embeddings is not None else None,
+        "hedging": [
+            search_hedger.stats()
+        ],
+        "circuit_breakers": [
+            weaviate_breaker.stats()
+        ],
+        "tools": tool_executor.stats()
     }
 
 @app.get("/api/v1/agents")
@@ -233,13 +621,18 @@ async def get_agent_info():
                 "type": "executor",
                 "description": "Searches products with ability to refine results"
             },
+            {
+                "name": "reranker",
+                "type": "ranker",
+                "description": "Re-orders candidates by attribute, brand, category and size matches"
+            },
             {
                 "name": "response_compiler",
                 "type": "formatter", 
                 "description": "Compiles final response with execution transparency"
             }
         ],
-        "flow": "supervisor → product_search → response_compiler"
+        "flow": "supervisor → product_search → reranker → response_compiler"
     }
 
 if __name__ == "__main__":
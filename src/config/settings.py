@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # API Configuration
@@ -11,6 +11,35 @@ class Settings(BaseSettings):
     weaviate_url: Optional[str] = None
     weaviate_api_key: Optional[str] = None
     weaviate_class_name: str = "Product"
+    weaviate_max_concurrent_queries: int = 32  # In-flight queries per process
+    weaviate_pool_connections: int = 20  # Keepalive connections kept in the pool
+    weaviate_pool_maxsize: int = 100
+    weaviate_pool_max_retries: int = 3
+    weaviate_pool_timeout_s: int = 5
+    weaviate_keepalive_time_ms: int = 30000  # gRPC keepalive ping interval
+    weaviate_keepalive_timeout_ms: int = 10000
+    weaviate_query_timeout_s: int = 30
+    details_batch_window_ms: float = 2.0  # Window for collecting SKU lookups
+    details_batch_max_size: int = 100
+    hedging_enabled: bool = False  # Duplicate slow hybrid queries to cut tail latency
+    hedge_percentile: float = 95.0  # Hedge once a query is slower than this percentile
+    hedge_min_delay_ms: float = 10.0
+    hedge_max_rate: float = 0.1  # At most this share of recent queries are hedged
+    hedge_min_samples: int = 50  # Latencies observed before hedging starts
+    breaker_enabled: bool = True  # Fail fast while Weaviate is failing
+    breaker_failure_rate: float = 0.5
+    breaker_slow_call_ms: Optional[float] = None  # Set well above normal query latency to also open on slow calls
+    breaker_slow_rate: float = 0.8
+    breaker_window: int = 20  # Recent calls the rates are computed over
+    breaker_min_calls: int = 10
+    breaker_open_s: float = 10.0  # Time open before a half-open probe
+    catalog_snapshot_path: Optional[str] = None  # Degraded-mode fallback (JSON or JSONL)
+    search_backend: str = "weaviate"  # "local" serves every search from the catalog snapshot in-process
+    query_embedder: Optional[str] = None  # "hashing" or "sentence-transformers"; unset lets Weaviate vectorize
+    query_embedder_model: str = "sentence-transformers/all-MiniLM-L6-v2"  # Must match the collection's vectorizer
+    query_embedding_dim: int = 384  # Hashing stand-in only
+    query_embedding_batch_window_ms: float = 2.0  # Window for collecting queries to embed together
+    query_embedding_batch_max_size: int = 64
     
     # HuggingFace Configuration
     huggingface_api_key: Optional[str] = None
@@ -23,7 +52,33 @@ class Settings(BaseSettings):
     
     # Search Configuration
     search_timeout_ms: int = 5000
+    search_timeout_grace_ms: int = 200  # Time past search_timeout_ms for nodes to compile partial results
+    agent_budgets_enabled: bool = False  # Enforce timeout_ms from agent_priorities.yaml
+    agent_budget_grace_ms: int = 20  # Time past its budget before an agent is cut off
     default_search_limit: int = 10
+    max_search_limit: int = 100
+    candidate_pages: int = 5  # Pages fetched per query so later pages come from cache
+    search_fanout_enabled: bool = False  # Run speculative query variants alongside the primary
+    search_fanout_variants: List[str] = ["broadened", "keyword", "vector"]
+    search_fanout_rrf_k: int = 60
+    search_details_enabled: bool = False  # Fetch full records for the top 5 of a large result set (one more round trip)
+    max_state_bytes_per_request: int = 4 * 1024 * 1024  # Product records held in state
+    batch_search_max_items: int = 500
+    batch_search_max_concurrency: int = 16  # Searches from one batch run at once
+    
+    # Cache Configuration
+    tool_cache_enabled: bool = True
+    tool_cache_max_entries: int = 2048
+    tool_cache_max_bytes: int = 64 * 1024 * 1024
+    tool_cache_ttl_s: float = 300
+    tool_cache_stale_ttl_s: float = 3600  # Expired results still served while Weaviate is down
+    query_embedding_cache_max_entries: int = 50000
+    query_embedding_cache_max_bytes: int = 128 * 1024 * 1024
+    query_embedding_cache_ttl_s: float = 86400
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 1024
+    response_cache_max_bytes: int = 32 * 1024 * 1024
+    response_cache_ttl_s: float = 60
     
     # Environment
     environment: str = "development"
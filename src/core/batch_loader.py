@@ -0,0 +1,122 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Set, TypeVar
+import structlog
+
+logger = structlog.get_logger()
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+class BatchLoader(Generic[K, V]):
+    """DataLoader-style micro-batcher shared across concurrent requests
+
+    Keys requested within window_ms of the first pending key are collected,
+    de-duplicated and resolved with one call to batch_fn, which returns a
+    mapping of the keys it found. Each caller receives its own key's value,
+    or None when batch_fn did not return it. Keys already being fetched are
+    joined rather than fetched again. A batch is dispatched early once it
+    reaches max_batch_size. If a batch is cancelled, its callers' futures
+    are cancelled too rather than left pending.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        window_ms: float = 2.0,
+        max_batch_size: int = 100
+    ):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.window_s = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[K, asyncio.Future] = {}
+        self._in_flight: Dict[K, asyncio.Future] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Strong references so running batches are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.keys_requested = 0
+        self.keys_fetched = 0
+
+    async def load(self, key: K) -> Optional[V]:
+        """Resolve a single key through the next batch"""
+        # Shield so a cancelled caller does not cancel the shared future
+        return await asyncio.shield(self._future_for(key))
+
+    async def load_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """Resolve several keys; keys that were not found are omitted"""
+        keys = list(dict.fromkeys(keys))
+        futures = [self._future_for(key) for key in keys]
+        values = await asyncio.shield(asyncio.gather(*futures))
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def _future_for(self, key: K) -> asyncio.Future:
+        self.keys_requested += 1
+
+        future = self._in_flight.get(key) or self._pending.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Avoid "exception never retrieved" if every caller was cancelled
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending[key] = future
+
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._dispatch)
+        return future
+
+    def _dispatch(self):
+        """Send everything collected so far as one batch"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        self._in_flight.update(batch)
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: Dict[K, asyncio.Future]):
+        keys = list(batch)
+        self.batches += 1
+        self.keys_fetched += len(keys)
+        logger.debug("Dispatching batch", loader=self.name, size=len(keys))
+
+        try:
+            results = await self.batch_fn(keys)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        except BaseException:
+            for future in batch.values():
+                future.cancel()
+            raise
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(results.get(key))
+        finally:
+            for key, future in batch.items():
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "batches": self.batches,
+            "keys_requested": self.keys_requested,
+            "keys_fetched": self.keys_fetched,
+            "avg_batch_size": self.keys_fetched / self.batches if self.batches else 0.0,
+            "pending": len(self._pending),
+            "in_flight": len(self._in_flight),
+            "running_batches": len(self._tasks)
+        }
@@ -0,0 +1,58 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import structlog
+from src.config.settings import settings
+
+logger = structlog.get_logger()
+
+# Key for a stored embedding in snapshot records; never a Weaviate property
+VECTOR_KEY = "_vector"
+
+def load_snapshot(path: str) -> List[Dict[str, Any]]:
+    """Load products from a JSON list or a JSON-lines snapshot file"""
+    text = Path(path).read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+def public_record(product: Dict[str, Any]) -> Dict[str, Any]:
+    """A snapshot product without the stored embedding"""
+    return {key: value for key, value in product.items() if key != VECTOR_KEY}
+
+class CatalogSnapshot:
+    """Products exported from Weaviate, kept in memory for degraded serving"""
+
+    def __init__(self, products: List[Dict[str, Any]]):
+        self.products = products
+        self.by_sku = {product["sku"]: product for product in products if product.get("sku")}
+
+    @classmethod
+    def from_file(cls, path: str) -> "CatalogSnapshot":
+        return cls(load_snapshot(path))
+
+    def get(self, sku: str) -> Optional[Dict[str, Any]]:
+        product = self.by_sku.get(sku)
+        return public_record(product) if product is not None else None
+
+_snapshot: Optional[CatalogSnapshot] = None
+_snapshot_loaded = False
+
+def get_catalog_snapshot() -> Optional[CatalogSnapshot]:
+    """The snapshot at settings.catalog_snapshot_path, loaded on first use"""
+    global _snapshot, _snapshot_loaded
+    if not _snapshot_loaded:
+        _snapshot_loaded = True
+        if settings.catalog_snapshot_path:
+            try:
+                _snapshot = CatalogSnapshot.from_file(settings.catalog_snapshot_path)
+                logger.info("Loaded catalog snapshot", products=len(_snapshot.products))
+            except Exception as e:
+                logger.error("Failed to load catalog snapshot", error=str(e))
+    return _snapshot
+
+def set_catalog_snapshot(snapshot: Optional[CatalogSnapshot]):
+    """Use the given snapshot instead of loading one from settings"""
+    global _snapshot, _snapshot_loaded
+    _snapshot = snapshot
+    _snapshot_loaded = True
@@ -0,0 +1,159 @@
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+import structlog
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class CircuitOpenError(Exception):
+    """The backend is considered unhealthy; the call was not attempted"""
+
+class CircuitBreaker:
+    """Stop calling a backend that is failing or slow, then probe for recovery
+
+    Outcomes of the last `window` calls are kept. Once at least `min_calls`
+    are known, the breaker opens when the failure rate reaches its threshold,
+    or, when slow_call_ms is set, when the rate of calls slower than that
+    reaches slow_rate_threshold. While open, calls fail immediately with
+    CircuitOpenError. After open_seconds the breaker goes half-open and lets
+    up to half_open_max_calls probes through: a healthy probe closes it, a
+    failed or slow one opens it again.
+
+    A caller that is cancelled (its own deadline, or results already being
+    sufficient) only counts against the backend if slow calls are tracked
+    and it had already waited longer than slow_call_ms.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_ms: Optional[float] = None,
+        slow_rate_threshold: float = 0.8,
+        window: int = 20,
+        min_calls: int = 10,
+        open_seconds: float = 10.0,
+        half_open_max_calls: int = 1
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        # None: only failures open the breaker
+        self.slow_call_s = slow_call_ms / 1000 if slow_call_ms is not None else None
+        self.slow_rate_threshold = slow_rate_threshold
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.state = BreakerState.CLOSED
+        # (failed, slow) for recent calls
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def allow_request(self) -> bool:
+        """Whether a call may go to the backend now"""
+        if self.state == BreakerState.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                return False
+            self._transition(BreakerState.HALF_OPEN)
+
+        if self.state == BreakerState.HALF_OPEN:
+            return self._probes < self.half_open_max_calls
+
+        return True
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() through the breaker, raising CircuitOpenError when open"""
+        if not self.allow_request():
+            self.rejected += 1
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+
+        probing = self.state == BreakerState.HALF_OPEN
+        if probing:
+            self._probes += 1
+
+        start = time.monotonic()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            if self._is_slow(time.monotonic() - start):
+                self._record(failed=False, slow=True)
+            raise
+        except Exception:
+            self._record(failed=True, slow=False)
+            raise
+        else:
+            self._record(failed=False, slow=self._is_slow(time.monotonic() - start))
+            return result
+        finally:
+            if probing:
+                self._probes -= 1
+
+    def _is_slow(self, elapsed: float) -> bool:
+        return self.slow_call_s is not None and elapsed >= self.slow_call_s
+
+    def _record(self, failed: bool, slow: bool):
+        if self.state == BreakerState.HALF_OPEN:
+            if failed or slow:
+                self._transition(BreakerState.OPEN)
+            else:
+                self._transition(BreakerState.CLOSED)
+            return
+        if self.state == BreakerState.OPEN:
+            # A call started before the breaker opened
+            return
+
+        self._outcomes.append((failed, slow))
+        if len(self._outcomes) < self.min_calls:
+            return
+
+        failure_rate, slow_rate = self._rates()
+        if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_rate_threshold:
+            logger.warning(
+                "Circuit opened",
+                breaker=self.name,
+                failure_rate=failure_rate,
+                slow_rate=slow_rate
+            )
+            self._transition(BreakerState.OPEN)
+
+    def _rates(self) -> Tuple[float, float]:
+        if not self._outcomes:
+            return 0.0, 0.0
+        calls = len(self._outcomes)
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, slow in self._outcomes if slow)
+        return failures / calls, slow / calls
+
+    def _transition(self, state: BreakerState):
+        if state == self.state:
+            return
+        logger.info("Circuit state change", breaker=self.name, old=self.state.value, new=state.value)
+        self.state = state
+        if state == BreakerState.OPEN:
+            self._opened_at = time.monotonic()
+            self.opened += 1
+        elif state == BreakerState.CLOSED:
+            self._outcomes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        failure_rate, slow_rate = self._rates()
+        return {
+            "name": self.name,
+            "state": self.state.value,
+            "failure_rate": failure_rate,
+            "slow_rate": slow_rate,
+            "calls_in_window": len(self._outcomes),
+            "rejected": self.rejected,
+            "opened": self.opened
+        }
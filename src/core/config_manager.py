@@ -5,10 +5,13 @@ import structlog
 
 logger = structlog.get_logger()
 
+# Resolved from the project root so the config loads from any working directory
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "agent_priorities.yaml"
+
 class AgentConfigManager:
     """Manages agent configuration from YAML file"""
     
-    def __init__(self, config_path: str = "config/agent_priorities.yaml"):
+    def __init__(self, config_path: str = str(DEFAULT_CONFIG_PATH)):
         self.config_path = Path(config_path)
         self.config = self._load_config()
         
@@ -30,8 +33,14 @@ class AgentConfigManager:
             },
             "agents": {
                 "supervisor": {"timeout_ms": 50, "enabled": True},
-                "product_search": {"timeout_ms": 150, "enabled": True},
+                "product_search": {"timeout_ms": 900, "enabled": True},
+                "reranker": {"timeout_ms": 1, "enabled": True},
                 "response_compiler": {"timeout_ms": 30, "enabled": True}
+            },
+            "tools": {
+                "product_search": {"timeout_ms": 400, "max_concurrency": 32},
+                "get_product_details": {"timeout_ms": 400, "max_concurrency": 16},
+                "get_product_details_batch": {"timeout_ms": 400, "max_concurrency": 8}
             }
         }
     
@@ -47,6 +56,19 @@ class AgentConfigManager:
         """Get configuration for specific agent"""
         return self.config.get("agents", {}).get(agent_name, {})
     
+    def get_agent_budget_s(self, agent_name: str) -> Optional[float]:
+        """Latency budget for an agent in seconds, None when not configured"""
+        timeout_ms = self.get_agent_config(agent_name).get("timeout_ms")
+        return timeout_ms / 1000 if timeout_ms else None
+    
+    def get_tool_config(self, tool_name: str) -> Dict[str, Any]:
+        """Get configuration for a specific tool"""
+        return self.config.get("tools", {}).get(tool_name, {})
+    
+    def get_reranker_weights(self) -> Dict[str, float]:
+        """Reranker feature weights; missing features use the built-in defaults"""
+        return self.config.get("reranker", {}).get("weights", {})
+    
     def is_agent_enabled(self, agent_name: str) -> bool:
         """Check if agent is enabled"""
         agent_config = self.get_agent_config(agent_name)
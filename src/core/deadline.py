@@ -0,0 +1,54 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Absolute perf_counter() time the current work must finish by; tasks
+# started inside a scope inherit it through the copied context
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """The current latency budget ran out"""
+
+@contextmanager
+def deadline_scope(timeout_s: Optional[float]) -> Iterator[Optional[float]]:
+    """Bound the enclosed work by timeout_s; nested scopes never extend an outer one"""
+    current = _deadline.get()
+    deadline = current
+    if timeout_s is not None:
+        deadline = time.perf_counter() + timeout_s
+        if current is not None:
+            deadline = min(deadline, current)
+
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or None when unbounded"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.perf_counter())
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+async def within_deadline(awaitable: Awaitable[T], grace_s: float = 0.0) -> T:
+    """Await within the remaining budget, raising DeadlineExceeded when it runs out"""
+    left = remaining()
+    if left is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, timeout=left + grace_s)
+    except asyncio.TimeoutError:
+        # A timeout raised by the work itself is not ours to rename
+        if not expired():
+            raise
+        raise DeadlineExceeded(f"Deadline exceeded after budget of {left * 1000:.0f}ms")
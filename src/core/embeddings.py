@@ -0,0 +1,165 @@
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+import numpy as np
+import structlog
+from src.config.settings import settings
+from src.core.batch_loader import BatchLoader
+from src.core.cache import TTLCache
+from src.core.local_search import tokenize
+from src.utils.text import normalize_query
+
+logger = structlog.get_logger()
+
+class QueryEmbedder(ABC):
+    """Turns search queries into vectors in-process
+
+    Implementations embed a whole batch per call, returning one float32 row
+    per text; the vectors must live in the same space as the collection's
+    stored vectors for hybrid search to be meaningful.
+    """
+
+    name: str = "base"
+
+    @abstractmethod
+    async def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """One float32 row per text, in order"""
+        pass
+
+class HashingEmbedder(QueryEmbedder):
+    """Deterministic stand-in model for tests, benchmarks and offline runs
+
+    Words and character trigrams are hashed into a fixed number of signed
+    buckets and the result is L2-normalised, so queries sharing words or
+    spelling end up close together. Not comparable with real model vectors.
+    """
+
+    name: str = "hashing"
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = tokenize(text)
+        trigrams = [word[i:i + 3] for word in words for i in range(max(1, len(word) - 2))]
+        return words + [f"#{trigram}" for trigram in trigrams]
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+            vector[digest % self.dim] += 1.0 if (digest >> 63) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def embed_batch(self, texts: List[str]) -> np.ndarray:
+        return np.stack([self.embed(text) for text in texts])
+
+class SentenceTransformerEmbedder(QueryEmbedder):
+    """Embeds with a local sentence-transformers model
+
+    Use the model the Weaviate vectorizer uses so query and product vectors
+    are comparable. Requires the optional sentence-transformers package; the
+    model loads on first use and batches run in a worker thread.
+    """
+
+    name: str = "sentence-transformers"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._model = None
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            self._model = SentenceTransformer(self.model_name)
+            logger.info("Loaded query embedding model", model=self.model_name)
+        return np.asarray(self._model.encode(texts, normalize_embeddings=True), dtype=np.float32)
+
+    async def embed_batch(self, texts: List[str]) -> np.ndarray:
+        return await asyncio.to_thread(self._encode, texts)
+
+class QueryEmbeddings:
+    """Cached, micro-batched query embeddings shared across requests
+
+    Vectors are cached LRU on the normalised query. Misses from concurrent
+    requests are collected for window_ms and embedded in one call, and a
+    query already being embedded is joined rather than embedded twice.
+    """
+
+    def __init__(
+        self,
+        embedder: QueryEmbedder,
+        max_entries: int = 50000,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: float = 86400,
+        window_ms: float = 2.0,
+        max_batch_size: int = 64
+    ):
+        self.embedder = embedder
+        self.cache = TTLCache(
+            name="query_embeddings",
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds
+        )
+        self.loader = BatchLoader(
+            name="query_embeddings",
+            batch_fn=self._embed_batch,
+            window_ms=window_ms,
+            max_batch_size=max_batch_size
+        )
+
+    async def _embed_batch(self, queries: List[str]) -> Dict[str, np.ndarray]:
+        vectors = await self.embedder.embed_batch(queries)
+        # Copy rows so a cached vector does not keep the whole batch alive
+        return {query: vector.copy() for query, vector in zip(queries, vectors)}
+
+    async def embed(self, query: str) -> Optional[np.ndarray]:
+        """Vector for the query, from the cache or the next embedding batch"""
+        key = normalize_query(query)
+        if not key:
+            return None
+
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = await self.loader.load(key)
+            if vector is not None:
+                self.cache.set(key, vector)
+        return vector
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "embedder": self.embedder.name,
+            "cache": self.cache.stats(),
+            "batching": self.loader.stats()
+        }
+
+def create_query_embedder(name: str) -> QueryEmbedder:
+    if name == "hashing":
+        return HashingEmbedder(dim=settings.query_embedding_dim)
+    if name == "sentence-transformers":
+        return SentenceTransformerEmbedder(settings.query_embedder_model)
+    raise ValueError(f"Unknown query embedder: {name}")
+
+_query_embeddings: Optional[QueryEmbeddings] = None
+
+def get_query_embeddings() -> Optional[QueryEmbeddings]:
+    """Shared query embeddings, or None when Weaviate vectorizes queries itself"""
+    global _query_embeddings
+    if _query_embeddings is None and settings.query_embedder:
+        _query_embeddings = QueryEmbeddings(
+            create_query_embedder(settings.query_embedder),
+            max_entries=settings.query_embedding_cache_max_entries,
+            max_bytes=settings.query_embedding_cache_max_bytes,
+            ttl_seconds=settings.query_embedding_cache_ttl_s,
+            window_ms=settings.query_embedding_batch_window_ms,
+            max_batch_size=settings.query_embedding_batch_max_size
+        )
+    return _query_embeddings
+
+def set_query_embeddings(embeddings: Optional[QueryEmbeddings]):
+    """Use the given embeddings instead of building them from settings"""
+    global _query_embeddings
+    _query_embeddings = embeddings
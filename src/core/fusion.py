@@ -0,0 +1,42 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+# Standard RRF damping constant; larger values flatten the rank curve
+DEFAULT_RRF_K = 60
+
+def reciprocal_rank_fusion(
+    ranked_lists: Sequence[Sequence[Dict[str, Any]]],
+    key: str = "sku",
+    k: int = DEFAULT_RRF_K,
+    weights: Optional[Sequence[float]] = None,
+    score_key: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Fuse ranked product lists into one ranking by reciprocal rank
+
+    Each product scores sum(weight / (k + rank)) over the lists it appears
+    in, so items ranked well by several strategies rise to the top. The first
+    record seen for a key is kept; ties keep first-seen order. Products
+    without the key are dropped. With score_key, copies of the records are
+    returned with the fused score under that key, replacing any per-list
+    score, which is not comparable across lists.
+    """
+    scores: Dict[Any, float] = {}
+    products: Dict[Any, Dict[str, Any]] = {}
+
+    for i, ranked in enumerate(ranked_lists):
+        weight = weights[i] if weights is not None else 1.0
+        seen = set()
+        for rank, product in enumerate(ranked, start=1):
+            product_key = product.get(key)
+            if not product_key or product_key in seen:
+                continue
+            seen.add(product_key)
+            if product_key not in products:
+                products[product_key] = product
+                scores[product_key] = 0.0
+            scores[product_key] += weight / (k + rank)
+
+    # sorted() is stable, so equal scores stay in first-seen order
+    ordered = sorted(products, key=lambda product_key: -scores[product_key])
+    if score_key is not None:
+        return [{**products[product_key], score_key: scores[product_key]} for product_key in ordered]
+    return [products[product_key] for product_key in ordered]
@@ -1,9 +1,11 @@
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from langsmith import traceable
+from typing import Any, Dict
 from src.models.state import SearchState
 from src.agents.supervisor import SupervisorReactAgent
 from src.agents.product_search import ProductSearchReactAgent
+from src.agents.reranker import RerankerAgent
 from src.agents.response_compiler import ResponseCompilerAgent
 from src.core.config_manager import config_manager
 import structlog
@@ -13,20 +15,26 @@ logger = structlog.get_logger()
 # Initialize agents
 supervisor = SupervisorReactAgent()
 product_search = ProductSearchReactAgent()
+reranker = RerankerAgent()
 response_compiler = ResponseCompilerAgent()
 
 @traceable(name="supervisor_node")
-async def supervisor_node(state: SearchState) -> SearchState:
+async def supervisor_node(state: SearchState) -> Dict[str, Any]:
     """Supervisor node - analyzes and routes"""
     return await supervisor.execute(state)
 
 @traceable(name="product_search_node") 
-async def product_search_node(state: SearchState) -> SearchState:
+async def product_search_node(state: SearchState) -> Dict[str, Any]:
     """Product search node - autonomous search with tools"""
     return await product_search.execute(state)
 
+@traceable(name="reranker_node")
+async def reranker_node(state: SearchState) -> Dict[str, Any]:
+    """Reranker node - reorders candidates by query-product features"""
+    return await reranker.execute(state)
+
 @traceable(name="response_compiler_node")
-async def response_compiler_node(state: SearchState) -> SearchState:
+async def response_compiler_node(state: SearchState) -> Dict[str, Any]:
     """Response compiler node - formats final response"""
     return await response_compiler.execute(state)
 
@@ -58,6 +66,7 @@ def create_search_graph():
     # Add nodes
     workflow.add_node("supervisor", supervisor_node)
     workflow.add_node("product_search", product_search_node)
+    workflow.add_node("reranker", reranker_node)
     workflow.add_node("response_compiler", response_compiler_node)
     
     # Add edges with conditions
@@ -73,8 +82,9 @@ def create_search_graph():
         }
     )
     
-    # Product search always goes to response compiler (for now)
-    workflow.add_edge("product_search", "response_compiler")
+    # Product search results are re-ranked, then compiled
+    workflow.add_edge("product_search", "reranker")
+    workflow.add_edge("reranker", "response_compiler")
     
     # Response compiler ends the flow
     workflow.add_edge("response_compiler", END)
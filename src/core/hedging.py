@@ -0,0 +1,157 @@
+import asyncio
+import bisect
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, TypeVar
+import structlog
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+class LatencyEstimator:
+    """Rolling window of recent latencies with percentile lookups"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: Deque[float] = deque()
+        self._sorted: List[float] = []
+
+    def observe(self, seconds: float):
+        if len(self._samples) == self.window:
+            oldest = self._samples.popleft()
+            del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+        self._samples.append(seconds)
+        bisect.insort(self._sorted, seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """The p-th percentile (0-100) of the window, None when empty"""
+        if not self._sorted:
+            return None
+        index = min(len(self._sorted) - 1, int(len(self._sorted) * p / 100))
+        return self._sorted[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+class Hedger:
+    """Issue a duplicate request when the first is slower than usual
+
+    The hedge fires once the primary has been outstanding longer than the
+    given percentile of recent latency; whichever attempt answers first wins
+    and the other is cancelled. Hedges are capped at max_rate of recent
+    requests, so an outage where everything is slow cannot double the load.
+    Until min_samples latencies are known no hedges are sent.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        enabled: bool = False,
+        percentile: float = 95.0,
+        min_delay_ms: float = 10.0,
+        max_rate: float = 0.1,
+        min_samples: int = 50,
+        window: int = 1000
+    ):
+        self.name = name
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_delay_s = min_delay_ms / 1000
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.latency = LatencyEstimator(window)
+        # Whether each recent request was hedged, for the rate cap
+        self._recent: Deque[bool] = deque(maxlen=window)
+        self._recent_hedged = 0
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.rate_limited = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, None when hedging is off or not warmed up"""
+        if not self.enabled or len(self.latency) < self.min_samples:
+            return None
+        return max(self.min_delay_s, self.latency.percentile(self.percentile))
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn(), hedging with a second fn() if the first is slow"""
+        self.requests += 1
+        delay = self.hedge_delay()
+        primary = asyncio.ensure_future(self._timed(fn))
+
+        if delay is None:
+            self._record(False)
+            return await primary
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                self._record(False)
+                return primary.result()
+
+            if not self._hedge_allowed():
+                self.rate_limited += 1
+                self._record(False)
+                return await primary
+
+            self.hedges += 1
+            self._record(True)
+            logger.debug("Hedging slow request", hedger=self.name, delay_ms=delay * 1000)
+            hedge = asyncio.ensure_future(self._timed(fn))
+            return await self._first_success(primary, hedge)
+
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+
+    async def _first_success(self, primary: asyncio.Task, hedge: asyncio.Task) -> Any:
+        """Result of whichever attempt succeeds first; the loser is cancelled"""
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+            # Both failed; surface the primary's error
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _timed(self, fn: Callable[[], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        result = await fn()
+        # Only completed attempts are observed; cancelled losers are not
+        self.latency.observe(time.perf_counter() - start)
+        return result
+
+    def _hedge_allowed(self) -> bool:
+        if not self._recent:
+            return True
+        return (self._recent_hedged + 1) / (len(self._recent) + 1) <= self.max_rate
+
+    def _record(self, hedged: bool):
+        if len(self._recent) == self._recent.maxlen and self._recent[0]:
+            self._recent_hedged -= 1
+        self._recent.append(hedged)
+        if hedged:
+            self._recent_hedged += 1
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.latency.percentile(50)
+        delay = self.hedge_delay()
+        return {
+            "name": self.name,
+            "enabled": self.enabled,
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "rate_limited": self.rate_limited,
+            "latency_p50_ms": p50 * 1000 if p50 is not None else None,
+            "hedge_delay_ms": delay * 1000 if delay is not None else None
+        }
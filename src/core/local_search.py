@@ -0,0 +1,259 @@
+import asyncio
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import numpy as np
+import structlog
+from src.core.catalog_snapshot import VECTOR_KEY, CatalogSnapshot, get_catalog_snapshot, public_record
+from src.models.projection import PROJECTIONS, DEFAULT_SEARCH_PROJECTION
+
+logger = structlog.get_logger()
+
+# Product properties indexed for keyword search
+SEARCH_FIELDS = ["name", "description", "brand", "category"]
+
+# Weaviate's "word" tokenization: lowercase alphanumeric runs
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Top results each sub-search contributes before fusion
+FUSION_CANDIDATES = 100
+
+# Catalogs at least this large are searched in a thread: a hybrid query over
+# 100k products takes about 15ms, too long to hold the event loop while the
+# engine serves every request during an outage
+THREAD_MIN_PRODUCTS = 10000
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+def _relative_scores(scores: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Min-max normalise the candidates' scores to [0, 1] (relativeScoreFusion)"""
+    values = scores[candidates]
+    low, high = values.min(), values.max()
+    if high == low:
+        return np.ones_like(values)
+    return (values - low) / (high - low)
+
+def _top_k(scores: np.ndarray, k: int, hits: Optional[np.ndarray] = None) -> np.ndarray:
+    """Indices of the k highest scores among hits (default: positive scores), best first"""
+    if hits is None:
+        hits = np.flatnonzero(scores > 0)
+    if len(hits) > k:
+        hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+    return hits[np.argsort(-scores[hits], kind="stable")]
+
+class LocalHybridSearchEngine:
+    """In-process hybrid search over a catalog snapshot
+    
+    Keyword scores are BM25 over name, description, brand and category with
+    every posting's weight precomputed, so a query is a few vectorised adds.
+    Vector scores are cosine similarity against the snapshot's embeddings.
+    Like Weaviate's relativeScoreFusion, each sub-search's top candidates
+    are min-max normalised and combined as alpha * vector + (1 - alpha) *
+    keyword. Without embeddings, or a query vector of the same dimension,
+    the ranking is BM25 only.
+    
+    run() has the same signature and result shape as ProductSearchTool.run,
+    and searches catalogs of THREAD_MIN_PRODUCTS or more in a thread.
+    """
+    
+    name: str = "product_search"
+    
+    def __init__(
+        self,
+        products: List[Dict[str, Any]],
+        vectors: Optional[np.ndarray] = None,
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        self.products = [public_record(product) for product in products]
+        self.k1 = k1
+        self.b = b
+        self._facets: Dict[str, Dict[Any, np.ndarray]] = {}
+        self._build_index()
+        
+        self.vectors = None
+        if vectors is not None and len(vectors) == len(self.products):
+            vectors = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            self.vectors = vectors / np.where(norms == 0, 1, norms)
+    
+    @classmethod
+    def from_snapshot(cls, snapshot: CatalogSnapshot, **kwargs) -> "LocalHybridSearchEngine":
+        """Build from a snapshot, using its embeddings when every product has one"""
+        vectors = None
+        if snapshot.products and all(product.get(VECTOR_KEY) for product in snapshot.products):
+            vectors = np.array([product[VECTOR_KEY] for product in snapshot.products], dtype=np.float32)
+        return cls(snapshot.products, vectors=vectors, **kwargs)
+    
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "LocalHybridSearchEngine":
+        return cls.from_snapshot(CatalogSnapshot.from_file(path), **kwargs)
+    
+    def _build_index(self):
+        """Inverted index with BM25 weights precomputed per posting"""
+        doc_terms = [
+            Counter(tokenize(" ".join(str(product.get(field) or "") for field in SEARCH_FIELDS)))
+            for product in self.products
+        ]
+        doc_lengths = np.array([sum(terms.values()) for terms in doc_terms], dtype=np.float32)
+        average_length = doc_lengths.mean() if len(doc_lengths) else 1.0
+        
+        postings: Dict[str, List[int]] = {}
+        frequencies: Dict[str, List[int]] = {}
+        for doc_id, terms in enumerate(doc_terms):
+            for term, count in terms.items():
+                postings.setdefault(term, []).append(doc_id)
+                frequencies.setdefault(term, []).append(count)
+        
+        total = len(self.products)
+        length_norm = self.k1 * (1 - self.b + self.b * doc_lengths / max(average_length, 1e-9))
+        self._postings: Dict[str, np.ndarray] = {}
+        self._weights: Dict[str, np.ndarray] = {}
+        for term, docs in postings.items():
+            docs_array = np.array(docs, dtype=np.int32)
+            tf = np.array(frequencies[term], dtype=np.float32)
+            idf = np.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            self._postings[term] = docs_array
+            self._weights[term] = idf * tf * (self.k1 + 1) / (tf + length_norm[docs_array])
+    
+    def keyword_scores(self, query: str) -> np.ndarray:
+        """BM25 score of every product for the query"""
+        scores = np.zeros(len(self.products), dtype=np.float32)
+        for term in set(tokenize(query)):
+            docs = self._postings.get(term)
+            if docs is not None:
+                scores[docs] += self._weights[term]
+        return scores
+    
+    def vector_scores(self, vector: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every product to the query vector"""
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return self.vectors @ (vector / norm if norm else vector)
+    
+    def _filter_mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Products whose properties equal (or are in) every filter value"""
+        mask = np.ones(len(self.products), dtype=bool)
+        for prop, wanted in filters.items():
+            if prop not in self._facets:
+                values: Dict[Any, List[int]] = {}
+                for doc_id, product in enumerate(self.products):
+                    values.setdefault(product.get(prop), []).append(doc_id)
+                self._facets[prop] = {value: np.array(docs, dtype=np.int32) for value, docs in values.items()}
+            allowed = np.zeros(len(self.products), dtype=bool)
+            for value in (wanted if isinstance(wanted, list) else [wanted]):
+                docs = self._facets[prop].get(value)
+                if docs is not None:
+                    allowed[docs] = True
+            mask &= allowed
+        return mask
+    
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        alpha: float = 0.75,
+        filters: Optional[Dict[str, Any]] = None,
+        vector: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
+        """Hybrid search returning product records with a fused "score" """
+        if not self.products or limit <= 0:
+            return []
+        
+        use_vector = (
+            self.vectors is not None and vector is not None and alpha > 0
+            and len(vector) == self.vectors.shape[1]
+        )
+        use_keyword = alpha < 1 or not use_vector
+        mask = self._filter_mask(filters) if filters else None
+        pool = max(limit, FUSION_CANDIDATES)
+        
+        fused = np.zeros(len(self.products), dtype=np.float32)
+        # A candidate at the bottom of its sub-search normalises to 0 but is
+        # still a result, as in Weaviate
+        pooled = np.zeros(len(self.products), dtype=bool)
+        if use_keyword:
+            keyword = self.keyword_scores(query)
+            if mask is not None:
+                keyword[~mask] = 0
+            candidates = _top_k(keyword, pool)
+            if len(candidates):
+                pooled[candidates] = True
+                fused[candidates] += (1 - alpha if use_vector else 1.0) * _relative_scores(keyword, candidates)
+        if use_vector:
+            # Shift cosine into (0, 2] so every product is a vector candidate
+            similarity = self.vector_scores(vector) + 1.0 + 1e-6
+            if mask is not None:
+                similarity[~mask] = 0
+            candidates = _top_k(similarity, pool)
+            if len(candidates):
+                pooled[candidates] = True
+                fused[candidates] += alpha * _relative_scores(similarity, candidates)
+        
+        return [
+            {**self.products[doc_id], "score": float(fused[doc_id])}
+            for doc_id in _top_k(fused, limit, np.flatnonzero(pooled))
+        ]
+    
+    async def run(
+        self,
+        query: str,
+        limit: int = 10,
+        alpha: Optional[float] = None,
+        filters: Optional[Dict] = None,
+        projection: str = DEFAULT_SEARCH_PROJECTION,
+        vector: Optional[np.ndarray] = None
+    ) -> Dict[str, Any]:
+        """Execute product search, shaped like ProductSearchTool.run"""
+        search_alpha = alpha if alpha is not None else 0.75
+        if len(self.products) >= THREAD_MIN_PRODUCTS:
+            products = await asyncio.to_thread(self.search, query, limit=limit, alpha=search_alpha, filters=filters, vector=vector)
+        else:
+            products = self.search(query, limit=limit, alpha=search_alpha, filters=filters, vector=vector)
+        
+        fields = PROJECTIONS[projection]
+        if fields["properties"] is not None:
+            keep = set(fields["properties"]) | ({"score"} if "score" in (fields["metadata"] or []) else set())
+            products = [{k: v for k, v in product.items() if k in keep} for product in products]
+        
+        return {
+            "success": True,
+            "query": query,
+            "count": len(products),
+            "products": products,
+            "search_config": {"strategy": "hybrid", "alpha": search_alpha, "engine": "local"}
+        }
+
+_engine: Optional[LocalHybridSearchEngine] = None
+_engine_snapshot: Optional[CatalogSnapshot] = None
+_engine_checked = False
+_build_lock = asyncio.Lock()
+
+def get_local_engine() -> Optional[LocalHybridSearchEngine]:
+    """Engine over the current catalog snapshot, rebuilt when the snapshot changes
+
+    Loading the snapshot and building the index is blocking work; code on
+    the event loop should use load_local_engine instead.
+    """
+    global _engine, _engine_snapshot, _engine_checked
+    snapshot = get_catalog_snapshot()
+    _engine_checked = True
+    if snapshot is not _engine_snapshot:
+        _engine_snapshot = snapshot
+        _engine = LocalHybridSearchEngine.from_snapshot(snapshot) if snapshot is not None else None
+        if _engine is not None:
+            logger.info(
+                "Built local search engine",
+                products=len(_engine.products),
+                terms=len(_engine._postings),
+                vectors=_engine.vectors is not None
+            )
+    return _engine
+
+async def load_local_engine() -> Optional[LocalHybridSearchEngine]:
+    """get_local_engine, with any snapshot load or index build run in a thread"""
+    if _engine_checked and get_catalog_snapshot() is _engine_snapshot:
+        return _engine
+    async with _build_lock:
+        return await asyncio.to_thread(get_local_engine)
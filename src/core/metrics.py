@@ -0,0 +1,112 @@
+from typing import Any, Callable, Dict, Iterable, List
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Stage latencies are mostly sub-10ms, so the buckets start well below
+# the client library defaults
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+# Graph nodes and tools
+AGENT_DURATION = Histogram(
+    "leafloaf_agent_duration_seconds",
+    "Time spent in each graph node (BaseAgent.execute)",
+    ["agent", "status"],
+    buckets=LATENCY_BUCKETS
+)
+TOOL_DURATION = Histogram(
+    "leafloaf_tool_duration_seconds",
+    "Time spent in each tool call, including waiting for a concurrency slot",
+    ["tool", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+
+# Search behaviour
+ROUTING_DECISIONS = Counter(
+    "leafloaf_routing_decisions_total",
+    "Supervisor routing decisions",
+    ["decision"]
+)
+INTENTS = Counter(
+    "leafloaf_intents_total",
+    "Intents detected by the supervisor",
+    ["intent"]
+)
+SEARCH_ITERATIONS = Histogram(
+    "leafloaf_search_iterations",
+    "Planning iterations per product search",
+    buckets=(1, 2, 3, 4, 5)
+)
+ZERO_RESULT_SEARCHES = Counter(
+    "leafloaf_zero_result_searches_total",
+    "Product searches that found nothing"
+)
+
+# HTTP
+REQUESTS_IN_FLIGHT = Gauge(
+    "leafloaf_requests_in_flight",
+    "HTTP requests currently being handled"
+)
+REQUEST_DURATION = Histogram(
+    "leafloaf_request_duration_seconds",
+    "HTTP request latency by route (streaming routes until headers are sent)",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS
+)
+
+# Weaviate
+WEAVIATE_ERRORS = Counter(
+    "leafloaf_weaviate_errors_total",
+    "Weaviate calls that raised, by operation and exception type",
+    ["operation", "error"]
+)
+
+class StatsCollector:
+    """Exports component stats() at scrape time
+
+    Caches, the circuit breaker and friends already keep their own counts,
+    so rather than mirroring every update into Prometheus objects, each
+    scrape reads the current stats.
+    """
+
+    def __init__(self, caches: Callable[[], Iterable[Any]], breakers: Callable[[], Iterable[Any]]):
+        self.caches = caches
+        self.breakers = breakers
+
+    def collect(self):
+        hit_ratio = GaugeMetricFamily("leafloaf_cache_hit_ratio", "Cache hits / lookups since start", labels=["cache"])
+        entries = GaugeMetricFamily("leafloaf_cache_entries", "Entries currently cached", labels=["cache"])
+        size = GaugeMetricFamily("leafloaf_cache_bytes", "Approximate bytes currently cached", labels=["cache"])
+        lookups = CounterMetricFamily("leafloaf_cache_lookups", "Cache lookups by result", labels=["cache", "result"])
+        for cache in self.caches():
+            stats = cache.stats()
+            hit_ratio.add_metric([stats["name"]], stats["hit_ratio"])
+            entries.add_metric([stats["name"]], stats["entries"])
+            size.add_metric([stats["name"]], stats["bytes"])
+            for result in ("hits", "misses", "stale_hits"):
+                lookups.add_metric([stats["name"], result], stats[result])
+        yield from (hit_ratio, entries, size, lookups)
+
+        state = GaugeMetricFamily(
+            "leafloaf_circuit_breaker_state",
+            "Circuit breaker state: 0 closed, 1 half-open, 2 open",
+            labels=["breaker"]
+        )
+        rejected = CounterMetricFamily("leafloaf_circuit_breaker_rejected", "Calls rejected while open", labels=["breaker"])
+        for breaker in self.breakers():
+            stats = breaker.stats()
+            state.add_metric([stats["name"]], BREAKER_STATE_VALUES[stats["state"]])
+            rejected.add_metric([stats["name"]], stats["rejected"])
+        yield from (state, rejected)
+
+BREAKER_STATE_VALUES: Dict[str, int] = {"closed": 0, "half_open": 1, "open": 2}
+
+_collectors: List[StatsCollector] = []
+
+def register_stats_collector(caches: Callable[[], Iterable[Any]], breakers: Callable[[], Iterable[Any]]):
+    """Register the scrape-time collector once per process"""
+    if not _collectors:
+        collector = StatsCollector(caches, breakers)
+        REGISTRY.register(collector)
+        _collectors.append(collector)
@@ -0,0 +1,87 @@
+from typing import Dict, List
+from config.intent_keywords import INTENT_RULES
+from src.core.query_terms import match_query_terms
+from src.models.state import QueryAnalysis
+from src.utils.text import normalize_query
+
+# Categories the search agent can narrow to
+CATEGORIES = ["vegetables", "fruits", "dairy", "meat", "seafood", "bakery"]
+
+# Common non-brand words dropped when extracting a brand
+# In production, we'd have a list of actual product brands
+NON_BRAND_WORDS = {"organic", "fresh", "the", "a", "an"}
+
+# Specific terms dropped when broadening a query
+SPECIFIC_WORDS = {"organic", "fresh", "1lb", "pound", "specific"}
+
+def classify_intent(tokens: List[str], intent_matches: Dict[str, List[str]]) -> str:
+    """Pick the first intent rule with a matching keyword"""
+    # Rules are ordered by priority, first match wins
+    for rule, config in INTENT_RULES.items():
+        if rule in intent_matches:
+            return config["intent"]
+
+    # Unclear
+    if len(tokens) < 2:
+        return "unclear"
+
+    return "general_search"
+
+def score_confidence(tokens: List[str], intent: str) -> float:
+    """Calculate confidence in the intent classification"""
+    base_confidence = 0.6
+
+    # Longer, more specific queries get higher confidence
+    word_count = len(tokens)
+    if word_count > 4:
+        base_confidence += 0.2
+    elif word_count > 2:
+        base_confidence += 0.1
+
+    # Specific intents get higher confidence
+    if intent in ["specific_product", "brand_search"]:
+        base_confidence += 0.2
+    elif intent == "unclear":
+        base_confidence -= 0.2
+
+    return min(max(base_confidence, 0.2), 0.95)
+
+def extract_brand(query: str, tokens: List[str]) -> str:
+    """Extract brand from query by dropping common non-brand words"""
+    potential_brand = [t for t in tokens if t not in NON_BRAND_WORDS]
+    return " ".join(potential_brand) if potential_brand else query
+
+def extract_category(query: str, tokens: List[str]) -> str:
+    """Extract category from query"""
+    for category in CATEGORIES:
+        if category in tokens:
+            return category
+    return query  # fallback to original
+
+def broaden_query(query: str, tokens: List[str]) -> str:
+    """Broaden a query by removing specific terms"""
+    broad_terms = [t for t in tokens if t not in SPECIFIC_WORDS]
+    return " ".join(broad_terms) if broad_terms else query
+
+def analyze_query(query: str) -> QueryAnalysis:
+    """Normalise, tokenise and classify the query in a single pass"""
+    normalized = normalize_query(query)
+    tokens = normalized.split()
+    matches = match_query_terms(normalized)
+
+    attribute_matches = {k: sorted(v) for k, v in matches["attributes"].items()}
+    intent_matches = {k: sorted(v) for k, v in matches["intents"].items()}
+    intent = classify_intent(tokens, intent_matches)
+
+    return {
+        "query": query,
+        "normalized": normalized,
+        "tokens": tokens,
+        "attribute_matches": attribute_matches,
+        "intent_matches": intent_matches,
+        "intent": intent,
+        "confidence": score_confidence(tokens, intent),
+        "brand": extract_brand(query, tokens),
+        "category": extract_category(query, tokens),
+        "broadened": broaden_query(query, tokens)
+    }
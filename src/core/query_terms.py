@@ -0,0 +1,27 @@
+from typing import Dict, Set, TypedDict
+from config.product_attributes import PRODUCT_ATTRIBUTES
+from config.intent_keywords import INTENT_RULES
+from src.utils.keyword_matcher import KeywordMatcher
+
+class QueryTermMatches(TypedDict):
+    attributes: Dict[str, Set[str]]  # PRODUCT_ATTRIBUTES category -> matched terms
+    intents: Dict[str, Set[str]]  # INTENT_RULES rule -> matched terms
+
+_ATTRIBUTE_PREFIX = "attribute:"
+_INTENT_PREFIX = "intent:"
+
+# Built once at import from every attribute and intent keyword table
+query_term_matcher = KeywordMatcher({
+    **{f"{_ATTRIBUTE_PREFIX}{category}": config["terms"] for category, config in PRODUCT_ATTRIBUTES.items()},
+    **{f"{_INTENT_PREFIX}{rule}": config["terms"] for rule, config in INTENT_RULES.items()}
+})
+
+def match_query_terms(query: str) -> QueryTermMatches:
+    """Find all attribute and intent keywords in one pass over the query"""
+    matches: QueryTermMatches = {"attributes": {}, "intents": {}}
+    for label, terms in query_term_matcher.terms_by_label(query).items():
+        if label.startswith(_ATTRIBUTE_PREFIX):
+            matches["attributes"][label[len(_ATTRIBUTE_PREFIX):]] = terms
+        else:
+            matches["intents"][label[len(_INTENT_PREFIX):]] = terms
+    return matches
@@ -0,0 +1,109 @@
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+from src.models.state import QueryAnalysis
+from src.utils.text import padded_words, product_text
+
+# Feature columns, in the order of the weight vector
+FEATURES = [
+    "retrieval",
+    "dietary",
+    "nutritional",
+    "certifications",
+    "preparation",
+    "brand",
+    "category",
+    "size"
+]
+
+# PRODUCT_ATTRIBUTES categories scored by how many matched terms a product carries
+ATTRIBUTE_FEATURES = ["dietary", "nutritional", "certifications", "preparation"]
+
+# Used for any weight missing from the reranker section of agent_priorities.yaml
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "retrieval": 1.0,
+    "dietary": 0.5,
+    "nutritional": 0.3,
+    "certifications": 0.4,
+    "preparation": 0.15,
+    "brand": 0.4,
+    "category": 0.2,
+    "size": 0.15
+}
+
+class Reranker:
+    """Re-orders retrieved candidates with a linear model over query-product features
+
+    Every candidate gets one row of features, all in [0, 1]:
+
+    - retrieval: the candidate's score, min-max normalised, or 1 - rank/n
+      when any score is missing. After fan-out the score is the
+      reciprocal-rank-fusion score, so this follows the fused order
+    - dietary, nutritional, certifications, preparation: share of the
+      query's PRODUCT_ATTRIBUTES terms in that category the product mentions
+    - brand, category: the product's brand or category appears in the query
+    - size: the product mentions a size descriptor from the query
+
+    and the final score is features @ weights. Sorting is stable, so ties
+    keep retrieval order.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.weights = np.array([weights[feature] for feature in FEATURES], dtype=np.float32)
+
+    def features(
+        self,
+        products: Sequence[Dict[str, Any]],
+        analysis: QueryAnalysis,
+        texts: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """(len(products), len(FEATURES)) feature matrix
+
+        texts are the products' product_text() strings, e.g. from the
+        ResultStore that built them when the products arrived; they are
+        computed here when not given.
+        """
+        n = len(products)
+        matrix = np.zeros((n, len(FEATURES)), dtype=np.float32)
+        if n == 0:
+            return matrix
+
+        scores = [product.get("score") for product in products]
+        if all(isinstance(score, (int, float)) for score in scores):
+            values = np.array(scores, dtype=np.float32)
+            spread = values.max() - values.min()
+            matrix[:, 0] = (values - values.min()) / spread if spread else 1.0
+        else:
+            matrix[:, 0] = 1.0 - np.arange(n, dtype=np.float32) / n
+
+        attribute_matches = analysis.get("attribute_matches", {})
+        query = padded_words(analysis.get("normalized", ""))
+
+        for column, attribute in enumerate(ATTRIBUTE_FEATURES, start=1):
+            terms = [padded_words(term) for term in attribute_matches.get(attribute, [])]
+            if terms:
+                texts = texts if texts is not None else [product_text(product) for product in products]
+                matrix[:, column] = [sum(term in text for term in terms) / len(terms) for text in texts]
+
+        brand_column, category_column, size_column = (FEATURES.index(f) for f in ("brand", "category", "size"))
+        # Brands and categories repeat across candidates, so check each once
+        for column, field in ((brand_column, "brand"), (category_column, "category")):
+            values = [str(product.get(field) or "") for product in products]
+            in_query = {value: bool(value) and padded_words(value) in query for value in set(values)}
+            matrix[:, column] = [in_query[value] for value in values]
+
+        size_terms = [padded_words(term) for term in attribute_matches.get("size_descriptors", [])]
+        if size_terms:
+            texts = texts if texts is not None else [product_text(product) for product in products]
+            matrix[:, size_column] = [any(term in text for term in size_terms) for text in texts]
+
+        return matrix
+
+    def scores(self, products: Sequence[Dict[str, Any]], analysis: QueryAnalysis, texts: Optional[Sequence[str]] = None) -> np.ndarray:
+        return self.features(products, analysis, texts) @ self.weights
+
+    def rerank(self, products: Sequence[Dict[str, Any]], analysis: QueryAnalysis, texts: Optional[Sequence[str]] = None) -> List[int]:
+        """Indices of products, best first"""
+        if len(products) < 2:
+            return list(range(len(products)))
+        return np.argsort(-self.scores(products, analysis, texts), kind="stable").tolist()
@@ -0,0 +1,89 @@
+from typing import Any, Dict, Iterable, List, Optional
+from src.core.cache import estimate_size
+from src.utils.text import product_text
+
+class ResultStore:
+    """Per-request store that holds each product record exactly once
+
+    Tool results are interned here and everything else in SearchState
+    (messages, completed_tool_calls, search_results) refers to products by
+    SKU. The store is a handle created with the initial state and filled in
+    place by the search agent. Once max_bytes is reached further products
+    are dropped and the store is marked truncated. Each product's normalised
+    search text is built once on the way in, for the reranker.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._dropped_refs = set()
+        self._products: Dict[str, Dict[str, Any]] = {}
+        self._texts: Dict[str, str] = {}
+
+    @property
+    def dropped(self) -> int:
+        return len(self._dropped_refs)
+
+    @property
+    def truncated(self) -> bool:
+        return bool(self._dropped_refs)
+
+    def put(self, product: Dict[str, Any]) -> Optional[str]:
+        """Store a product and return its reference, or None if over budget"""
+        ref = product.get("sku") or f"ref_{len(self._products)}"
+
+        existing = self._products.get(ref)
+        if existing is product:
+            return ref
+
+        size = estimate_size(product)
+        previous_size = estimate_size(existing) if existing is not None else 0
+        if self.bytes - previous_size + size > self.max_bytes:
+            # Keep what we already have for this SKU rather than nothing
+            if existing is not None:
+                return ref
+            self._dropped_refs.add(ref)
+            return None
+
+        if existing is not None:
+            # Later lookups (e.g. details) enrich the record, never duplicate it
+            product = {**existing, **product}
+            size = estimate_size(product)
+        self._products[ref] = product
+        self._texts[ref] = product_text(product)
+        self.bytes += size - previous_size
+        return ref
+
+    def put_many(self, products: Iterable[Dict[str, Any]]) -> List[str]:
+        """Store products and return references for those that fit"""
+        refs = []
+        for product in products:
+            ref = self.put(product)
+            if ref is not None:
+                refs.append(ref)
+        return refs
+
+    def get(self, ref: str) -> Optional[Dict[str, Any]]:
+        return self._products.get(ref)
+
+    def resolve(self, refs: Iterable[str]) -> List[Dict[str, Any]]:
+        """Products for the given references, skipping unknown ones"""
+        return [self._products[ref] for ref in refs if ref in self._products]
+
+    def texts(self, refs: Iterable[str]) -> List[str]:
+        """product_text() of each product resolve() returns for the same refs"""
+        return [self._texts[ref] for ref in refs if ref in self._products]
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def __repr__(self) -> str:
+        return f"ResultStore(products={len(self._products)}, bytes={self.bytes}, dropped={self.dropped})"
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "products": len(self._products),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "dropped": self.dropped
+        }
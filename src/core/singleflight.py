@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+import structlog
+from src.core import deadline
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+class _Call:
+    """A shared in-flight call and the number of callers awaiting it"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """Coalesce concurrent identical calls onto one in-flight task
+
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same task. Errors propagate to every waiter and
+    nothing is remembered once the call finishes, so there is no staleness.
+    A cancelled caller only cancels the shared task when it was the last one
+    waiting on it, and then forgets the key at once so later callers start
+    fresh work instead of joining a task that is being cancelled. With
+    finish_on_deadline, a last caller cancelled because its deadline ran out
+    leaves the task running, so work with a side effect worth keeping
+    (filling a cache) outlives it and later callers join it while it is
+    still in flight; any other cancellation still cancels the task.
+    """
+
+    def __init__(self, name: str, finish_on_deadline: bool = False):
+        self.name = name
+        self.finish_on_deadline = finish_on_deadline
+        self._calls: Dict[Hashable, _Call] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run fn() for key, or join the identical call already in flight"""
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.started += 1
+        else:
+            self.coalesced += 1
+            logger.debug("Coalesced in-flight call", flight=self.name, key=str(key))
+
+        call.waiters += 1
+        try:
+            # Shield so one caller's cancellation does not cancel the others
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            keep = self.finish_on_deadline and deadline.expired()
+            if not keep and call.waiters == 1 and not call.task.done():
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the exception retrieved if every waiter was cancelled
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "in_flight": len(self._calls),
+            "started": self.started,
+            "coalesced": self.coalesced
+        }
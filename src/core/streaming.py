@@ -0,0 +1,25 @@
+import json
+from typing import Any, Callable, Dict
+from langgraph.config import get_stream_writer
+
+# Media type per supported stream format
+STREAM_FORMATS: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream"
+}
+
+def _discard(chunk: Any) -> None:
+    pass
+
+def stream_writer() -> Callable[[Any], None]:
+    """Writer for custom stream events; a no-op outside a graph run"""
+    try:
+        return get_stream_writer()
+    except RuntimeError:
+        return _discard
+
+def encode_event(event: str, data: Dict[str, Any], stream_format: str = "ndjson") -> str:
+    """Serialise one stream event as an NDJSON line or an SSE frame"""
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+    return json.dumps({"event": event, "data": data}, default=str) + "\n"
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Any, Optional
+import weaviate
+from weaviate.auth import AuthApiKey
+from weaviate.config import AdditionalConfig, ConnectionConfig, GrpcConfig, Timeout
+from src.config.settings import settings
+import structlog
+
+logger = structlog.get_logger()
+
+class WeaviateClientRegistry:
+    """Process-wide Weaviate async client shared by all tools
+
+    The client is created and connected lazily on first use, so importing the
+    graph never dials out. The FastAPI lifespan calls connect() on startup to
+    warm the pool and close() on shutdown.
+    """
+
+    def __init__(self, client: Optional[Any] = None):
+        self._client = client
+        self._lock = asyncio.Lock()
+        self.query_slots = asyncio.Semaphore(settings.weaviate_max_concurrent_queries)
+
+    def _create_client(self) -> weaviate.WeaviateAsyncClient:
+        """Create (but do not connect) the async client with pool settings"""
+        # Set up additional headers for HuggingFace
+        hf_api_key = settings.huggingface_api_key
+        additional_headers = {
+            "X-HuggingFace-Api-Key": hf_api_key
+        } if hf_api_key else {}
+
+        additional_config = AdditionalConfig(
+            connection=ConnectionConfig(
+                session_pool_connections=settings.weaviate_pool_connections,
+                session_pool_maxsize=settings.weaviate_pool_maxsize,
+                session_pool_max_retries=settings.weaviate_pool_max_retries,
+                session_pool_timeout=settings.weaviate_pool_timeout_s
+            ),
+            timeout=Timeout(query=settings.weaviate_query_timeout_s),
+            grpc_config=GrpcConfig(channel_options=[
+                ("grpc.keepalive_time_ms", settings.weaviate_keepalive_time_ms),
+                ("grpc.keepalive_timeout_ms", settings.weaviate_keepalive_timeout_ms),
+                ("grpc.keepalive_permit_without_calls", 1)
+            ])
+        )
+
+        return weaviate.use_async_with_weaviate_cloud(
+            cluster_url=settings.weaviate_url,
+            auth_credentials=AuthApiKey(settings.weaviate_api_key),
+            headers=additional_headers,
+            additional_config=additional_config,
+            skip_init_checks=True
+        )
+
+    def set_client(self, client: Any):
+        """Use an existing client (e.g. a local stand-in) instead of creating one"""
+        self._client = client
+
+    async def get_client(self) -> weaviate.WeaviateAsyncClient:
+        """Return the shared client, creating and connecting it on first use"""
+        if self._client is not None and self._client.is_connected():
+            return self._client
+
+        async with self._lock:
+            if self._client is None:
+                self._client = self._create_client()
+                logger.info(
+                    "Weaviate async client created",
+                    pool_connections=settings.weaviate_pool_connections,
+                    pool_maxsize=settings.weaviate_pool_maxsize
+                )
+            if not self._client.is_connected():
+                await self._client.connect()
+                logger.info("Weaviate client connected")
+        return self._client
+
+    async def get_collection(self, name: Optional[str] = None):
+        """Return a collection handle on the shared client"""
+        client = await self.get_client()
+        return client.collections.get(name or settings.weaviate_class_name)
+
+    async def connect(self):
+        """Eagerly connect, e.g. during application startup"""
+        await self.get_client()
+
+    async def close(self):
+        """Close the shared client if one was created"""
+        async with self._lock:
+            if self._client is not None:
+                await self._client.close()
+                self._client = None
+                logger.info("Weaviate client connection closed")
+
+# Global instance
+weaviate_registry = WeaviateClientRegistry()
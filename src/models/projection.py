@@ -0,0 +1,44 @@
+from typing import Any, Dict, List, Optional, TypedDict
+
+# Response field -> Weaviate property, in the order products are returned
+PRODUCT_RESPONSE_FIELDS: Dict[str, str] = {
+    "id": "productId",
+    "name": "name",
+    "description": "description",
+    "brand": "brand",
+    "category": "category",
+    "size": "size",
+    "unit": "unit"
+}
+
+# Properties the pipeline itself needs (dedup and result refs key on sku)
+INTERNAL_PROPERTIES: List[str] = ["sku"]
+
+class Projection(TypedDict):
+    properties: Optional[List[str]]  # None fetches every stored property
+    metadata: Optional[List[str]]  # Weaviate metadata fields, e.g. "score"
+
+PROJECTIONS: Dict[str, Projection] = {
+    # Search results only need what the response shows
+    "search": {
+        "properties": INTERNAL_PROPERTIES + list(PRODUCT_RESPONSE_FIELDS.values()),
+        "metadata": ["score"]
+    },
+    # Detail lookups return the full record
+    "details": {
+        "properties": None,
+        "metadata": None
+    }
+}
+
+DEFAULT_SEARCH_PROJECTION = "search"
+DEFAULT_DETAILS_PROJECTION = "details"
+
+
+def format_product(product: Dict[str, Any]) -> Dict[str, Any]:
+    """Response shape of a product: PRODUCT_RESPONSE_FIELDS, empty fields dropped"""
+    return {
+        field: product[prop]
+        for field, prop in PRODUCT_RESPONSE_FIELDS.items()
+        if product.get(prop)
+    }
@@ -1,4 +1,5 @@
 from typing import TypedDict, Optional, List, Dict, Any, Annotated
+from src.core.result_store import ResultStore
 from datetime import datetime
 from enum import Enum
 import operator
@@ -9,29 +10,50 @@ class AgentStatus(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     SKIPPED = "skipped"
+    TIMED_OUT = "timed_out"
 
 class SearchStrategy(Enum):
     KEYWORD = "keyword"
     SEMANTIC = "semantic"
     HYBRID = "hybrid"
 
+def merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer for per-agent maps: nodes return only their own keys"""
+    return {**left, **right}
+
 class Message(TypedDict):
     role: str  # "system", "human", "assistant", "tool"
     content: str
     tool_calls: Optional[List[Dict[str, Any]]]
     tool_call_id: Optional[str]
 
+class QueryAnalysis(TypedDict):
+    """Everything derived from the query text, computed once per request"""
+    query: str
+    normalized: str  # Canonical form, also used as the cache key
+    tokens: List[str]
+    attribute_matches: Dict[str, List[str]]  # PRODUCT_ATTRIBUTES category -> terms
+    intent_matches: Dict[str, List[str]]  # INTENT_RULES rule -> terms
+    intent: str
+    confidence: float
+    brand: str
+    category: str
+    broadened: str
+
 class SearchState(TypedDict):
     # Conversation messages for React pattern
     messages: Annotated[List[Message], operator.add]
     
     # Request Context
     query: str
+    query_analysis: QueryAnalysis
     request_id: str
     timestamp: datetime
     
     # Search Configuration (for now static)
     alpha_value: float
+    limit: int  # Page size the client asked for
+    candidate_limit: int  # Products fetched per query; later pages are served from these
     search_strategy: SearchStrategy
     
     # Agent decisions and reasoning
@@ -40,20 +62,24 @@ class SearchState(TypedDict):
     confidence: float
     routing_decision: Optional[str]  # Add this!
     should_search: bool  # Add this!
+    should_help: bool
+    needs_clarification: bool
     search_params: Dict[str, Any]  # Add this!
     reasoning: Annotated[List[str], operator.add]  # Agent reasoning steps
     
-    # Product Search Results
-    search_results: List[Dict[str, Any]]
+    # Product Search Results (search_results holds SKU refs into result_store)
+    result_store: ResultStore
+    search_results: List[str]
     search_metadata: Dict[str, Any]
     
     # Tool call tracking
     pending_tool_calls: List[Dict[str, Any]]
-    completed_tool_calls: List[Dict[str, Any]]
+    completed_tool_calls: Annotated[List[Dict[str, Any]], operator.add]
     
     # Execution Tracking
-    agent_status: Dict[str, AgentStatus]
-    agent_timings: Dict[str, float]
+    agent_status: Annotated[Dict[str, AgentStatus], merge_dicts]
+    agent_timings: Annotated[Dict[str, float], merge_dicts]
+    degraded_agents: Annotated[List[str], operator.add]  # Agents cut off by their latency budget
     total_execution_time: float
     
     # LangSmith Tracing
@@ -1,20 +1,158 @@
-import weaviate
-from weaviate.auth import AuthApiKey
 import weaviate.classes as wvc
-from typing import Dict, List, Any, Optional
+from weaviate.classes.query import Filter
+from typing import Awaitable, Callable, Dict, List, Any, Optional, TypeVar
 from pydantic import BaseModel, Field
 from src.config.settings import settings
 from src.core.config_manager import config_manager
+from src.core.weaviate_client import WeaviateClientRegistry, weaviate_registry
+from src.core.cache import TTLCache
+from src.core.singleflight import SingleFlight
+from src.core.hedging import Hedger
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.core.catalog_snapshot import get_catalog_snapshot
+from src.core.local_search import load_local_engine
+from src.core.embeddings import get_query_embeddings
+from src.core.batch_loader import BatchLoader
+from src.core.metrics import WEAVIATE_ERRORS
+from src.utils.text import normalize_query
+from src.models.projection import PROJECTIONS, DEFAULT_SEARCH_PROJECTION, DEFAULT_DETAILS_PROJECTION
+import numpy as np
 import structlog
+import json
 from datetime import datetime
 
 logger = structlog.get_logger()
 
+T = TypeVar("T")
+
+# Tool-level cache of successful hybrid search results
+search_result_cache = TTLCache(
+    name="product_search",
+    max_entries=settings.tool_cache_max_entries,
+    max_bytes=settings.tool_cache_max_bytes,
+    ttl_seconds=settings.tool_cache_ttl_s,
+    stale_ttl_seconds=settings.tool_cache_stale_ttl_s
+)
+
+# Identical concurrent searches share one in-flight request; a search whose
+# callers were cut off by their deadline still finishes and fills the cache,
+# one cancelled because results were already sufficient does not
+search_flight = SingleFlight("product_search", finish_on_deadline=True)
+
+# Hedges hybrid queries that run slower than recent latency suggests
+search_hedger = Hedger(
+    name="product_search",
+    enabled=settings.hedging_enabled,
+    percentile=settings.hedge_percentile,
+    min_delay_ms=settings.hedge_min_delay_ms,
+    max_rate=settings.hedge_max_rate,
+    min_samples=settings.hedge_min_samples
+)
+
+# Shared by every Weaviate call; while open, tools serve degraded results
+weaviate_breaker = CircuitBreaker(
+    name="weaviate",
+    failure_rate_threshold=settings.breaker_failure_rate,
+    slow_call_ms=settings.breaker_slow_call_ms,
+    slow_rate_threshold=settings.breaker_slow_rate,
+    window=settings.breaker_window,
+    min_calls=settings.breaker_min_calls,
+    open_seconds=settings.breaker_open_s
+)
+
+async def guarded(fn: Callable[[], Awaitable[T]], operation: str) -> T:
+    """Run a Weaviate call through the circuit breaker when it is enabled"""
+    try:
+        if not settings.breaker_enabled:
+            return await fn()
+        return await weaviate_breaker.call(fn)
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        WEAVIATE_ERRORS.labels(operation, type(e).__name__).inc()
+        raise
+
+async def embed_query(query: str) -> Optional[np.ndarray]:
+    """In-process query vector, or None to let Weaviate vectorize the query"""
+    embeddings = get_query_embeddings()
+    if embeddings is None:
+        return None
+    try:
+        return await embeddings.embed(query)
+    except Exception as e:
+        logger.warning(f"Query embedding failed, falling back to the vectorizer: {e}")
+        return None
+
+def clean_properties(properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert datetime objects to strings so results are JSON-safe"""
+    return {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in properties.items()
+    }
+
+def to_product(item: Any, projection: str) -> Dict[str, Any]:
+    """Build a product dict from a returned object, attaching requested metadata"""
+    product = clean_properties(item.properties)
+    if "score" in (PROJECTIONS[projection]["metadata"] or []) and item.metadata is not None:
+        product["score"] = item.metadata.score
+    return product
+
+def lookup_snapshot(skus: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Products for the SKUs found in the catalog snapshot"""
+    snapshot = get_catalog_snapshot()
+    if snapshot is None:
+        raise RuntimeError("No catalog snapshot configured (CATALOG_SNAPSHOT_PATH)")
+    return {sku: snapshot.get(sku) for sku in skus if sku in snapshot.by_sku}
+
+async def fetch_products_by_sku(skus: List[str], registry: Optional[WeaviateClientRegistry] = None) -> Dict[str, Dict[str, Any]]:
+    """Fetch products for many SKUs with a single contains-any filter"""
+    if not skus:
+        return {}
+    if settings.search_backend == "local":
+        return lookup_snapshot(skus)
+    registry = registry if registry is not None else weaviate_registry
+    projection = PROJECTIONS[DEFAULT_DETAILS_PROJECTION]
+    
+    async def fetch_query():
+        # Get collection
+        collection = await registry.get_collection()
+        async with registry.query_slots:
+            return await collection.query.fetch_objects(
+                filters=Filter.by_property("sku").contains_any(skus),
+                limit=len(skus),
+                return_properties=projection["properties"],
+                return_metadata=projection["metadata"]
+            )
+    
+    try:
+        results = await guarded(fetch_query, "fetch_objects")
+    except CircuitOpenError:
+        # Weaviate is unhealthy; answer from the catalog snapshot if there is one
+        if get_catalog_snapshot() is None:
+            raise
+        return lookup_snapshot(skus)
+    
+    return {
+        item.properties["sku"]: to_product(item, DEFAULT_DETAILS_PROJECTION)
+        for item in results.objects
+        if item.properties.get("sku")
+    }
+
+# SKU lookups from all in-flight requests are collected for a few ms and
+# resolved together, so concurrent detail calls become one query
+sku_details_loader = BatchLoader(
+    name="sku_details",
+    batch_fn=fetch_products_by_sku,
+    window_ms=settings.details_batch_window_ms,
+    max_batch_size=settings.details_batch_max_size
+)
+
 class ProductSearchInput(BaseModel):
     """Input schema for product search tool"""
     query: str = Field(description="The search query for products")
     limit: int = Field(default=10, description="Maximum number of results")
     filters: Optional[Dict[str, Any]] = Field(default=None, description="Optional filters")
+    projection: str = Field(default=DEFAULT_SEARCH_PROJECTION, description="Field projection profile")
 
 class ProductSearchTool:
     """Tool for searching products in Weaviate"""
@@ -25,83 +163,38 @@ class ProductSearchTool:
     based on user queries. Returns product names, descriptions, prices, and availability.
     """
     
-    def __init__(self):
-        self.client = self._init_weaviate_client()
-        
-    def _init_weaviate_client(self):
-        """Initialize Weaviate v4 client with HuggingFace headers"""
-        try:
-            # Get HuggingFace API key from settings
-            hf_api_key = settings.huggingface_api_key
-            
-            # Set up additional headers for HuggingFace
-            additional_headers = {
-                "X-HuggingFace-Api-Key": hf_api_key
-            } if hf_api_key else {}
-            
-            client = weaviate.connect_to_weaviate_cloud(
-                cluster_url=settings.weaviate_url,
-                auth_credentials=AuthApiKey(settings.weaviate_api_key),
-                headers=additional_headers,
-                skip_init_checks=True
-            )
-            logger.info("Weaviate v4 client initialized with HuggingFace auth")
-            return client
-        except Exception as e:
-            logger.error(f"Failed to initialize Weaviate client: {e}")
-            raise
-        def close(self):
-            """Close the Weaviate client connection"""
-            if hasattr(self, 'client') :
-                self.client.close()
-                logger.info("Weaviate client connection closed")
+    def __init__(self, registry: Optional[WeaviateClientRegistry] = None):
+        self.registry = registry if registry is not None else weaviate_registry
     
-    async def run(self, query: str, limit: int = 10, alpha: Optional[float]= None,filters: Optional[Dict] = None) -> Dict[str, Any]:
+    async def run(self, query: str, limit: int = 10, alpha: Optional[float]= None,filters: Optional[Dict] = None, projection: str = DEFAULT_SEARCH_PROJECTION) -> Dict[str, Any]:
         """Execute product search"""
         try:
             # Get search configuration
             search_config = config_manager.get_default_search_config()
-            alpha = search_config["alpha"]
             
-            logger.info(f"Searching for: {query}, alpha: {alpha}, limit: {limit}")
-            
-            # Get collection
-            collection = self.client.collections.get(settings.weaviate_class_name)
-            
-            # Execute hybrid search
             # Use provided alpha or fall back to config
             search_alpha = alpha if alpha is not None else search_config["alpha"]
-            results = collection.query.hybrid(
-            query=query,
-            alpha=search_alpha,
-            limit=limit
-            )
             
-            # Process results
-            products = []
-            for item in results.objects:
-                product = item.properties
-                # Convert datetime objects to strings
-                cleaned_product = {}
-                for key, value in product.items():
-                    if isinstance(value, datetime):
-                        cleaned_product[key] = value.isoformat()
-                    else:
-                        cleaned_product[key] = value
-                products.append(cleaned_product)
+            if settings.search_backend == "local":
+                return await self._local_search(query, search_alpha, limit, filters, projection)
             
-            logger.info(f"Found {len(products)} products")
-            if len(products) > 0:
-                logger.info(f"First product: {products[0].get('name', 'No name')}")
-            
-            return {
-                "success": True,
-                "query": query,
-                "count": len(products),
-                "products": products,
-                "search_config": search_config
-            }
+            cache_key = self._cache_key(query, search_alpha, limit, filters, projection)
+            if settings.tool_cache_enabled:
+                cached = search_result_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Search cache hit for: {query}")
+                    return {**cached, "cache_hit": True}
             
+            # Coalesce with an identical search that is already in flight
+            return await search_flight.do(
+                cache_key,
+                lambda: self._search(query, search_alpha, limit, projection, search_config, cache_key)
+            )
+        
+        except CircuitOpenError as e:
+            logger.warning(f"Weaviate circuit open, serving degraded search for: {query}")
+            return await self._degraded_search(query, search_alpha, limit, projection, cache_key, str(e))
+        
         except Exception as e:
             logger.error(f"Product search failed: {e}")
             return {
@@ -110,6 +203,86 @@ class ProductSearchTool:
                 "query": query,
                 "products": []
             }
+    
+    async def _search(self, query: str, alpha: float, limit: int, projection: str, search_config: Dict[str, Any], cache_key: tuple) -> Dict[str, Any]:
+        """Run the hybrid query against Weaviate and cache the result"""
+        logger.info(f"Searching for: {query}, alpha: {alpha}, limit: {limit}")
+        
+        # Execute hybrid search without blocking the event loop, fetching
+        # only the properties and metadata the projection asks for
+        fields = PROJECTIONS[projection]
+        
+        # A vector computed here (cached, batched with concurrent queries)
+        # saves Weaviate a round trip to its vectorizer
+        vector = await embed_query(query)
+        
+        async def hybrid_query():
+            # Get collection
+            collection = await self.registry.get_collection()
+            async with self.registry.query_slots:
+                return await collection.query.hybrid(
+                    query=query,
+                    vector=vector.tolist() if vector is not None else None,
+                    alpha=alpha,
+                    limit=limit,
+                    return_properties=fields["properties"],
+                    return_metadata=fields["metadata"]
+                )
+        
+        # A slow query gets a duplicate and the first answer wins; the breaker
+        # fails fast while Weaviate is unhealthy and sees each attempt on its own
+        results = await search_hedger.run(lambda: guarded(hybrid_query, "hybrid"))
+        
+        # Process results
+        products = [to_product(item, projection) for item in results.objects]
+        
+        logger.info(f"Found {len(products)} products")
+        if len(products) > 0:
+            logger.info(f"First product: {products[0].get('name', 'No name')}")
+        
+        result = {
+            "success": True,
+            "query": query,
+            "count": len(products),
+            "products": products,
+            "search_config": search_config
+        }
+        if settings.tool_cache_enabled:
+            search_result_cache.set(cache_key, result)
+        return result
+    
+    async def _local_search(self, query: str, alpha: float, limit: int, filters: Optional[Dict], projection: str) -> Dict[str, Any]:
+        """Serve the search in-process from the catalog snapshot"""
+        engine = await load_local_engine()
+        if engine is None:
+            raise RuntimeError("Local search backend needs a catalog snapshot (CATALOG_SNAPSHOT_PATH)")
+        vector = await embed_query(query)
+        return await engine.run(query, limit=limit, alpha=alpha, filters=filters, projection=projection, vector=vector)
+    
+    async def _degraded_search(self, query: str, alpha: float, limit: int, projection: str, cache_key: tuple, reason: str) -> Dict[str, Any]:
+        """Serve a search while Weaviate is unavailable: stale cache, then the local engine"""
+        stale = search_result_cache.get_stale(cache_key)
+        if stale is not None:
+            return {**stale, "degraded": True, "served_from": "stale_cache"}
+        
+        engine = await load_local_engine()
+        if engine is not None:
+            result = await engine.run(query, limit=limit, alpha=alpha, projection=projection, vector=await embed_query(query))
+            return {**result, "degraded": True, "served_from": "catalog_snapshot"}
+        
+        return {
+            "success": False,
+            "error": reason,
+            "query": query,
+            "products": [],
+            "degraded": True
+        }
+    
+    @staticmethod
+    def _cache_key(query: str, alpha: float, limit: int, filters: Optional[Dict], projection: str) -> tuple:
+        """Key on the normalised query so trivially different spellings share entries"""
+        filters_key = json.dumps(filters, sort_keys=True, default=str) if filters else None
+        return (normalize_query(query), round(alpha, 3), limit, filters_key, projection)
 
 class GetProductDetailsInput(BaseModel):
     """Input schema for getting product details"""
@@ -125,33 +298,16 @@ class GetProductDetailsTool:
     a product found in search results.
     """
     
-    def __init__(self):
-        hf_api_key = settings.huggingface_api_key
-        additional_headers = {
-            "X-HuggingFace-Api-Key": hf_api_key
-        } if hf_api_key else {}
-        
-        self.client = weaviate.connect_to_weaviate_cloud(
-            cluster_url=settings.weaviate_url,
-            auth_credentials=AuthApiKey(settings.weaviate_api_key),
-            headers=additional_headers,
-            skip_init_checks=True
-        )
+    def __init__(self, loader: Optional[BatchLoader] = None):
+        self.loader = loader if loader is not None else sku_details_loader
     
     async def run(self, product_id: str) -> Dict[str, Any]:
         """Get detailed product information"""
         try:
-            # Get collection
-            collection = self.client.collections.get(settings.weaviate_class_name)
+            # Batched with other in-flight lookups by SKU
+            product = await self.loader.load(product_id)
             
-            # Query by product ID using the actual field name
-            results = collection.query.fetch_objects(
-                where=collection.filter.by_property("sku").equal(product_id),
-                limit=1
-            )
-            
-            if results.objects:
-                product = results.objects[0].properties
+            if product is not None:
                 return {
                     "success": True,
                     "product": product
@@ -162,7 +318,7 @@ class GetProductDetailsTool:
                     "error": "Product not found",
                     "product_id": product_id
                 }
-                
+        
         except Exception as e:
             logger.error(f"Get product details failed: {e}")
             return {
@@ -171,12 +327,56 @@ class GetProductDetailsTool:
                 "product_id": product_id
             }
 
-# Tool instances
+class GetProductDetailsBatchInput(BaseModel):
+    """Input schema for getting details for several products at once"""
+    product_ids: List[str] = Field(description="The product IDs (SKUs) to get details for")
+
+class GetProductDetailsBatchTool:
+    """Tool for getting detailed information about several products in one query"""
+    
+    name: str = "get_product_details_batch"
+    description: str = """
+    Get detailed information about several products at once. Use this instead of
+    repeated get_product_details calls when you need details for more than one
+    product found in search results.
+    """
+    
+    def __init__(self, loader: Optional[BatchLoader] = None):
+        self.loader = loader if loader is not None else sku_details_loader
+    
+    async def run(self, product_ids: List[str]) -> Dict[str, Any]:
+        """Get detailed product information keyed by SKU"""
+        # Drop duplicates and blanks but keep the caller's order
+        skus = list(dict.fromkeys(sku for sku in product_ids if sku))
+        try:
+            # Batched with other in-flight lookups by SKU
+            products = await self.loader.load_many(skus)
+            missing = [sku for sku in skus if sku not in products]
+            
+            return {
+                "success": bool(products),
+                "count": len(products),
+                "products": products,
+                "missing": missing
+            }
+        
+        except Exception as e:
+            logger.error(f"Get product details batch failed: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "product_ids": skus,
+                "products": {}
+            }
+
+# Tool instances (share the lazily connected client in weaviate_registry)
 product_search_tool = ProductSearchTool()
 get_product_details_tool = GetProductDetailsTool()
+get_product_details_batch_tool = GetProductDetailsBatchTool()
 
 # Tool definitions for agents
 AVAILABLE_TOOLS = {
     "product_search": product_search_tool,
-    "get_product_details": get_product_details_tool
+    "get_product_details": get_product_details_tool,
+    "get_product_details_batch": get_product_details_batch_tool
 }
\ No newline at end of file
@@ -1,16 +1,39 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator
 from src.tools.search_tools import AVAILABLE_TOOLS
+from src.core.config_manager import config_manager
+from src.core.deadline import DeadlineExceeded, deadline_scope, within_deadline
+from src.core.metrics import TOOL_DURATION
+import asyncio
 import json
+import time
 import structlog
 
 logger = structlog.get_logger()
 
 class ToolExecutor:
-    """Executes tool calls from agents"""
+    """Executes tool calls from agents
+    
+    Each call runs under its tool's timeout_ms and max_concurrency from the
+    tools section of agent_priorities.yaml, and never past the calling
+    agent's deadline. execute_streaming yields results as calls complete so
+    callers can stop early; closing it cancels the calls still running.
+    Cancelling a call only stops this caller waiting: a search shared
+    through the single-flight keeps running and fills the tool cache.
+    """
     
     def __init__(self):
         self.tools = AVAILABLE_TOOLS
-        
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self.timeouts = 0
+        self.cancelled = 0
+    
+    def _tool_slots(self, tool_name: str) -> asyncio.Semaphore:
+        """Per-tool concurrency limit, shared by every request"""
+        if tool_name not in self._slots:
+            max_concurrency = config_manager.get_tool_config(tool_name).get("max_concurrency", 32)
+            self._slots[tool_name] = asyncio.Semaphore(max_concurrency)
+        return self._slots[tool_name]
+    
     async def execute_tool_call(self, tool_call: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a single tool call"""
         tool_name = tool_call.get("name")
@@ -25,31 +48,74 @@ class ToolExecutor:
                 "error": f"Tool '{tool_name}' not found"
             }
         
+        timeout_ms = config_manager.get_tool_config(tool_name).get("timeout_ms")
+        start_time = time.perf_counter()
+        # Stays "cancelled" if the caller stops waiting for this call
+        outcome = "cancelled"
+        
         try:
             tool = self.tools[tool_name]
-            result = await tool.run(**tool_args)
+            # Bounded by the tool's own timeout and the calling agent's remaining
+            # budget, including time spent waiting for a concurrency slot
+            with deadline_scope(timeout_ms / 1000 if timeout_ms else None):
+                result = await within_deadline(self._run_tool(tool, tool_name, tool_args))
             
+            outcome = "ok" if result.get("success", True) else "error"
             return {
                 "tool_call_id": tool_id,
                 "name": tool_name,
                 "result": result
             }
-            
+        
+        except DeadlineExceeded as e:
+            outcome = "timeout"
+            self.timeouts += 1
+            logger.warning(f"Tool cut off by deadline: {e}", tool_name=tool_name)
+            return {
+                "tool_call_id": tool_id,
+                "name": tool_name,
+                "error": str(e),
+                "timed_out": True
+            }
+        
         except Exception as e:
+            outcome = "error"
             logger.error(f"Tool execution failed: {e}", tool_name=tool_name)
             return {
                 "tool_call_id": tool_id,
                 "name": tool_name,
                 "error": str(e)
             }
+        
+        finally:
+            TOOL_DURATION.labels(tool_name, outcome).observe(time.perf_counter() - start_time)
+    
+    async def _run_tool(self, tool: Any, tool_name: str, tool_args: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._tool_slots(tool_name):
+            return await tool.run(**tool_args)
+    
+    async def execute_streaming(self, tool_calls: List[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        """Run tool calls concurrently, yielding each result as it completes
+        
+        Stopping iteration early (break, then aclose) cancels the calls that
+        have not finished yet.
+        """
+        tasks = [asyncio.ensure_future(self.execute_tool_call(tool_call)) for tool_call in tool_calls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            outstanding = [task for task in tasks if not task.done()]
+            for task in outstanding:
+                task.cancel()
+            if outstanding:
+                self.cancelled += len(outstanding)
+                logger.info(f"Cancelled {len(outstanding)} of {len(tasks)} tool calls")
+                await asyncio.gather(*outstanding, return_exceptions=True)
     
     async def execute_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Execute multiple tool calls"""
-        results = []
-        for tool_call in tool_calls:
-            result = await self.execute_tool_call(tool_call)
-            results.append(result)
-        return results
+        """Execute multiple tool calls concurrently, returning results in call order"""
+        return list(await asyncio.gather(*(self.execute_tool_call(tool_call) for tool_call in tool_calls)))
     
     def get_tool_descriptions(self) -> List[Dict[str, str]]:
         """Get descriptions of all available tools for agents"""
@@ -60,6 +126,12 @@ class ToolExecutor:
             }
             for name, tool in self.tools.items()
         ]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "timeouts": self.timeouts,
+            "cancelled": self.cancelled
+        }
 
 # Global instance
-tool_executor = ToolExecutor()
\ No newline at end of file
+tool_executor = ToolExecutor()
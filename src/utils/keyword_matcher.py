@@ -0,0 +1,109 @@
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Set
+
+class KeywordMatch(NamedTuple):
+    term: str
+    label: str
+    start: int
+    end: int
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+class KeywordMatcher:
+    """Aho-Corasick matcher that finds every labelled term in one pass
+
+    The automaton is built once from a {label: terms} table, so matching
+    costs O(len(text) + matches) however large the dictionary grows.
+    Matches must sit on word boundaries wherever the term starts or ends
+    with a letter or digit ("1%" does not match inside "21%"). A trailing
+    plural "s"/"es" is tolerated so "potato" still matches "potatoes".
+    """
+
+    def __init__(self, terms_by_label: Dict[str, Iterable[str]], allow_plurals: bool = True):
+        self.allow_plurals = allow_plurals
+        # Trie nodes: transitions, failure link and (term, labels) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self._terms: List[str] = []
+        self._labels: List[List[str]] = []
+
+        term_ids: Dict[str, int] = {}
+        for label, terms in terms_by_label.items():
+            for term in terms:
+                term = term.lower()
+                if not term:
+                    continue
+                if term in term_ids:
+                    self._labels[term_ids[term]].append(label)
+                    continue
+                term_ids[term] = len(self._terms)
+                self._terms.append(term)
+                self._labels.append([label])
+                self._insert(term, term_ids[term])
+
+        self.term_count = len(self._terms)
+        self._build_failure_links()
+
+    def _insert(self, term: str, term_id: int):
+        node = 0
+        for ch in term:
+            next_node = self._goto[node].get(ch)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][ch] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append(term_id)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _on_boundary(self, text: str, term: str, start: int, end: int) -> bool:
+        if _is_word_char(term[0]) and start > 0 and _is_word_char(text[start - 1]):
+            return False
+        if not _is_word_char(term[-1]) or end == len(text) or not _is_word_char(text[end]):
+            return True
+        if self.allow_plurals:
+            for suffix in ("s", "es"):
+                tail = end + len(suffix)
+                if text.startswith(suffix, end) and (tail == len(text) or not _is_word_char(text[tail])):
+                    return True
+        return False
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """Every (term, label) occurrence in text, in order of where it ends"""
+        text = text.lower()
+        goto, fail, out = self._goto, self._fail, self._out
+        matches = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for term_id in out[node]:
+                term = self._terms[term_id]
+                start = i + 1 - len(term)
+                if self._on_boundary(text, term, start, i + 1):
+                    for label in self._labels[term_id]:
+                        matches.append(KeywordMatch(term, label, start, i + 1))
+        return matches
+
+    def terms_by_label(self, text: str) -> Dict[str, Set[str]]:
+        """Distinct matched terms grouped by label"""
+        found: Dict[str, Set[str]] = {}
+        for match in self.find_all(text):
+            found.setdefault(match.label, set()).add(match.term)
+        return found
@@ -0,0 +1,36 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+def encode_cursor(normalized_query: str, offset: int, candidate_limit: int) -> str:
+    """Opaque cursor pointing at the next page of a query's candidate set"""
+    payload = json.dumps({"q": normalized_query, "o": offset, "n": candidate_limit}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor from encode_cursor, raising ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError("Invalid cursor: not a cursor from this API") from e
+
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor: not an object")
+    query, offset, candidate_limit = payload.get("q"), payload.get("o"), payload.get("n")
+    if not isinstance(query, str) or not isinstance(offset, int) or not isinstance(candidate_limit, int):
+        raise ValueError("Invalid cursor: missing fields")
+    if offset < 0 or candidate_limit < 1:
+        raise ValueError("Invalid cursor: out of range")
+
+    return {"query": query, "offset": offset, "candidate_limit": candidate_limit}
+
+def paginate(items: List[Any], offset: int, limit: int, normalized_query: str, candidate_limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Slice one page out of a candidate set, with the cursor for the next page"""
+    page = items[offset:offset + limit]
+    next_offset = offset + len(page)
+    next_cursor = None
+    if page and next_offset < len(items):
+        next_cursor = encode_cursor(normalized_query, next_offset, candidate_limit)
+    return page, next_cursor
@@ -0,0 +1,20 @@
+import string
+from typing import Any, Dict
+
+# Product properties matched against query terms
+PRODUCT_TEXT_FIELDS = ["name", "description", "brand", "category", "size", "unit"]
+
+# Punctuation separates words; "%" is kept for terms like "2%"
+_SEPARATORS = str.maketrans({char: " " for char in string.punctuation if char != "%"})
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace so equivalent queries share a key"""
+    return " ".join(query.lower().split())
+
+def padded_words(text: str) -> str:
+    """Lowercased words joined by single spaces, padded so " term " matches whole words"""
+    return f" {' '.join(text.lower().translate(_SEPARATORS).split())} "
+
+def product_text(product: Dict[str, Any]) -> str:
+    """A product's PRODUCT_TEXT_FIELDS as padded_words text"""
+    return padded_words(" ".join([str(product.get(field) or "") for field in PRODUCT_TEXT_FIELDS]))